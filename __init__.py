@@ -18,11 +18,11 @@ from .comfyui_nodes import NODE_CLASS_MAPPINGS, NODE_DISPLAY_NAME_MAPPINGS
 
 # 获取ComfyUI服务实例并注册API路由
 try:
-    # 导入PromptServer以便在server/api.py中使用
     from server import PromptServer
     
-    # 直接导入API模块，这将自动注册装饰器中定义的路由
-    from .server import *
+    # 把API模块的路由表挂载到ComfyUI服务器
+    from .server.api import register_routes
+    register_routes(PromptServer.instance.routes)
     
     print("生命游戏API路由已成功注册")
 except ImportError as e:
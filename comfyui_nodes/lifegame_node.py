@@ -1,14 +1,105 @@
 """
 生命游戏节点模块，用于在ComfyUI中创建生命游戏动画
+
+torch、PIL、folder_paths和API模块在节点执行时才导入，以缩短插件加载时间。
 """
-import torch
 import numpy as np
-from PIL import Image
 import os
 import json
-import folder_paths
 from ..server.lifegame_logic import LifeGame
-from ..server.api import update_latest_gif
+from ..server.render import RENDER_MODES, render_cells
+from ..server.paths import cache_dir
+from ..server.result_cache import ResultCache, make_cache_key
+
+# 动画结果的磁盘缓存（按完整参数元组索引）
+result_cache = ResultCache(os.path.join(cache_dir(), "animation"))
+
+# 节点使用的步进引擎：固定的numpy引擎，不在节点运行时启动后台基准测试与模拟争用CPU
+# （各引擎结果逐位一致，auto只影响速度）
+NODE_ENGINE = "padded"
+
+# uint8颜色值到float32的查找表，与c/255.0的结果逐位一致
+_UINT8_TO_FLOAT = np.array([c / 255.0 for c in range(256)], dtype=np.float32)
+
+def _init_lifegame(width, height, cell_size, mode, preset, density, x_offset=None, y_offset=None,
+                   universe="toroidal", stats_capacity=1024, seed=0, track_age=False, trail_decay=32):
+    """按节点参数创建并初始化生命游戏实例"""
+    lifegame = LifeGame(width=width, height=height, cell_size=cell_size, stats_capacity=stats_capacity,
+                        unbounded=(universe == "unbounded"), engine=NODE_ENGINE, track_age=track_age,
+                        trail_decay=trail_decay)
+    
+    # 根据模式初始化
+    if mode == "preset":
+        if x_offset is not None and y_offset is not None:
+            lifegame.load_preset(preset, x_offset=x_offset, y_offset=y_offset)
+        else:
+            lifegame.load_preset(preset)
+    else:  # random模式
+        lifegame.random_init(density=density, seed=seed)
+    return lifegame
+
+def _final_state(lifegame, params):
+    """组合节点参数和模拟状态得到LIFEGAME_STATE
+    
+    Args:
+        lifegame: 生命游戏实例
+        params: 初始化参数和渲染样式
+        
+    Returns:
+        dict: 最终状态，可由LifeGameContinueAnimation继续演化
+    """
+    return {**params, **lifegame.export_state()}
+
+def _next_filename(output_dir, filename_prefix):
+    """生成输出文件名（不含扩展名）"""
+    file_counter = len(os.listdir(output_dir))
+    return f"{filename_prefix}_{file_counter:05d}"
+
+def _batch_to_uint8(batch, chunk_frames=16):
+    """把 (n, 3, h, w) 的0-1浮点批量图像分块转换为 (n, h, w, 3) 的uint8数组（四舍五入），避免整批的浮点临时数组"""
+    n, _, height, width = batch.shape
+    frames_u8 = np.empty((n, height, width, 3), dtype=np.uint8)
+    for i in range(0, n, chunk_frames):
+        chunk = batch[i:i + chunk_frames].permute(0, 2, 3, 1).cpu().numpy()
+        frames_u8[i:i + chunk_frames] = np.rint(chunk * 255)
+    return frames_u8
+
+def _frame_to_uint8(image, band_rows=256):
+    """把 (3, h, w) 的0-1浮点图像按行带转换为 (h, w, 3) 的uint8数组，避免整帧的浮点临时数组"""
+    _, height, width = image.shape
+    pixels = np.empty((height, width, 3), dtype=np.uint8)
+    for y in range(0, height, band_rows):
+        band = image[:, y:y + band_rows].permute(1, 2, 0).cpu().numpy()
+        pixels[y:y + band_rows] = band * 255
+    return pixels
+
+def _publish_gif_preview(gif_path, filename, load_frames=None):
+    """登记GIF预览，后台生成预览代理后通知前端（文件留在输出目录，不再复制）
+    
+    Args:
+        gif_path: 输出目录中的GIF路径
+        filename: GIF文件名
+        load_frames: 返回 (逐帧产生抽取的RGB帧的可迭代对象, 每秒帧数) 的函数，默认从GIF文件逐帧读取
+        
+    Returns:
+        str: 预览代理的路径，失败时返回空字符串
+    """
+    from ..server.api import update_latest_gif
+    from ..server.preview_proxy import preview_proxies
+    from ..server.preview_store import preview_store
+    try:
+        # 原始GIF仍可按文件名获取
+        preview_store.register(gif_path, filename)
+        
+        # 代理生成后更新最新GIF信息并通知前端
+        proxy = preview_proxies.submit(gif_path, filename, load_frames,
+                                       on_ready=lambda name: update_latest_gif(name, filename))
+        
+        # 返回相对路径
+        return f"temp/{proxy}"
+    except Exception as e:
+        print(f"登记GIF预览失败: {str(e)}")
+        return ""
 
 class LifeGameAnimationNode:
     """生命游戏动画节点，生成生命游戏动画并输出为图像序列或视频"""
@@ -33,6 +124,14 @@ class LifeGameAnimationNode:
             "optional": {
                 "x_offset": ("INT", {"default": None, "min": 0, "max": 500, "step": 1}),
                 "y_offset": ("INT", {"default": None, "min": 0, "max": 500, "step": 1}),
+                "universe": (["toroidal", "unbounded"], {"default": "toroidal"}),
+                "seed": ("INT", {"default": 0, "min": 0, "max": 0xffffffffffffffff}),
+                "backend": (["numpy", "torch"], {"default": "numpy"}),
+                "render_mode": (list(RENDER_MODES), {"default": "cells"}),
+                "old_color": ("STRING", {"default": "#FF4000"}),
+                "trail_color": ("STRING", {"default": "#4040A0"}),
+                "age_span": ("INT", {"default": 64, "min": 1, "max": 4096, "step": 1}),
+                "trail_decay": ("INT", {"default": 32, "min": 1, "max": 255, "step": 1}),
             }
         }
 
@@ -41,7 +140,44 @@ class LifeGameAnimationNode:
     FUNCTION = "generate_animation"
     CATEGORY = "生命游戏"
     
-    def generate_animation(self, width, height, cell_size, frames, mode, preset, density, alive_color, dead_color, x_offset=None, y_offset=None):
+    @staticmethod
+    def _cache_params(width, height, cell_size, frames, mode, preset, density, alive_color, dead_color,
+                      x_offset=None, y_offset=None, universe="toroidal", seed=0, backend="numpy",
+                      render_mode="cells", old_color="#FF4000", trail_color="#4040A0", age_span=64, trail_decay=32):
+        """决定输出结果的完整参数（preset模式下种子无影响，各后端结果逐位一致因此不区分后端）"""
+        params = {
+            "width": width,
+            "height": height,
+            "cell_size": cell_size,
+            "frames": frames,
+            "mode": mode,
+            "preset": preset if mode == "preset" else None,
+            "density": density if mode == "random" else None,
+            "alive_color": alive_color,
+            "dead_color": dead_color,
+            "x_offset": x_offset,
+            "y_offset": y_offset,
+            "universe": universe,
+            "seed": seed if mode == "random" else None,
+        }
+        if render_mode != "cells":
+            # cells模式的键保持不变，已有缓存继续有效
+            params.update({
+                "render_mode": render_mode,
+                "old_color": old_color if render_mode in ("age", "age_trail") else None,
+                "age_span": age_span if render_mode in ("age", "age_trail") else None,
+                "trail_color": trail_color if render_mode in ("trail", "age_trail") else None,
+                "trail_decay": trail_decay if render_mode in ("trail", "age_trail") else None,
+            })
+        return params
+    
+    @classmethod
+    def IS_CHANGED(cls, **kwargs):
+        # 输出完全由参数决定，参数不变时ComfyUI可以跳过执行
+        return make_cache_key(cls._cache_params(**kwargs))
+    
+    def generate_animation(self, width, height, cell_size, frames, mode, preset, density, alive_color, dead_color, x_offset=None, y_offset=None, universe="toroidal", seed=0, backend="numpy",
+                           render_mode="cells", old_color="#FF4000", trail_color="#4040A0", age_span=64, trail_decay=32):
         """生成生命游戏动画
 
         Args:
@@ -56,84 +192,129 @@ class LifeGameAnimationNode:
             dead_color: 死细胞颜色
             x_offset: X偏移量
             y_offset: Y偏移量
+            universe: 宇宙类型（toroidal为环形网格，unbounded为无边界，只渲染原点处的width×height视口）
+            seed: random模式的随机种子
+            backend: 模拟后端（numpy，或在环形模式下用torch直接生成IMAGE张量）
+            render_mode: 渲染模式（cells、age按年龄着色、trail死细胞渐隐尾迹、age_trail两者兼有，仅环形模式）
+            old_color: 年龄达到age_span的细胞颜色
+            trail_color: 尾迹最强时的颜色
+            age_span: 年龄颜色渐变覆盖的代数
+            trail_decay: 尾迹强度（0-255）每代衰减的量
 
         Returns:
             Tuple[Tensor, dict]: 包含动画图像和最终状态的元组
         """
-        # 创建生命游戏实例
-        lifegame = LifeGame(width=width, height=height, cell_size=cell_size)
-        
-        # 根据模式初始化
-        if mode == "preset":
-            if x_offset is not None and y_offset is not None:
-                lifegame.load_preset(preset, x_offset=x_offset, y_offset=y_offset)
-            else:
-                lifegame.load_preset(preset)
-        else:  # random模式
-            lifegame.random_init(density=density)
-        
-        # 生成帧
-        frames_list = []
+        # 参数完全相同时直接读取缓存的帧和最终状态
+        cache_params = self._cache_params(width, height, cell_size, frames, mode, preset, density, alive_color,
+                                          dead_color, x_offset, y_offset, universe, seed, backend, render_mode,
+                                          old_color, trail_color, age_span, trail_decay)
+        import torch
+        cached = result_cache.get(cache_params)
+        if cached is not None:
+            frames_u8, final_state = cached
+            batch = torch.from_numpy(_UINT8_TO_FLOAT[frames_u8]).permute(0, 3, 1, 2)
+            return (batch, final_state)
         
-        # 解析颜色
-        alive_rgb = self._hex_to_rgb(alive_color)
-        dead_rgb = self._hex_to_rgb(dead_color)
+        # 创建生命游戏实例（统计缓冲区保留整个动画的历史）
+        lifegame = _init_lifegame(width, height, cell_size, mode, preset, density, x_offset, y_offset,
+                                  universe, stats_capacity=frames + 1, seed=seed,
+                                  track_age=(render_mode != "cells"), trail_decay=trail_decay)
         
-        # 生成每一帧
-        for _ in range(frames):
-            # 获取当前状态图像
-            current_frame = self._create_frame(lifegame, alive_rgb, dead_rgb)
-            frames_list.append(current_frame)
-            
-            # 更新状态
-            lifegame.update()
+        batch = self._animate(lifegame, frames, alive_color, dead_color, render_mode, old_color, trail_color,
+                              age_span, backend)
         
         # 创建最终状态
-        final_state = {
+        final_state = _final_state(lifegame, {
             "width": width,
             "height": height,
             "mode": mode,
             "preset": preset if mode == "preset" else None,
             "density": density,
-            "generation": lifegame.generation,
-            "grid": lifegame.grid.tolist()
-        }
+            "seed": seed if mode == "random" else None,
+            "universe": universe,
+            "cell_size": cell_size,
+            "alive_color": alive_color,
+            "dead_color": dead_color,
+            "render_mode": render_mode,
+            "old_color": old_color,
+            "trail_color": trail_color,
+            "age_span": age_span,
+            "trail_decay": trail_decay,
+        })
         
-        # 将帧转换为ComfyUI格式的批量图像
-        batch = torch.cat(frames_list, dim=0)
+        # 以uint8保存到缓存
+        frames_u8 = _batch_to_uint8(batch)
+        result_cache.put(cache_params, frames_u8, final_state)
         
         return (batch, final_state)
     
-    def _create_frame(self, lifegame, alive_rgb, dead_rgb):
+    def _animate(self, lifegame, frames, alive_color, dead_color, render_mode="cells", old_color="#FF4000",
+                 trail_color="#4040A0", age_span=64, backend="numpy"):
+        """从lifegame的当前状态开始渲染frames帧，结束时lifegame停在下一代
+        
+        Returns:
+            Tensor: 批量图像张量
+        """
+        import torch
+        import comfy.model_management
+        # 解析颜色
+        alive_rgb = self._hex_to_rgb(alive_color)
+        dead_rgb = self._hex_to_rgb(dead_color)
+        style = {
+            "mode": render_mode,
+            "old_rgb": self._hex_to_rgb(old_color),
+            "trail_rgb": self._hex_to_rgb(trail_color),
+            "age_span": age_span,
+        }
+        
+        if backend == "torch" and lifegame.universe is None and render_mode == "cells":
+            # torch后端直接写入预分配的图像张量
+            from ..server import torch_backend
+            batch = torch_backend.render_animation(
+                lifegame, frames, alive_rgb, dead_rgb,
+                on_frame=comfy.model_management.throw_exception_if_processing_interrupted)
+        else:
+            # 生成帧
+            frames_list = []
+            
+            # 生成每一帧
+            for _ in range(frames):
+                # 用户取消任务时抛出异常
+                comfy.model_management.throw_exception_if_processing_interrupted()
+                # 获取当前状态图像
+                current_frame = self._create_frame(lifegame, alive_rgb, dead_rgb, **style)
+                frames_list.append(current_frame)
+                
+                # 更新状态
+                lifegame.update()
+            
+            # 将帧转换为ComfyUI格式的批量图像
+            batch = torch.cat(frames_list, dim=0)
+        return batch
+    
+    def _create_frame(self, lifegame, alive_rgb, dead_rgb, mode="cells", old_rgb=(255, 64, 0),
+                      trail_rgb=(64, 64, 160), age_span=64):
         """从生命游戏状态创建单帧图像
         
         Args:
             lifegame: 生命游戏实例
             alive_rgb: 活细胞颜色RGB值
             dead_rgb: 死细胞颜色RGB值
+            mode: 渲染模式
+            old_rgb: age模式下老细胞的颜色RGB值
+            trail_rgb: trail模式下尾迹的颜色RGB值
+            age_span: 年龄颜色渐变覆盖的代数
             
         Returns:
             Tensor: 图像张量
         """
-        width, height = lifegame.width, lifegame.height
-        cell_size = lifegame.cell_size
-        img_width, img_height = width * cell_size, height * cell_size
-        
-        # 创建图像
-        img_array = np.zeros((img_height, img_width, 3), dtype=np.float32)
-        
-        # 填充死细胞背景
-        img_array[:, :] = [c/255.0 for c in dead_rgb]
-        
-        # 绘制活细胞
-        for y in range(height):
-            for x in range(width):
-                if lifegame.grid[y, x] == 1:
-                    y_start, y_end = y * cell_size, (y + 1) * cell_size
-                    x_start, x_end = x * cell_size, (x + 1) * cell_size
-                    img_array[y_start:y_end, x_start:x_end] = [c/255.0 for c in alive_rgb]
+        # 按调色板/颜色查找表向量化渲染，再查表转换为float32
+        pixels = lifegame.render(alive_rgb=alive_rgb, dead_rgb=dead_rgb, mode=mode, old_rgb=old_rgb,
+                                 trail_rgb=trail_rgb, age_span=age_span)
+        img_array = _UINT8_TO_FLOAT[pixels]
         
         # 转换为ComfyUI格式
+        import torch
         img_tensor = torch.from_numpy(img_array).permute(2, 0, 1)
         return img_tensor.unsqueeze(0)
     
@@ -142,6 +323,58 @@ class LifeGameAnimationNode:
         hex_color = hex_color.lstrip('#')
         return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
 
+class LifeGameContinueAnimationNode:
+    """从LIFEGAME_STATE继续演化的生命游戏动画节点
+
+    恢复网格、代数、年龄/尾迹和种群统计后继续生成N帧，沿用状态中的细胞大小、颜色和渲染模式。
+    串联多个片段只计算新增的代数，拼接后的帧与一次生成全部帧逐位一致。
+    """
+    
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "state": ("LIFEGAME_STATE",),
+                "frames": ("INT", {"default": 30, "min": 1, "max": 300, "step": 1}),
+            },
+            "optional": {
+                "backend": (["numpy", "torch"], {"default": "numpy"}),
+            }
+        }
+    
+    RETURN_TYPES = ("IMAGE", "LIFEGAME_STATE")
+    RETURN_NAMES = ("images", "final_state")
+    FUNCTION = "continue_animation"
+    CATEGORY = "生命游戏"
+    
+    def continue_animation(self, state, frames, backend="numpy"):
+        """从状态继续生成动画
+        
+        Args:
+            state: 上游节点输出的final_state
+            frames: 新增的帧数（第一帧为状态所在的代）
+            backend: 模拟后端
+            
+        Returns:
+            Tuple[Tensor, dict]: 包含动画图像和最终状态的元组
+        """
+        render_mode = state.get("render_mode", "cells")
+        stats = state.get("stats") or {"history": []}
+        lifegame = LifeGame(width=state["width"], height=state["height"], cell_size=state.get("cell_size", 5),
+                            stats_capacity=len(stats["history"]) + frames + 1,
+                            unbounded=(state.get("universe") == "unbounded"), engine=NODE_ENGINE,
+                            track_age=(render_mode != "cells"), trail_decay=state.get("trail_decay", 32))
+        lifegame.restore_state(state)
+        
+        batch = self._animate(lifegame, frames, state.get("alive_color", "#FFFFFF"),
+                              state.get("dead_color", "#000000"), render_mode, state.get("old_color", "#FF4000"),
+                              state.get("trail_color", "#4040A0"), state.get("age_span", 64), backend)
+        return (batch, _final_state(lifegame, state))
+    
+    _animate = LifeGameAnimationNode._animate
+    _create_frame = LifeGameAnimationNode._create_frame
+    _hex_to_rgb = LifeGameAnimationNode._hex_to_rgb
+
 class LifeGameSaveAnimationNode:
     """保存生命游戏动画为图像序列或视频"""
     
@@ -187,14 +420,15 @@ class LifeGameSaveAnimationNode:
         Returns:
             dict: 包含预览路径的字典
         """
+        import folder_paths
+        from PIL import Image
         output_dir = folder_paths.get_output_directory()
         
         # 确保输出目录存在
         os.makedirs(output_dir, exist_ok=True)
         
         # 生成文件路径
-        file_counter = len(os.listdir(output_dir))
-        filename = f"{filename_prefix}_{file_counter:05d}"
+        filename = _next_filename(output_dir, filename_prefix)
         
         preview_path = ""
         
@@ -225,26 +459,13 @@ class LifeGameSaveAnimationNode:
             print(f"生命游戏动画已保存为: {gif_path}")
             preview_path = os.path.join(folder_paths.get_output_directory(), f"{filename}.gif")
             
-            # 复制一份到web目录中供预览使用
-            web_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "web", "temp")
-            os.makedirs(web_dir, exist_ok=True)
-            web_preview_path = os.path.join(web_dir, f"{filename}.gif")
-            
-            # 复制文件
-            import shutil
-            try:
-                shutil.copy2(gif_path, web_preview_path)
-                print(f"已复制GIF到预览路径: {web_preview_path}")
-                
-                # 更新最新GIF信息并通知前端
-                update_latest_gif(f"{filename}.gif")
-                
-                # 返回相对路径
-                relative_path = f"temp/{filename}.gif"
-                print(f"生成的相对路径: {relative_path}")
-                print(f"返回值: ({relative_path},)")
-            except Exception as e:
-                print(f"复制GIF文件失败: {str(e)}")
+            # 预览代理直接从内存中的帧抽取生成
+            from ..server.preview_proxy import preview_proxies, sample_indices
+            indices = sample_indices(images.shape[0], preview_proxies.max_frames)
+            proxy_fps = fps * len(indices) / images.shape[0]
+            # 逐帧转换，不复制抽取的批次
+            load_frames = lambda: ((_frame_to_uint8(images[int(i)]) for i in indices), proxy_fps)
+            relative_path = _publish_gif_preview(gif_path, f"{filename}.gif", load_frames)
             
             # 为了确保前端能接收到预览路径，添加一个ui属性
             setattr(self, "output_ui", {"preview_path": relative_path})
@@ -285,13 +506,280 @@ class LifeGameSaveAnimationNode:
         
         return (relative_path,)
 
+class LifeGameStreamAnimationNode:
+    """边模拟边编码的生命游戏动画节点
+
+    每一代直接渲染为调色板索引帧并写入增量式GIF/APNG编码器，
+    不生成IMAGE批量张量，峰值内存只有几帧，与总帧数无关。
+    """
+    
+    PRESETS = list(LifeGame.PRESETS.keys())
+    
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "width": ("INT", {"default": 100, "min": 20, "max": 500, "step": 10}),
+                "height": ("INT", {"default": 100, "min": 20, "max": 500, "step": 10}),
+                "cell_size": ("INT", {"default": 5, "min": 1, "max": 20, "step": 1}),
+                "frames": ("INT", {"default": 300, "min": 1, "max": 100000, "step": 1}),
+                "mode": (["preset", "random"], {"default": "preset"}),
+                "preset": (cls.PRESETS, {"default": "glider"}),
+                "density": ("FLOAT", {"default": 0.3, "min": 0.1, "max": 0.9, "step": 0.1}),
+                "alive_color": ("STRING", {"default": "#FFFFFF"}),
+                "dead_color": ("STRING", {"default": "#000000"}),
+                "format": (["gif", "apng"], {"default": "gif"}),
+                "fps": ("INT", {"default": 10, "min": 1, "max": 60, "step": 1}),
+                "filename_prefix": ("STRING", {"default": "lifegame_stream"}),
+            },
+            "optional": {
+                "x_offset": ("INT", {"default": None, "min": 0, "max": 500, "step": 1}),
+                "y_offset": ("INT", {"default": None, "min": 0, "max": 500, "step": 1}),
+                "universe": (["toroidal", "unbounded"], {"default": "toroidal"}),
+                "seed": ("INT", {"default": 0, "min": 0, "max": 0xffffffffffffffff}),
+                "encoder": (["inline", "process"], {"default": "inline"}),
+            }
+        }
+    
+    RETURN_TYPES = ("STRING", "LIFEGAME_STATE")
+    RETURN_NAMES = ("preview_path", "final_state")
+    FUNCTION = "stream_animation"
+    OUTPUT_NODE = True
+    CATEGORY = "生命游戏"
+    
+    def __init__(self):
+        self.output_ui = {"preview_path": ""}
+    
+    GET_UI = LifeGameSaveAnimationNode.GET_UI
+    
+    def stream_animation(self, width, height, cell_size, frames, mode, preset, density, alive_color, dead_color,
+                         format, fps, filename_prefix, x_offset=None, y_offset=None, universe="toroidal", seed=0,
+                         encoder="inline"):
+        """模拟并流式编码动画
+
+        Args:
+            width: 网格宽度
+            height: 网格高度
+            cell_size: 细胞大小
+            frames: 帧数
+            mode: 模式（preset或random）
+            preset: 预设名称
+            density: 随机填充密度
+            alive_color: 活细胞颜色
+            dead_color: 死细胞颜色
+            format: 输出格式（gif或apng）
+            fps: 每秒帧数
+            filename_prefix: 文件名前缀
+            x_offset: X偏移量
+            y_offset: Y偏移量
+            universe: 宇宙类型
+            seed: random模式的随机种子
+            encoder: inline在当前线程编码；process通过共享内存交给独立进程编码，模拟与编码并行
+
+        Returns:
+            Tuple[str, dict]: 预览路径和最终状态
+        """
+        lifegame = _init_lifegame(width, height, cell_size, mode, preset, density, x_offset, y_offset, universe,
+                                  seed=seed)
+        
+        # 调色板：索引0为死细胞，索引1为活细胞
+        palette = np.array([self._hex_to_rgb(dead_color), self._hex_to_rgb(alive_color)], dtype=np.uint8)
+        index_lut = np.arange(2, dtype=np.uint8)
+        
+        import folder_paths
+        from ..server.stream_writer import ApngStreamWriter, GifStreamWriter
+        output_dir = folder_paths.get_output_directory()
+        os.makedirs(output_dir, exist_ok=True)
+        filename = f"{_next_filename(output_dir, filename_prefix)}.{'gif' if format == 'gif' else 'png'}"
+        path = os.path.join(output_dir, filename)
+        
+        import comfy.model_management
+        img_width, img_height = width * cell_size, height * cell_size
+        completed = False
+        try:
+            if encoder == "process":
+                from ..server.shared_encoder import SharedMemoryStreamEncoder
+                # 每代的网格经共享内存交给编码进程，attach时发布第0帧；
+                # 异常（包括用户取消）时退出with块会终止编码进程并释放共享内存
+                with SharedMemoryStreamEncoder(
+                        path, format, height, width, cell_size, palette, fps=fps, frame_count=frames,
+                        on_wait=comfy.model_management.throw_exception_if_processing_interrupted) as shared_encoder:
+                    try:
+                        lifegame.attach_shared_buffer(shared_encoder)
+                        for _ in range(frames - 1):
+                            comfy.model_management.throw_exception_if_processing_interrupted()
+                            lifegame.update()
+                    finally:
+                        lifegame.attach_shared_buffer(None)
+                lifegame.update()
+            else:
+                if format == "gif":
+                    writer = GifStreamWriter(path, img_width, img_height, palette, fps=fps)
+                else:
+                    writer = ApngStreamWriter(path, img_width, img_height, palette, fps=fps, frame_count=frames)
+                
+                with writer:
+                    for _ in range(frames):
+                        comfy.model_management.throw_exception_if_processing_interrupted()
+                        writer.write(render_cells(lifegame.get_grid(), cell_size, index_lut))
+                        lifegame.update()
+            completed = True
+        finally:
+            # 取消或失败时删除写了一半的文件
+            if not completed and os.path.exists(path):
+                os.remove(path)
+        print(f"生命游戏动画已流式保存为: {path}")
+        
+        final_state = _final_state(lifegame, {
+            "width": width,
+            "height": height,
+            "mode": mode,
+            "preset": preset if mode == "preset" else None,
+            "density": density,
+            "seed": seed if mode == "random" else None,
+            "universe": universe,
+            "cell_size": cell_size,
+            "alive_color": alive_color,
+            "dead_color": dead_color,
+            "render_mode": "cells",
+        })
+        
+        preview_path = _publish_gif_preview(path, filename) if format == "gif" else ""
+        setattr(self, "output_ui", {"preview_path": preview_path})
+        return (preview_path, final_state)
+    
+    _hex_to_rgb = LifeGameAnimationNode._hex_to_rgb
+
+class LifeGameLargeBoardNode:
+    """超大棋盘生命游戏节点
+
+    网格按位压缩保存在输出目录下的映射文件中（见MappedUniverse），可以模拟超出内存的棋盘，
+    并直接从映射数据渲染局部视口或按密度着色的缩略总览。
+    同名棋盘的尺寸和初始化参数不变时从已保存的代数继续演化，缩放或平移视口不需要重新模拟。
+    """
+    
+    PRESETS = list(LifeGame.PRESETS.keys())
+    
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "width": ("INT", {"default": 4096, "min": 8, "max": 1 << 20, "step": 8}),
+                "height": ("INT", {"default": 4096, "min": 8, "max": 1 << 20, "step": 8}),
+                "generations": ("INT", {"default": 0, "min": 0, "max": 100000, "step": 1}),
+                "mode": (["preset", "random"], {"default": "random"}),
+                "preset": (cls.PRESETS, {"default": "glider"}),
+                "density": ("FLOAT", {"default": 0.3, "min": 0.1, "max": 0.9, "step": 0.1}),
+                "view": (["overview", "viewport"], {"default": "overview"}),
+                "alive_color": ("STRING", {"default": "#FFFFFF"}),
+                "dead_color": ("STRING", {"default": "#000000"}),
+                "board_name": ("STRING", {"default": "lifegame_board"}),
+            },
+            "optional": {
+                "seed": ("INT", {"default": 0, "min": 0, "max": 0xffffffffffffffff}),
+                "universe": (["toroidal", "bounded"], {"default": "toroidal"}),
+                "view_x": ("INT", {"default": 0, "min": 0, "max": 1 << 20, "step": 1}),
+                "view_y": ("INT", {"default": 0, "min": 0, "max": 1 << 20, "step": 1}),
+                "view_width": ("INT", {"default": 256, "min": 8, "max": 4096, "step": 8}),
+                "view_height": ("INT", {"default": 256, "min": 8, "max": 4096, "step": 8}),
+                "cell_size": ("INT", {"default": 2, "min": 1, "max": 20, "step": 1}),
+                "overview_size": ("INT", {"default": 1024, "min": 64, "max": 4096, "step": 64}),
+            }
+        }
+    
+    RETURN_TYPES = ("IMAGE", "INT")
+    RETURN_NAMES = ("image", "population")
+    FUNCTION = "render_board"
+    CATEGORY = "生命游戏"
+    
+    def render_board(self, width, height, generations, mode, preset, density, view, alive_color, dead_color,
+                     board_name, seed=0, universe="toroidal", view_x=0, view_y=0, view_width=256, view_height=256,
+                     cell_size=2, overview_size=1024):
+        """模拟超大棋盘到指定代数并渲染视口或总览
+        
+        Args:
+            width: 棋盘宽度
+            height: 棋盘高度
+            generations: 目标代数
+            mode: 模式（preset或random）
+            preset: 预设名称（居中放置）
+            density: 随机填充密度
+            view: overview渲染整个棋盘的密度总览，viewport渲染局部视口
+            alive_color: 活细胞颜色
+            dead_color: 死细胞颜色
+            board_name: 棋盘名称，对应输出目录下lifegame_boards中的子目录
+            seed: random模式的随机种子
+            universe: toroidal为环形边界，bounded为边界外全部是死细胞
+            view_x: 视口左上角x坐标
+            view_y: 视口左上角y坐标
+            view_width: 视口宽度（细胞）
+            view_height: 视口高度（细胞）
+            cell_size: 视口中每个细胞的像素大小
+            overview_size: 总览的最大边长（像素）
+            
+        Returns:
+            Tuple[Tensor, int]: 图像和活细胞数量
+        """
+        import comfy.model_management
+        import folder_paths
+        from ..server.mapped_universe import MappedUniverse
+        
+        directory = os.path.join(folder_paths.get_output_directory(), "lifegame_boards",
+                                 os.path.basename(board_name) or "lifegame_board")
+        info = {
+            "mode": mode,
+            "preset": preset if mode == "preset" else None,
+            "density": density if mode == "random" else None,
+            "seed": seed if mode == "random" else None,
+        }
+        
+        board = None
+        try:
+            board = MappedUniverse.open(directory)
+            # 参数不同或已超过目标代数时重新初始化
+            if ((board.width, board.height, board.wrap) != (width, height, universe == "toroidal")
+                    or board.info != info or board.generation > generations):
+                board.close()
+                board = None
+        except (FileNotFoundError, ValueError, KeyError):
+            board = None
+        if board is None:
+            board = MappedUniverse.create(directory, width, height, wrap=(universe == "toroidal"), info=info)
+            if mode == "preset":
+                board.load_pattern(LifeGame.PRESETS[preset])
+            else:
+                board.random_init(density=density, seed=seed)
+        
+        with board:
+            # 每个条带之后检查取消；元数据按代保存，取消后再次执行会从最后一个完整的代继续
+            board.step(generations - board.generation,
+                       on_stripe=comfy.model_management.throw_exception_if_processing_interrupted)
+            alive_rgb, dead_rgb = self._hex_to_rgb(alive_color), self._hex_to_rgb(dead_color)
+            if view == "viewport":
+                pixels = board.render_viewport(view_x, view_y, view_width, view_height, cell_size, alive_rgb, dead_rgb)
+            else:
+                pixels = board.render_overview(overview_size, alive_rgb, dead_rgb)
+            population = board.population
+        
+        import torch
+        image = torch.from_numpy(_UINT8_TO_FLOAT[pixels]).permute(2, 0, 1).unsqueeze(0)
+        return (image, population)
+    
+    _hex_to_rgb = LifeGameAnimationNode._hex_to_rgb
+
 # 注册节点
 NODE_CLASS_MAPPINGS = {
     "LifeGameAnimation": LifeGameAnimationNode,
-    "LifeGameSaveAnimation": LifeGameSaveAnimationNode
+    "LifeGameContinueAnimation": LifeGameContinueAnimationNode,
+    "LifeGameSaveAnimation": LifeGameSaveAnimationNode,
+    "LifeGameStreamAnimation": LifeGameStreamAnimationNode,
+    "LifeGameLargeBoard": LifeGameLargeBoardNode
 }
 
 NODE_DISPLAY_NAME_MAPPINGS = {
     "LifeGameAnimation": "生命游戏动画",
-    "LifeGameSaveAnimation": "保存生命游戏动画"
+    "LifeGameContinueAnimation": "继续生命游戏动画",
+    "LifeGameSaveAnimation": "保存生命游戏动画",
+    "LifeGameStreamAnimation": "流式生成生命游戏动画",
+    "LifeGameLargeBoard": "超大棋盘生命游戏"
 }
@@ -1,5 +1,20 @@
-from .api import register_routes
-from .lifegame_logic import lifegame_instance
+"""
+生命游戏服务端核心包
+
+子模块按需导入：lifegame_logic等核心模块只依赖numpy，API路由模块（需要aiohttp）
+只有在访问register_routes时才会加载。
+"""
+
+
+def __getattr__(name):
+    if name == "register_routes":
+        from .api import register_routes
+        return register_routes
+    if name in ("lifegame_instance", "get_lifegame_instance"):
+        from . import lifegame_logic
+        return getattr(lifegame_logic, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # 导出生命游戏实例，方便其他模块使用
-__all__ = ["register_routes", "lifegame_instance"]
\ No newline at end of file
+__all__ = ["register_routes", "lifegame_instance", "get_lifegame_instance"]
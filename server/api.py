@@ -1,18 +1,76 @@
 """
 生命游戏API接口模块
+
+路由定义在模块级的RouteTableDef中，不依赖PromptServer；
+插件加载时通过register_routes挂载到PromptServer，也可以挂载到任意aiohttp应用。
 """
+import asyncio
 import json
 import io
 import base64
 import os
 import time
 from aiohttp import web
-from server import PromptServer
-from .lifegame_logic import lifegame_instance
+from .lifegame_logic import get_lifegame_instance
+from .profiler import profile_manager, profiled_handler
+from .ws_manager import WebSocketClientManager
+from .preview_store import preview_store
+from .preview_proxy import full_name, preview_proxies
+from .render import RENDER_MODES, zoom_level
+
+# 本模块定义的全部路由
+routes = web.RouteTableDef()
+
+# 视口宽高（细胞）和缩小倍数的上限
+MAX_VIEWPORT_CELLS = 1 << 20
+# 输出的图像边长（像素）或网格边长（块）的上限
+MAX_OUTPUT_SIDE = 4096
+
+def _parse_viewport(request, pixels=True):
+    """从查询参数中解析视口窗口（x, y, w, h）和缩放（zoom）
+    
+    Args:
+        request: HTTP请求对象
+        pixels (bool): 输出是否为图像（zoom不小于1时按zoom放大），否则为网格
+        
+    Returns:
+        dict: 可直接传给LifeGame.get_state/get_image的关键字参数
+
+    Raises:
+        ValueError: 参数无效或超出上限
+    """
+    query = request.query
+    viewport = {
+        "x": int(query.get('x', 0)),
+        "y": int(query.get('y', 0)),
+    }
+    for key, name in (('w', "width"), ('h', "height")):
+        if key in query:
+            value = int(query[key])
+            if not 1 <= value <= MAX_VIEWPORT_CELLS:
+                raise ValueError(f"{key} must be between 1 and {MAX_VIEWPORT_CELLS}")
+            viewport[name] = value
+    if 'zoom' in query:
+        zoom = float(query['zoom'])
+        if not 1.0 / MAX_VIEWPORT_CELLS <= zoom <= MAX_OUTPUT_SIDE:
+            raise ValueError(f"zoom must be between 1/{MAX_VIEWPORT_CELLS} and {MAX_OUTPUT_SIDE}")
+        viewport["zoom"] = zoom
+    # 按实际生效的尺寸检查输出大小
+    game = get_lifegame_instance()
+    side = max(viewport.get("width", game.width), viewport.get("height", game.height))
+    zoom = viewport.get("zoom", game.cell_size if pixels else None)
+    level = zoom_level(zoom, side) if zoom is not None else 0
+    output = -(-side >> level)
+    if pixels and zoom is not None and level == 0:
+        output *= max(1, int(round(zoom)))
+    if output > MAX_OUTPUT_SIDE:
+        raise ValueError(f"Viewport output of {output} exceeds the limit of {MAX_OUTPUT_SIDE}, use a smaller w/h or zoom")
+    return viewport
 
 # 游戏控制API
-@PromptServer.instance.routes.post("/api/extensions/comfyui-lifegame/lifegame/start")
-@PromptServer.instance.routes.post("/api/lifegame/start")
+@routes.post("/api/extensions/comfyui-lifegame/lifegame/start")
+@routes.post("/api/lifegame/start")
+@profiled_handler
 async def start_game(request):
     """开始游戏
     
@@ -22,11 +80,12 @@ async def start_game(request):
     Returns:
         web.Response: HTTP响应
     """
-    lifegame_instance.start()
+    get_lifegame_instance().start()
     return web.json_response({"status": "success", "message": "Game started"})
 
-@PromptServer.instance.routes.post("/api/extensions/comfyui-lifegame/lifegame/stop")
-@PromptServer.instance.routes.post("/api/lifegame/stop")
+@routes.post("/api/extensions/comfyui-lifegame/lifegame/stop")
+@routes.post("/api/lifegame/stop")
+@profiled_handler
 async def stop_game(request):
     """停止游戏
     
@@ -36,16 +95,17 @@ async def stop_game(request):
     Returns:
         web.Response: HTTP响应
     """
-    lifegame_instance.stop()
+    get_lifegame_instance().stop()
     return web.json_response({"status": "success", "message": "Game stopped"})
 
-@PromptServer.instance.routes.post("/api/extensions/comfyui-lifegame/lifegame/random_init")
-@PromptServer.instance.routes.post("/api/lifegame/random_init")
+@routes.post("/api/extensions/comfyui-lifegame/lifegame/random_init")
+@routes.post("/api/lifegame/random_init")
+@profiled_handler
 async def random_init_game(request):
     """随机初始化游戏
     
     Args:
-        request: HTTP请求对象，可以包含density参数
+        request: HTTP请求对象，可以包含density和seed参数
         
     Returns:
         web.Response: HTTP响应
@@ -53,17 +113,21 @@ async def random_init_game(request):
     try:
         data = await request.json()
         density = float(data.get('density', 0.3))
-        lifegame_instance.random_init(density)
+        seed = data.get('seed')
+        if seed is not None:
+            seed = int(seed)
+        get_lifegame_instance().random_init(density, seed)
         return web.json_response({"status": "success", "message": f"Game initialized randomly with density {density}"})
     except json.JSONDecodeError:
         # 如果请求没有JSON数据，使用默认值
-        lifegame_instance.random_init()
+        get_lifegame_instance().random_init()
         return web.json_response({"status": "success", "message": "Game initialized randomly with default density"})
     except Exception as e:
         return web.json_response({"status": "error", "message": str(e)}, status=400)
 
-@PromptServer.instance.routes.post("/api/extensions/comfyui-lifegame/lifegame/clear")
-@PromptServer.instance.routes.post("/api/lifegame/clear")
+@routes.post("/api/extensions/comfyui-lifegame/lifegame/clear")
+@routes.post("/api/lifegame/clear")
+@profiled_handler
 async def clear_game(request):
     """清空游戏网格
     
@@ -73,35 +137,70 @@ async def clear_game(request):
     Returns:
         web.Response: HTTP响应
     """
-    lifegame_instance.clear()
+    get_lifegame_instance().clear()
     return web.json_response({"status": "success", "message": "Game grid cleared"})
 
-@PromptServer.instance.routes.get("/api/extensions/comfyui-lifegame/lifegame/state")
-@PromptServer.instance.routes.get("/api/lifegame/state")
+@routes.get("/api/extensions/comfyui-lifegame/lifegame/state")
+@routes.get("/api/lifegame/state")
+@profiled_handler
 async def get_state(request):
     """获取游戏状态
     
     Args:
-        request: HTTP请求对象
+        request: HTTP请求对象，可选查询参数x, y, w, h指定视口窗口，zoom指定每个细胞的像素数（小于1时显示块密度）
         
     Returns:
         web.Response: HTTP响应，包含游戏当前状态
     """
-    state = lifegame_instance.get_state()
+    try:
+        viewport = _parse_viewport(request, pixels=False)
+    except ValueError as e:
+        return web.json_response({"status": "error", "message": str(e)}, status=400)
+    state = get_lifegame_instance().get_state(**viewport)
     return web.json_response({"status": "success", "data": state})
 
-@PromptServer.instance.routes.get("/api/extensions/comfyui-lifegame/lifegame/image")
-@PromptServer.instance.routes.get("/api/lifegame/image")
+@routes.get("/api/extensions/comfyui-lifegame/lifegame/stats")
+@routes.get("/api/lifegame/stats")
+@profiled_handler
+async def get_stats(request):
+    """获取种群统计
+    
+    Args:
+        request: HTTP请求对象，可选查询参数last（返回最近多少代的历史）
+        
+    Returns:
+        web.Response: HTTP响应，包含当前种群、出生、死亡、包围盒及历史记录
+    """
+    try:
+        last = request.query.get('last')
+        if last is not None:
+            last = int(last)
+        stats = get_lifegame_instance().get_stats(last)
+        return web.json_response({"status": "success", "data": stats})
+    except Exception as e:
+        return web.json_response({"status": "error", "message": str(e)}, status=400)
+
+@routes.get("/api/extensions/comfyui-lifegame/lifegame/image")
+@routes.get("/api/lifegame/image")
+@profiled_handler
 async def get_image(request):
     """获取游戏图像
     
     Args:
-        request: HTTP请求对象
+        request: HTTP请求对象，可选查询参数x, y, w, h指定视口窗口，zoom指定每个细胞的像素数（小于1时显示块密度），
+            mode指定渲染模式（cells、age、trail或age_trail）
         
     Returns:
         web.Response: HTTP响应，包含游戏当前图像的base64编码
     """
-    img = lifegame_instance.get_image()
+    try:
+        viewport = _parse_viewport(request)
+    except ValueError as e:
+        return web.json_response({"status": "error", "message": str(e)}, status=400)
+    mode = request.query.get('mode', 'cells')
+    if mode not in RENDER_MODES:
+        return web.json_response({"status": "error", "message": f"Unknown render mode: {mode}"}, status=400)
+    img = get_lifegame_instance().get_image(mode=mode, **viewport)
     # 将图像转换为base64字符串
     buffer = io.BytesIO()
     img.save(buffer, format="PNG")
@@ -112,8 +211,9 @@ async def get_image(request):
         "image": f"data:image/png;base64,{img_base64}"
     })
 
-@PromptServer.instance.routes.post("/api/extensions/comfyui-lifegame/lifegame/set_cell")
-@PromptServer.instance.routes.post("/api/lifegame/set_cell")
+@routes.post("/api/extensions/comfyui-lifegame/lifegame/set_cell")
+@routes.post("/api/lifegame/set_cell")
+@profiled_handler
 async def set_cell(request):
     """设置单个细胞状态
     
@@ -129,13 +229,14 @@ async def set_cell(request):
         y = int(data.get('y', 0))
         state = int(data.get('state', 0))
         
-        lifegame_instance.set_cell(x, y, state)
+        get_lifegame_instance().set_cell(x, y, state)
         return web.json_response({"status": "success", "message": f"Cell at ({x}, {y}) set to {state}"})
     except Exception as e:
         return web.json_response({"status": "error", "message": str(e)}, status=400)
 
-@PromptServer.instance.routes.post("/api/extensions/comfyui-lifegame/lifegame/toggle_cell")
-@PromptServer.instance.routes.post("/api/lifegame/toggle_cell")
+@routes.post("/api/extensions/comfyui-lifegame/lifegame/toggle_cell")
+@routes.post("/api/lifegame/toggle_cell")
+@profiled_handler
 async def toggle_cell(request):
     """切换单个细胞状态
     
@@ -150,7 +251,7 @@ async def toggle_cell(request):
         x = int(data.get('x', 0))
         y = int(data.get('y', 0))
         
-        new_state = lifegame_instance.toggle_cell(x, y)
+        new_state = get_lifegame_instance().toggle_cell(x, y)
         if new_state is not None:
             return web.json_response({
                 "status": "success", 
@@ -165,8 +266,9 @@ async def toggle_cell(request):
     except Exception as e:
         return web.json_response({"status": "error", "message": str(e)}, status=400)
 
-@PromptServer.instance.routes.post("/api/extensions/comfyui-lifegame/lifegame/set_interval")
-@PromptServer.instance.routes.post("/api/lifegame/set_interval")
+@routes.post("/api/extensions/comfyui-lifegame/lifegame/set_interval")
+@routes.post("/api/lifegame/set_interval")
+@profiled_handler
 async def set_interval(request):
     """设置更新间隔
     
@@ -180,16 +282,170 @@ async def set_interval(request):
         data = await request.json()
         interval = float(data.get('interval', 0.1))
         
-        lifegame_instance.set_update_interval(interval)
+        get_lifegame_instance().set_update_interval(interval)
+        return web.json_response({
+            "status": "success", 
+            "message": f"Update interval set to {get_lifegame_instance().update_interval}s"
+        })
+    except Exception as e:
+        return web.json_response({"status": "error", "message": str(e)}, status=400)
+
+@routes.post("/api/extensions/comfyui-lifegame/lifegame/seek")
+@routes.post("/api/lifegame/seek")
+@profiled_handler
+async def seek(request):
+    """跳转到历史中保留的某一代
+    
+    Args:
+        request: HTTP请求对象，通过查询参数或JSON包含generation参数
+        
+    Returns:
+        web.Response: HTTP响应
+    """
+    try:
+        generation = request.query.get('generation')
+        if generation is None:
+            try:
+                data = await request.json()
+            except json.JSONDecodeError:
+                data = {}
+            generation = data.get('generation')
+        if generation is None:
+            return web.json_response({
+                "status": "error", 
+                "message": "generation is required"
+            }, status=400)
+        generation = int(generation)
+        
+        if get_lifegame_instance().seek(generation):
+            return web.json_response({
+                "status": "success", 
+                "message": f"Seeked to generation {generation}",
+                "history": get_lifegame_instance().get_history_info()
+            })
+        return web.json_response({
+            "status": "error", 
+            "message": f"Generation {generation} is not in history",
+            "history": get_lifegame_instance().get_history_info()
+        }, status=404)
+    except Exception as e:
+        return web.json_response({"status": "error", "message": str(e)}, status=400)
+
+@routes.post("/api/extensions/comfyui-lifegame/lifegame/rewind")
+@routes.post("/api/lifegame/rewind")
+@profiled_handler
+async def rewind(request):
+    """回退若干代
+    
+    Args:
+        request: HTTP请求对象，可选包含steps参数（默认1）
+        
+    Returns:
+        web.Response: HTTP响应
+    """
+    try:
+        try:
+            data = await request.json()
+        except json.JSONDecodeError:
+            data = {}
+        steps = int(data.get('steps', request.query.get('steps', 1)))
+        
+        if get_lifegame_instance().rewind(steps):
+            return web.json_response({
+                "status": "success", 
+                "message": f"Rewound to generation {get_lifegame_instance().generation}",
+                "generation": get_lifegame_instance().generation
+            })
+        return web.json_response({
+            "status": "error", 
+            "message": f"Cannot rewind {steps} generations",
+            "history": get_lifegame_instance().get_history_info()
+        }, status=404)
+    except Exception as e:
+        return web.json_response({"status": "error", "message": str(e)}, status=400)
+
+@routes.get("/api/extensions/comfyui-lifegame/lifegame/history")
+@routes.get("/api/lifegame/history")
+@profiled_handler
+async def get_history(request):
+    """获取时间回溯历史的保留范围和占用字节数
+    
+    Args:
+        request: HTTP请求对象
+        
+    Returns:
+        web.Response: HTTP响应
+    """
+    return web.json_response({"status": "success", "data": get_lifegame_instance().get_history_info()})
+
+@routes.post("/api/extensions/comfyui-lifegame/lifegame/universe")
+@routes.post("/api/lifegame/universe")
+@profiled_handler
+async def set_universe(request):
+    """切换环形网格与无边界稀疏宇宙
+    
+    Args:
+        request: HTTP请求对象，包含mode参数（toroidal或unbounded），可选chunk_size参数
+        
+    Returns:
+        web.Response: HTTP响应
+    """
+    try:
+        data = await request.json()
+        mode = data.get('mode', 'toroidal')
+        if mode not in ('toroidal', 'unbounded'):
+            return web.json_response({
+                "status": "error",
+                "message": f"Unknown universe mode: {mode}"
+            }, status=400)
+        chunk_size = int(data.get('chunk_size', 64))
+        
+        get_lifegame_instance().set_universe_mode(mode == 'unbounded', chunk_size)
+        return web.json_response({"status": "success", "message": f"Universe mode set to {mode}"})
+    except Exception as e:
+        return web.json_response({"status": "error", "message": str(e)}, status=400)
+
+@routes.get("/api/extensions/comfyui-lifegame/lifegame/engine")
+@routes.get("/api/lifegame/engine")
+@profiled_handler
+async def get_engine(request):
+    """获取当前使用的步进引擎
+    
+    Args:
+        request: HTTP请求对象
+        
+    Returns:
+        web.Response: HTTP响应，包含引擎模式、当前引擎、可用引擎和自动调优结果
+    """
+    return web.json_response({"status": "success", "data": get_lifegame_instance().get_engine_info()})
+
+@routes.post("/api/extensions/comfyui-lifegame/lifegame/engine")
+@routes.post("/api/lifegame/engine")
+@profiled_handler
+async def set_engine(request):
+    """设置步进引擎
+    
+    Args:
+        request: HTTP请求对象，包含engine参数（引擎名称或auto）
+        
+    Returns:
+        web.Response: HTTP响应
+    """
+    try:
+        data = await request.json()
+        engine = data.get('engine', 'auto')
+        active = get_lifegame_instance().set_engine(engine)
         return web.json_response({
             "status": "success", 
-            "message": f"Update interval set to {lifegame_instance.update_interval}s"
+            "message": f"Engine set to {engine}",
+            "active": active
         })
     except Exception as e:
         return web.json_response({"status": "error", "message": str(e)}, status=400)
 
-@PromptServer.instance.routes.get("/api/extensions/comfyui-lifegame/lifegame/presets")
-@PromptServer.instance.routes.get("/api/lifegame/presets")
+@routes.get("/api/extensions/comfyui-lifegame/lifegame/presets")
+@routes.get("/api/lifegame/presets")
+@profiled_handler
 async def get_presets(request):
     """获取所有可用的预设
     
@@ -199,14 +455,15 @@ async def get_presets(request):
     Returns:
         web.Response: HTTP响应，包含所有可用预设名称的列表
     """
-    presets = lifegame_instance.get_presets()
+    presets = get_lifegame_instance().get_presets()
     return web.json_response({
         "status": "success", 
         "presets": presets
     })
 
-@PromptServer.instance.routes.post("/api/extensions/comfyui-lifegame/lifegame/load_preset")
-@PromptServer.instance.routes.post("/api/lifegame/load_preset")
+@routes.post("/api/extensions/comfyui-lifegame/lifegame/load_preset")
+@routes.post("/api/lifegame/load_preset")
+@profiled_handler
 async def load_preset(request):
     """加载预设图案
     
@@ -233,7 +490,7 @@ async def load_preset(request):
         if y_offset is not None:
             y_offset = int(y_offset)
         
-        success = lifegame_instance.load_preset(preset_name, x_offset, y_offset)
+        success = get_lifegame_instance().load_preset(preset_name, x_offset, y_offset)
         if success:
             return web.json_response({
                 "status": "success", 
@@ -247,72 +504,146 @@ async def load_preset(request):
     except Exception as e:
         return web.json_response({"status": "error", "message": str(e)}, status=400)
 
-@PromptServer.instance.routes.get("/api/extensions/comfyui-lifegame/animation/preview/{filename}")
+# 性能分析API
+@routes.post("/api/extensions/comfyui-lifegame/lifegame/profile/start")
+@routes.post("/api/lifegame/profile/start")
+async def start_profile(request):
+    """开始一次性能分析采集
+
+    Args:
+        request: HTTP请求对象，可选包含generations（代数上限）和seconds（时间上限）参数
+
+    Returns:
+        web.Response: HTTP响应，包含采集状态
+    """
+    try:
+        try:
+            data = await request.json()
+        except json.JSONDecodeError:
+            data = {}
+        generations = data.get('generations')
+        if generations is not None:
+            generations = int(generations)
+        seconds = data.get('seconds')
+        if seconds is not None:
+            seconds = float(seconds)
+
+        capture = profile_manager.start(max_generations=generations, max_seconds=seconds)
+        if capture is None:
+            return web.json_response({
+                "status": "error",
+                "message": "A profile capture is already running"
+            }, status=409)
+        return web.json_response({"status": "success", "data": capture.status()})
+    except Exception as e:
+        return web.json_response({"status": "error", "message": str(e)}, status=400)
+
+@routes.post("/api/extensions/comfyui-lifegame/lifegame/profile/stop")
+@routes.post("/api/lifegame/profile/stop")
+async def stop_profile(request):
+    """提前停止当前的性能分析采集
+
+    Args:
+        request: HTTP请求对象
+
+    Returns:
+        web.Response: HTTP响应，包含生成的文件名
+    """
+    files = profile_manager.stop()
+    if files is None:
+        return web.json_response({"status": "error", "message": "No profile capture"}, status=404)
+    return web.json_response({"status": "success", "data": profile_manager.status()})
+
+@routes.get("/api/extensions/comfyui-lifegame/lifegame/profile")
+@routes.get("/api/lifegame/profile")
+async def get_profile_status(request):
+    """获取性能分析采集状态
+
+    Args:
+        request: HTTP请求对象
+
+    Returns:
+        web.Response: HTTP响应，包含采集状态和结果文件名
+    """
+    return web.json_response({"status": "success", "data": profile_manager.status()})
+
+@routes.get("/api/extensions/comfyui-lifegame/lifegame/profile/download/{filename}")
+@routes.get("/api/lifegame/profile/download/{filename}")
+async def download_profile(request):
+    """下载性能分析结果文件（.pstats或折叠栈文本）
+
+    Args:
+        request: HTTP请求对象，包含filename参数
+
+    Returns:
+        web.FileResponse: 结果文件
+    """
+    filename = request.match_info['filename']
+    path = profile_manager.get_file_path(filename)
+    if path is None:
+        return web.Response(status=404, text=f"文件不存在: {filename}")
+    return web.FileResponse(path, headers={
+        "Content-Disposition": f'attachment; filename="{filename}"'
+    })
+
+@routes.get("/api/extensions/comfyui-lifegame/animation/preview/{filename}")
 async def get_animation_preview(request):
     """获取生命游戏动画预览
     
+    文件直接从登记的位置返回（sendfile零拷贝），支持ETag/Last-Modified条件请求和Range请求。
+    请求仍在后台生成的预览代理时等待其完成。
+    
     Args:
         request: HTTP请求对象，包含filename参数
         
     Returns:
         web.FileResponse: 返回GIF文件
     """
-    try:
-        filename = request.match_info['filename']
-        
-        # 安全检查，防止路径穿越攻击
-        if '..' in filename or filename.startswith('/'):
-            return web.Response(status=403, text="路径不允许")
-        
-        # 构建GIF文件路径
-        current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        gif_path = os.path.join(current_dir, "web", "temp", filename)
-        
-        debug_info = {
-            "requested_file": filename,
-            "full_path": gif_path,
-            "exists": os.path.exists(gif_path),
-            "dir_exists": os.path.exists(os.path.dirname(gif_path))
-        }
-        print(f"预览请求信息: {debug_info}")
-        
-        # 检查文件是否存在
-        if not os.path.exists(gif_path):
-            return web.Response(status=404, text=f"文件不存在: {gif_path}")
-        
-        # 返回文件
-        return web.FileResponse(gif_path)
-    except Exception as e:
-        import traceback
-        print(f"获取预览出错: {str(e)}")
-        print(traceback.format_exc())
-        return web.Response(status=500, text=str(e))
+    filename = request.match_info['filename']
+    future = preview_proxies.pending(filename)
+    if future is not None:
+        try:
+            await asyncio.wrap_future(future)
+        except Exception as e:
+            print(f"等待预览代理失败: {e}")
+    path = preview_store.resolve(filename)
+    # 代理生成失败或已被淘汰时返回原始GIF
+    if (path is None or not os.path.isfile(path)) and full_name(filename):
+        path = preview_store.resolve(full_name(filename))
+    if path is None or not os.path.isfile(path):
+        return web.Response(status=404, text="预览文件不存在")
+    
+    # 文件名可能在输出目录中被复用，浏览器需按ETag重新验证
+    return web.FileResponse(path, headers={"Cache-Control": "no-cache"})
 
-# 用于存储最新生成的GIF文件信息
+# 用于存储最新生成的GIF文件信息（path为预览代理，full为原始GIF）
 latest_gif_info = {
     "path": None,
+    "full": None,
     "timestamp": 0
 }
 
+# GIF更新WebSocket客户端管理器
+ws_manager = WebSocketClientManager()
+
 # 注册一个WebSocket处理器，用于实时通知GIF生成
-@PromptServer.instance.routes.get("/ws/lifegame/gif_updates")
+@routes.get("/ws/lifegame/gif_updates")
 async def websocket_gif_updates(request):
     ws = web.WebSocketResponse()
     await ws.prepare(request)
     
-    # 将当前WebSocket连接添加到WebSocket列表中
-    if not hasattr(PromptServer.instance, 'lifegame_ws_clients'):
-        PromptServer.instance.lifegame_ws_clients = []
-    PromptServer.instance.lifegame_ws_clients.append(ws)
+    # 登记客户端，由管理器的写任务负责发送
+    ws_manager.register(ws)
     
-    print(f"新的WebSocket连接，当前客户端数: {len(PromptServer.instance.lifegame_ws_clients)}")
+    print(f"新的WebSocket连接，当前客户端数: {len(ws_manager.clients)}")
     
     try:
         # 发送当前最新的GIF信息
         if latest_gif_info["path"]:
-            await ws.send_json({
+            ws_manager.send(ws, {
                 "type": "gif_update",
                 "path": latest_gif_info["path"],
+                "full": latest_gif_info["full"],
                 "timestamp": latest_gif_info["timestamp"]
             })
         
@@ -322,41 +653,34 @@ async def websocket_gif_updates(request):
                 print(f"WebSocket错误: {ws.exception()}")
     finally:
         # 移除WebSocket连接
-        if ws in PromptServer.instance.lifegame_ws_clients:
-            PromptServer.instance.lifegame_ws_clients.remove(ws)
-        print(f"WebSocket连接关闭，当前客户端数: {len(PromptServer.instance.lifegame_ws_clients)}")
+        await ws_manager.unregister(ws)
+        print(f"WebSocket连接关闭，当前客户端数: {len(ws_manager.clients)}")
     
     return ws
 
+@routes.get("/api/extensions/comfyui-lifegame/lifegame/ws_status")
+@routes.get("/api/lifegame/ws_status")
+async def get_ws_status(request):
+    """获取WebSocket连接数和消息丢弃统计"""
+    return web.json_response({
+        "status": "success",
+        "data": ws_manager.status()
+    })
+
 # 广播GIF更新到所有WebSocket连接
 async def broadcast_gif_update(path):
-    if not hasattr(PromptServer.instance, 'lifegame_ws_clients'):
-        return
-    
-    clients = PromptServer.instance.lifegame_ws_clients
-    if not clients:
-        return
-    
-    message = {
+    ws_manager.publish({
         "type": "gif_update",
         "path": path,
         "timestamp": int(time.time() * 1000)
-    }
-    
-    for ws in clients[:]:  # 使用副本迭代，因为可能会在迭代过程中移除元素
-        try:
-            if not ws.closed:
-                await ws.send_json(message)
-        except Exception as e:
-            print(f"发送WebSocket消息失败: {e}")
-            if ws in clients:
-                clients.remove(ws)
+    })
 
-def update_latest_gif(path):
+def update_latest_gif(path, full=None):
     """更新最新GIF信息并通知所有客户端
     
     Args:
-        path: GIF文件路径
+        path: 预览使用的GIF文件路径（通常为预览代理）
+        full: 原始GIF文件路径，默认与path相同
     """
     global latest_gif_info
     
@@ -364,31 +688,32 @@ def update_latest_gif(path):
         filename = os.path.basename(path)
         latest_gif_info = {
             "path": filename,
+            "full": os.path.basename(full) if full else filename,
             "timestamp": int(time.time() * 1000)
         }
         print(f"更新了最新GIF信息: {latest_gif_info}")
         
-        # 创建异步任务广播更新
-        async def notify():
-            await broadcast_gif_update(filename)
-        
-        # 使用PromptServer的事件循环来执行异步任务
-        if hasattr(PromptServer.instance, 'loop'):
-            PromptServer.instance.loop.create_task(notify())
+        # 节点和预览代理在工作线程中执行，需线程安全地交给服务器事件循环广播
+        ws_manager.publish_threadsafe({
+            "type": "gif_update",
+            "path": filename,
+            "full": latest_gif_info["full"],
+            "timestamp": latest_gif_info["timestamp"]
+        })
 
-# 为了向后兼容，保留register_routes函数
 def register_routes(app):
-    """
-    注册API路由 - 此函数保留用于向后兼容，
-    实际路由现在通过装饰器自动注册
+    """注册API路由
     
     Args:
-        app: aiohttp应用实例
+        app: aiohttp应用实例，或PromptServer.instance.routes之类的RouteTableDef
     """
-    # 路由已通过装饰器注册，此函数仅为保持向后兼容性
-    pass 
+    if isinstance(app, web.Application):
+        app.router.add_routes(routes)
+        return
+    for route in routes:
+        app.route(route.method, route.path, **route.kwargs)(route.handler)
 
-@PromptServer.instance.routes.post("/api/extensions/comfyui-lifegame/animation/open_file_explorer")
+@routes.post("/api/extensions/comfyui-lifegame/animation/open_file_explorer")
 async def open_file_explorer(request):
     """在系统资源管理器中打开文件所在文件夹
     
@@ -0,0 +1,307 @@
+"""
+生命游戏无界面批量渲染命令行工具
+
+不依赖ComfyUI，直接把预设、RLE文件或随机种子渲染为GIF、APNG(png)或NPZ文件。
+任务文件可以包含大量渲染任务，由进程池并行执行。
+
+命令行用法::
+
+    lifegame-render jobs.json --workers 8 --output-dir renders
+    lifegame-render --preset gosper_glider_gun --frames 200 --format gif --output gun.gif
+    python -m server.cli --rle pattern.rle --frames 100 --format npz
+
+任务文件为JSON，可以是任务列表，也可以是 {"defaults": {...}, "jobs": [...]}，
+每个任务的字段与DEFAULTS相同，未指定的字段使用defaults和DEFAULTS中的值。
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .engines import available_engines
+from .lifegame_logic import LifeGame
+from .render import make_age_trail_luts, render_cells
+from .rle import load_rle, parse_rle
+
+# 输出格式对应的文件扩展名
+FORMATS = {"gif": "gif", "png": "png", "npz": "npz"}
+
+# 任务字段的默认值
+DEFAULTS = {
+    "output": None,
+    "format": "gif",
+    "width": 100,
+    "height": 100,
+    "cell_size": 5,
+    "frames": 30,
+    "fps": 10,
+    # preset、random或rle
+    "mode": "preset",
+    "preset": "glider",
+    "density": 0.3,
+    "seed": 0,
+    # RLE文件路径，或rle_text给出RLE文本
+    "rle": None,
+    "rle_text": None,
+    "x_offset": None,
+    "y_offset": None,
+    "universe": "toroidal",
+    # 步进引擎，默认使用确定的numpy引擎；auto会在每个工作进程中做基准测试并写入自动调优缓存
+    "engine": "padded",
+    "alive_color": "#FFFFFF",
+    "dead_color": "#000000",
+    "render_mode": "cells",
+    "old_color": "#FF4000",
+    "trail_color": "#4040A0",
+    "age_span": 64,
+    "trail_decay": 32,
+}
+
+
+def _hex_to_rgb(hex_color):
+    hex_color = hex_color.lstrip('#')
+    return tuple(int(hex_color[i:i + 2], 16) for i in (0, 2, 4))
+
+
+def build_game(job):
+    """按任务参数创建并初始化生命游戏实例
+
+    Args:
+        job (dict): 完整的任务参数
+
+    Returns:
+        LifeGame: 已初始化的实例
+    """
+    lifegame = LifeGame(width=job["width"], height=job["height"], cell_size=job["cell_size"],
+                        stats_capacity=job["frames"] + 1, unbounded=(job["universe"] == "unbounded"),
+                        engine=job["engine"], track_age=(job["render_mode"] != "cells"), trail_decay=job["trail_decay"])
+    if job["mode"] == "random":
+        lifegame.random_init(density=job["density"], seed=job["seed"])
+    elif job["mode"] == "rle":
+        pattern = parse_rle(job["rle_text"]) if job["rle_text"] else load_rle(job["rle"])
+        lifegame.load_pattern(pattern["cells"], job["x_offset"], job["y_offset"])
+    elif not lifegame.load_preset(job["preset"], job["x_offset"], job["y_offset"]):
+        raise ValueError(f"Unknown preset: {job['preset']}")
+    return lifegame
+
+
+def _palette_frame(lifegame, job, luts):
+    """把当前状态转换为调色板索引帧（GIF/APNG最多256色）
+
+    cells模式只有两种颜色；年龄/尾迹模式在颜色表超过256项时对尾迹强度和年龄渐变重新采样。
+
+    Returns:
+        np.ndarray: 已按cell_size放大的uint8索引帧
+    """
+    grid = lifegame.get_grid()
+    if luts is None:
+        indices = grid
+    elif lifegame.universe is not None:
+        # 无边界模式不维护年龄，活细胞使用年龄渐变的第一种颜色
+        indices = grid * np.uint8(luts[3])
+    else:
+        age_lut, trail_lut, age_n, trail_n = luts
+        with lifegame.lock:
+            age, trail = lifegame.age, lifegame.trail
+            trail_index = (trail.astype(np.uint16) * (trail_n - 1) // 255).astype(np.uint8)
+            age_index = np.minimum(age, len(age_lut) - 1).astype(np.uint32) * (age_n - 1) // max(1, len(age_lut) - 1)
+            indices = np.where(grid == 1, trail_n + age_index, trail_index).astype(np.uint8)
+    return render_cells(indices, job["cell_size"], np.arange(256, dtype=np.uint8))
+
+
+def _make_palette(job):
+    """生成输出调色板，返回 (palette, luts)，cells模式下luts为None"""
+    alive_rgb, dead_rgb = _hex_to_rgb(job["alive_color"]), _hex_to_rgb(job["dead_color"])
+    if job["render_mode"] == "cells":
+        return np.array([dead_rgb, alive_rgb], dtype=np.uint8), None
+    age_lut, trail_lut = make_age_trail_luts(job["render_mode"], alive_rgb, dead_rgb, _hex_to_rgb(job["old_color"]),
+                                             _hex_to_rgb(job["trail_color"]), job["age_span"])
+    age_n = min(len(age_lut), 128)
+    trail_n = min(len(trail_lut), 256 - age_n)
+    trail_part = trail_lut[np.arange(trail_n) * (len(trail_lut) - 1) // max(1, trail_n - 1)]
+    age_part = age_lut[np.arange(age_n) * (len(age_lut) - 1) // max(1, age_n - 1)]
+    return np.concatenate([trail_part, age_part]), (age_lut, trail_lut, age_n, trail_n)
+
+
+def render_job(job):
+    """执行一个渲染任务
+
+    Args:
+        job (dict): 完整的任务参数
+
+    Returns:
+        dict: 输出路径、帧数、耗时以及最终代数和种群数量
+    """
+    from .stream_writer import ApngStreamWriter, GifStreamWriter
+
+    start = time.perf_counter()
+    lifegame = build_game(job)
+    path = job["output"]
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    frames = job["frames"]
+
+    if job["format"] == "npz":
+        # 保存完整颜色的RGB帧、最终网格和种群统计
+        style = {
+            "alive_rgb": _hex_to_rgb(job["alive_color"]),
+            "dead_rgb": _hex_to_rgb(job["dead_color"]),
+            "mode": job["render_mode"],
+            "old_rgb": _hex_to_rgb(job["old_color"]),
+            "trail_rgb": _hex_to_rgb(job["trail_color"]),
+            "age_span": job["age_span"],
+        }
+        first = lifegame.render(**style)
+        video = np.empty((frames,) + first.shape, dtype=np.uint8)
+        video[0] = first
+        for i in range(1, frames):
+            lifegame.update()
+            video[i] = lifegame.render(**style)
+        lifegame.update()
+        np.savez_compressed(path, frames=video, grid=lifegame.get_grid(),
+                            stats=np.array(json.dumps(lifegame.get_stats())))
+    else:
+        palette, luts = _make_palette(job)
+        img_width, img_height = job["width"] * job["cell_size"], job["height"] * job["cell_size"]
+        if job["format"] == "gif":
+            writer = GifStreamWriter(path, img_width, img_height, palette, fps=job["fps"])
+        else:
+            writer = ApngStreamWriter(path, img_width, img_height, palette, fps=job["fps"], frame_count=frames)
+        with writer:
+            for _ in range(frames):
+                writer.write(_palette_frame(lifegame, job, luts))
+                lifegame.update()
+
+    return {
+        "output": path,
+        "frames": frames,
+        "seconds": round(time.perf_counter() - start, 3),
+        "generation": lifegame.generation,
+        "population": lifegame.population,
+    }
+
+
+def load_jobs(path, output_dir="."):
+    """读取任务文件并补全每个任务的参数
+
+    Args:
+        path (str): JSON任务文件路径
+        output_dir (str): 相对输出路径的基准目录
+
+    Returns:
+        list: 完整的任务参数列表
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, list):
+        defaults, jobs = {}, data
+    else:
+        defaults, jobs = data.get("defaults", {}), data.get("jobs", [])
+    # RLE文件路径相对于任务文件所在目录
+    base_dir = os.path.dirname(os.path.abspath(path))
+    result = []
+    for index, entry in enumerate(jobs):
+        job = prepare_job({**defaults, **entry}, index, output_dir)
+        if job["rle"] and not os.path.isabs(job["rle"]):
+            job["rle"] = os.path.join(base_dir, job["rle"])
+        result.append(job)
+    return result
+
+
+def prepare_job(params, index=0, output_dir="."):
+    """用默认值补全任务参数并检查取值
+
+    Args:
+        params (dict): 任务参数
+        index (int): 任务序号，用于生成默认文件名
+        output_dir (str): 相对输出路径的基准目录
+
+    Returns:
+        dict: 完整的任务参数
+
+    Raises:
+        ValueError: 参数无效时抛出
+    """
+    unknown = set(params) - set(DEFAULTS)
+    if unknown:
+        raise ValueError(f"Unknown job fields: {', '.join(sorted(unknown))}")
+    job = {**DEFAULTS, **params}
+    if job["format"] not in FORMATS:
+        raise ValueError(f"Unknown format: {job['format']}")
+    if job["mode"] not in ("preset", "random", "rle"):
+        raise ValueError(f"Unknown mode: {job['mode']}")
+    if job["engine"] != "auto" and job["engine"] not in available_engines():
+        raise ValueError(f"Unknown or unavailable engine: {job['engine']}")
+    if job["mode"] == "rle" and not (job["rle"] or job["rle_text"]):
+        raise ValueError("rle mode requires rle or rle_text")
+    if job["output"] is None:
+        job["output"] = f"lifegame_{index:05d}.{FORMATS[job['format']]}"
+    if not os.path.isabs(job["output"]):
+        job["output"] = os.path.join(output_dir, job["output"])
+    return job
+
+
+def run_jobs(jobs, workers=None):
+    """用进程池执行渲染任务
+
+    Args:
+        jobs (list): 完整的任务参数列表
+        workers (int): 进程数，None表示使用CPU核心数，1表示在当前进程中依次执行
+
+    Yields:
+        dict: 每个任务的结果（按任务顺序）
+    """
+    if workers == 1 or len(jobs) <= 1:
+        for job in jobs:
+            yield render_job(job)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(render_job, jobs)
+
+
+def main(argv=None):
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="生命游戏无界面批量渲染")
+    parser.add_argument("jobs", nargs="?", help="JSON任务文件，省略时按命令行参数渲染单个任务")
+    parser.add_argument("--workers", type=int, default=None, help="进程数，默认CPU核心数")
+    parser.add_argument("--output-dir", default=".", help="相对输出路径的基准目录")
+    parser.add_argument("--output", help="单任务的输出文件")
+    parser.add_argument("--format", choices=sorted(FORMATS), help="输出格式")
+    parser.add_argument("--preset", help="预设图案名称")
+    parser.add_argument("--rle", help="RLE图案文件")
+    parser.add_argument("--seed", type=int, help="随机种子（使用random模式）")
+    parser.add_argument("--density", type=float, help="随机模式的活细胞密度")
+    for name in ("width", "height", "cell_size", "frames", "fps"):
+        parser.add_argument(f"--{name.replace('_', '-')}", dest=name, type=int, help=f"{name}（默认{DEFAULTS[name]}）")
+    parser.add_argument("--render-mode", dest="render_mode", help="渲染模式（cells、age、trail、age_trail）")
+    parser.add_argument("--engine", help=f"步进引擎（{'、'.join(available_engines())}或auto，默认{DEFAULTS['engine']}），同时覆盖任务文件中的设置")
+    args = parser.parse_args(argv)
+
+    if args.jobs:
+        jobs = load_jobs(args.jobs, args.output_dir)
+        if args.engine:
+            jobs = [prepare_job({**job, "engine": args.engine}) for job in jobs]
+    else:
+        params = {key: value for key, value in vars(args).items()
+                  if key in DEFAULTS and value is not None}
+        if args.rle:
+            params["mode"] = "rle"
+        elif args.seed is not None:
+            params["mode"] = "random"
+        jobs = [prepare_job(params, 0, args.output_dir)]
+
+    start = time.perf_counter()
+    total_frames = 0
+    for result in run_jobs(jobs, args.workers):
+        total_frames += result["frames"]
+        print(f"{result['output']}: {result['frames']}帧，{result['seconds']}秒，"
+              f"第{result['generation']}代，种群{result['population']}")
+    elapsed = time.perf_counter() - start
+    print(f"完成 {len(jobs)} 个任务，共 {total_frames} 帧，用时 {elapsed:.2f} 秒")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
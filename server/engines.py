@@ -0,0 +1,297 @@
+"""
+生命游戏步进引擎模块
+
+引擎接口为 load(grid) / step(n) / export()，通过注册表按名称创建。
+auto模式对每种网格尺寸做一次微基准测试，选出最快的引擎并缓存到磁盘。
+基准测试在后台线程中运行，完成前使用参考引擎，不阻塞模拟和API请求。
+"""
+import abc
+import importlib.util
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from .paths import cache_dir
+
+# 自动调优结果缓存文件
+AUTOTUNE_PATH = os.path.join(cache_dir(), "engine_autotune.json")
+
+# 引擎名称 -> 引擎类
+ENGINES = {}
+
+
+def register_engine(cls):
+    """注册引擎类的装饰器"""
+    ENGINES[cls.name] = cls
+    return cls
+
+
+class Engine(abc.ABC):
+    """步进引擎基类，网格为取值0/1的二维uint8数组（环形边界）"""
+
+    name = None
+
+    @classmethod
+    def available(cls):
+        """当前环境是否可以使用该引擎"""
+        return True
+
+    @abc.abstractmethod
+    def load(self, grid):
+        """载入网格
+
+        Args:
+            grid (np.ndarray): 细胞网格
+        """
+
+    @abc.abstractmethod
+    def step(self, n=1):
+        """步进n代
+
+        Args:
+            n (int): 代数
+        """
+
+    @abc.abstractmethod
+    def export(self):
+        """导出当前网格
+
+        Returns:
+            np.ndarray: uint8细胞网格
+        """
+
+
+@register_engine
+class RollEngine(Engine):
+    """参考引擎：用np.roll累加8个方向的邻居"""
+
+    name = "roll"
+
+    def load(self, grid):
+        self.grid = grid
+
+    def step(self, n=1):
+        grid = self.grid
+        for _ in range(n):
+            # 计算每个细胞的邻居数量
+            neighbors = np.zeros_like(grid)
+            for i in range(-1, 2):
+                for j in range(-1, 2):
+                    if i == 0 and j == 0:
+                        continue
+                    neighbors += np.roll(np.roll(grid, i, axis=0), j, axis=1)
+
+            # 应用生命游戏规则
+            new_grid = np.zeros_like(grid)
+            # 1. 活细胞周围有2-3个活细胞，继续存活
+            new_grid[np.logical_and(grid == 1, np.logical_or(neighbors == 2, neighbors == 3))] = 1
+            # 2. 死细胞周围有3个活细胞，变为活细胞
+            new_grid[np.logical_and(grid == 0, neighbors == 3)] = 1
+            grid = new_grid
+        self.grid = grid
+
+    def export(self):
+        return self.grid
+
+
+@register_engine
+class PaddedSliceEngine(Engine):
+    """环形填充一次后用8个切片视图求和，避免np.roll的多次整表复制"""
+
+    name = "padded"
+
+    def load(self, grid):
+        self.grid = grid
+
+    def step(self, n=1):
+        grid = self.grid
+        for _ in range(n):
+            p = np.pad(grid, 1, mode="wrap")
+            neighbors = (p[:-2, :-2] + p[:-2, 1:-1] + p[:-2, 2:] +
+                         p[1:-1, :-2] + p[1:-1, 2:] +
+                         p[2:, :-2] + p[2:, 1:-1] + p[2:, 2:])
+            grid = np.logical_or(neighbors == 3, np.logical_and(grid == 1, neighbors == 2)).astype(np.uint8)
+        self.grid = grid
+
+    def export(self):
+        return self.grid
+
+
+@register_engine
+class TorchEngine(Engine):
+    """torch conv2d引擎（需要安装torch）"""
+
+    name = "torch"
+
+    @classmethod
+    def available(cls):
+        return importlib.util.find_spec("torch") is not None
+
+    def load(self, grid):
+        import torch
+        self.grids = torch.from_numpy(grid.astype(np.float32)).view(1, 1, *grid.shape)
+
+    def step(self, n=1):
+        from . import torch_backend
+        torch_backend.ensure_verified()
+        self.grids = torch_backend.step(self.grids, n)
+
+    def export(self):
+        import torch
+        return self.grids[0, 0].to(torch.uint8).numpy()
+
+
+def available_engines():
+    """获取当前环境可用的引擎名称列表"""
+    return [name for name, cls in ENGINES.items() if cls.available()]
+
+
+def create_engine(name):
+    """按名称创建引擎
+
+    Args:
+        name (str): 引擎名称
+
+    Returns:
+        Engine: 引擎实例
+    """
+    cls = ENGINES.get(name)
+    if cls is None:
+        raise ValueError(f"Unknown engine: {name}")
+    if not cls.available():
+        raise ValueError(f"Engine not available: {name}")
+    return cls()
+
+
+class AutoTuner:
+    """按网格尺寸微基准测试各引擎并缓存最快者"""
+
+    def __init__(self, path=AUTOTUNE_PATH, steps=4, density=0.3):
+        """初始化自动调优器
+
+        Args:
+            path (str): 磁盘缓存文件路径
+            steps (int): 每个引擎计时的步数
+            density (float): 测试网格的活细胞密度
+        """
+        self.path = path
+        self.steps = steps
+        self.density = density
+        self.lock = threading.Lock()
+        self._results = None
+        # 尺寸键 -> 进行中的基准测试
+        self._pending = {}
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="lifegame-autotune")
+
+    def _load(self):
+        if self._results is None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._results = json.load(f)
+            except (OSError, ValueError):
+                self._results = {}
+        return self._results
+
+    def _save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._results, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"保存引擎调优结果失败: {e}")
+
+    def benchmark(self, shape):
+        """对所有可用引擎计时
+
+        Args:
+            shape (tuple): 网格尺寸 (height, width)
+
+        Returns:
+            dict: 引擎名称 -> 每步耗时（秒）
+        """
+        grid = (np.random.default_rng(0).random(shape) < self.density).astype(np.uint8)
+        timings = {}
+        for name in available_engines():
+            try:
+                engine = create_engine(name)
+                # 预热一步（包括torch后端的自检）
+                engine.load(grid)
+                engine.step(1)
+                engine.export()
+                start = time.perf_counter()
+                engine.load(grid)
+                engine.step(self.steps)
+                engine.export()
+                timings[name] = (time.perf_counter() - start) / self.steps
+            except Exception as e:
+                print(f"引擎{name}基准测试失败: {e}")
+        return timings
+
+    @staticmethod
+    def _key(shape):
+        return f"{shape[0]}x{shape[1]}"
+
+    def cached(self, shape):
+        """获取已缓存的最快引擎，不进行基准测试
+
+        Args:
+            shape (tuple): 网格尺寸 (height, width)
+
+        Returns:
+            str: 引擎名称，尚未调优时返回None
+        """
+        with self.lock:
+            entry = self._load().get(self._key(shape))
+        if entry and entry.get("engine") in available_engines():
+            return entry["engine"]
+        return None
+
+    def submit(self, shape):
+        """在后台线程中对该网格尺寸进行基准测试（同一尺寸只测试一次）
+
+        Args:
+            shape (tuple): 网格尺寸 (height, width)
+
+        Returns:
+            Future: 结果为最快的引擎名称
+        """
+        key = self._key(shape)
+        with self.lock:
+            future = self._pending.get(key)
+            if future is None:
+                future = self._executor.submit(self._tune, tuple(shape), key)
+                self._pending[key] = future
+            return future
+
+    def pending(self):
+        """获取正在进行基准测试的尺寸键列表"""
+        with self.lock:
+            return sorted(key for key, future in self._pending.items() if not future.done())
+
+    def _tune(self, shape, key):
+        try:
+            # 基准测试不持有锁
+            timings = self.benchmark(shape)
+            best = min(timings, key=timings.get) if timings else RollEngine.name
+            with self.lock:
+                self._load()[key] = {"engine": best, "timings": timings}
+                self._save()
+            return best
+        finally:
+            with self.lock:
+                self._pending.pop(key, None)
+
+    def results(self):
+        """获取已缓存的调优结果"""
+        with self.lock:
+            return dict(self._load())
+
+
+# 全局自动调优器
+autotuner = AutoTuner()
@@ -0,0 +1,171 @@
+"""
+生命游戏时间回溯历史模块
+
+按固定间隔保存完整关键帧，关键帧之间保存相邻两代的XOR差分，
+两者都经过位打包和zlib压缩。跳转到任意保留的代数最多需要解码一个关键帧
+并应用不超过 keyframe_interval - 1 个差分。总字节数超过预算时从最旧的
+关键帧段开始淘汰。
+"""
+import zlib
+import numpy as np
+
+
+def _encode(grid):
+    """位打包并压缩网格"""
+    return zlib.compress(np.packbits(grid, axis=None).tobytes(), 1)
+
+
+def _decode(data, shape):
+    """解压并还原网格"""
+    bits = np.unpackbits(np.frombuffer(zlib.decompress(data), dtype=np.uint8), count=shape[0] * shape[1])
+    return bits.reshape(shape)
+
+
+class _Segment:
+    """一个关键帧及其后续差分"""
+
+    __slots__ = ("start", "keyframe", "deltas", "nbytes")
+
+    def __init__(self, start, keyframe):
+        self.start = start
+        self.keyframe = keyframe
+        self.deltas = []
+        self.nbytes = len(keyframe)
+
+    @property
+    def end(self):
+        """该段包含的最后一代"""
+        return self.start + len(self.deltas)
+
+
+class HistoryStore:
+    """内存受限的关键帧+XOR差分历史存储"""
+
+    def __init__(self, byte_budget=16 * 1024 * 1024, keyframe_interval=32):
+        """初始化历史存储
+
+        Args:
+            byte_budget (int): 历史数据占用的最大字节数
+            keyframe_interval (int): 关键帧间隔（代）
+        """
+        self.byte_budget = int(byte_budget)
+        self.keyframe_interval = max(1, int(keyframe_interval))
+        self.segments = []
+        self.nbytes = 0
+        self.shape = None
+        # 最近记录的一代，用于计算下一代的差分
+        self._last_grid = None
+        self._last_generation = None
+
+    def reset(self):
+        """清空历史"""
+        self.segments = []
+        self.nbytes = 0
+        self.shape = None
+        self._last_grid = None
+        self._last_generation = None
+
+    @property
+    def oldest_generation(self):
+        return self.segments[0].start if self.segments else None
+
+    @property
+    def latest_generation(self):
+        return self.segments[-1].end if self.segments else None
+
+    def record(self, grid, generation):
+        """记录一代网格
+
+        已保留的同代或更新代的数据会先被截断，因此跳转后继续运行或编辑当前代
+        都会覆盖原来的"未来"。
+
+        Args:
+            grid (np.ndarray): 细胞网格
+            generation (int): 代数
+        """
+        if self.shape != grid.shape:
+            self.reset()
+            self.shape = grid.shape
+        self.truncate(generation - 1)
+
+        if self.segments and self.latest_generation == generation - 1:
+            if self._last_generation != generation - 1:
+                self._last_grid = self.get(generation - 1)
+            segment = self.segments[-1]
+            if len(segment.deltas) < self.keyframe_interval - 1:
+                delta = _encode(np.bitwise_xor(grid, self._last_grid))
+                segment.deltas.append(delta)
+                segment.nbytes += len(delta)
+                self.nbytes += len(delta)
+            else:
+                self._append_keyframe(grid, generation)
+        else:
+            self._append_keyframe(grid, generation)
+
+        self._last_grid = grid.copy()
+        self._last_generation = generation
+        self._evict()
+
+    def _append_keyframe(self, grid, generation):
+        segment = _Segment(generation, _encode(grid))
+        self.segments.append(segment)
+        self.nbytes += segment.nbytes
+
+    def _evict(self):
+        """超出预算时从最旧的段开始淘汰（至少保留最新的一段）"""
+        while self.nbytes > self.byte_budget and len(self.segments) > 1:
+            segment = self.segments.pop(0)
+            self.nbytes -= segment.nbytes
+
+    def truncate(self, generation):
+        """丢弃比指定代数更新的历史
+
+        Args:
+            generation (int): 保留的最后一代
+        """
+        while self.segments and self.segments[-1].start > generation:
+            self.nbytes -= self.segments.pop().nbytes
+        if self.segments and self.segments[-1].end > generation:
+            segment = self.segments[-1]
+            keep = generation - segment.start
+            for delta in segment.deltas[keep:]:
+                segment.nbytes -= len(delta)
+                self.nbytes -= len(delta)
+            del segment.deltas[keep:]
+        if self._last_generation is not None and self._last_generation > generation:
+            self._last_grid = None
+            self._last_generation = None
+
+    def get(self, generation):
+        """还原指定代数的网格
+
+        Args:
+            generation (int): 代数
+
+        Returns:
+            np.ndarray: 网格，该代不在保留范围内时返回None
+        """
+        if generation == self._last_generation and self._last_grid is not None:
+            return self._last_grid.copy()
+        for segment in reversed(self.segments):
+            if segment.start <= generation <= segment.end:
+                grid = _decode(segment.keyframe, self.shape)
+                for delta in segment.deltas[:generation - segment.start]:
+                    np.bitwise_xor(grid, _decode(delta, self.shape), out=grid)
+                return grid
+        return None
+
+    def info(self):
+        """获取历史存储信息
+
+        Returns:
+            dict: 保留范围、占用字节数等信息
+        """
+        return {
+            "oldest_generation": self.oldest_generation,
+            "latest_generation": self.latest_generation,
+            "keyframes": len(self.segments),
+            "bytes": self.nbytes,
+            "byte_budget": self.byte_budget,
+            "keyframe_interval": self.keyframe_interval,
+        }
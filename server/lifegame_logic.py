@@ -1,10 +1,21 @@
 """
 生命游戏核心逻辑模块
+
+本模块只依赖numpy，可在没有ComfyUI、aiohttp、PIL和torch的环境中独立使用。
 """
 import numpy as np
 import threading
 import time
-from PIL import Image
+from .profiler import profile_manager
+from .stats import PopulationHistory, bounding_box
+from .sparse_universe import SparseUniverse
+from .history import HistoryStore
+from .engines import RollEngine, autotuner, available_engines, create_engine
+from .render import (CellFramebuffer, make_age_trail_luts, make_palette, pool_window, render_age_trail,
+                     render_cells, render_density, zoom_level)
+
+# 细胞年龄的饱和上限（uint16）
+MAX_AGE = np.iinfo(np.uint16).max
 
 class LifeGame:
     """生命游戏核心逻辑类"""
@@ -128,13 +139,21 @@ class LifeGame:
         ]
     }
     
-    def __init__(self, width=100, height=100, cell_size=5):
+    def __init__(self, width=100, height=100, cell_size=5, stats_capacity=1024, unbounded=False, chunk_size=64,
+                 history_bytes=0, engine="roll", track_age=False, trail_decay=32):
         """初始化生命游戏
 
         Args:
-            width (int): 网格宽度
-            height (int): 网格高度
+            width (int): 网格宽度（无边界模式下为默认视口宽度）
+            height (int): 网格高度（无边界模式下为默认视口高度）
             cell_size (int): 细胞大小（像素）
+            stats_capacity (int): 种群统计环形缓冲区保留的代数
+            unbounded (bool): 是否使用无边界稀疏宇宙代替环形网格
+            chunk_size (int): 无边界模式下的区块边长
+            history_bytes (int): 时间回溯历史的字节预算，0表示不记录历史（仅环形模式可用）
+            engine (str): 环形模式的步进引擎名称，auto表示按网格尺寸自动选择最快的引擎
+            track_age (bool): 是否维护细胞年龄和尾迹缓冲区（仅环形模式可用）
+            trail_decay (int): 死细胞尾迹强度每代衰减的量（尾迹强度范围0-255）
         """
         self.width = width
         self.height = height
@@ -145,22 +164,64 @@ class LifeGame:
         self.update_interval = 0.1  # 更新间隔（秒）
         self.generation = 0
         self.lock = threading.Lock()
+        self.version = 0
+        # 步进引擎在首次update时创建
+        self.engine_name = engine
+        self.engine = None
+        # auto模式下进行中的后台基准测试
+        self._tuning = None
+        # 无边界模式下活细胞保存在稀疏宇宙中，grid不再使用
+        self.universe = SparseUniverse(chunk_size) if unbounded else None
+        # 由update()顺带维护的种群统计
+        self.population = 0
+        self.births = 0
+        self.deaths = 0
+        self.bbox = (-1, -1, -1, -1)
+        self.stats_history = PopulationHistory(stats_capacity)
+        self._reset_stats()
+        # 关键帧+XOR差分的时间回溯历史
+        self.history = HistoryStore(history_bytes) if history_bytes else None
+        self._reset_history()
+        # get_image的常驻渲染缓冲区，只重绘变化的细胞
+        self._framebuffer = CellFramebuffer()
+        # 细胞年龄（连续存活的代数，饱和于MAX_AGE）和尾迹强度（活细胞为255，死亡后逐代衰减）
+        self.trail_decay = int(trail_decay)
+        self.age = None
+        self.trail = None
+        if track_age:
+            self._reset_age(force=True)
+        # 每代发布网格的共享内存缓冲区（见shared_buffers），None表示不发布
+        self.shared_buffer = None
     
-    def random_init(self, density=0.3):
+    def random_init(self, density=0.3, seed=None):
         """随机初始化网格
         
         Args:
             density (float): 活细胞密度，范围0-1
+            seed (int, optional): 随机种子，相同种子得到相同的初始网格
         """
+        rng = np.random.default_rng(seed)
         with self.lock:
-            self.grid = np.random.choice([0, 1], size=(self.height, self.width), p=[1-density, density]).astype(np.uint8)
+            self.grid = (rng.random((self.height, self.width)) < density).astype(np.uint8)
+            if self.universe is not None:
+                # 无边界模式下随机填充默认视口区域
+                self.universe.clear()
+                self.universe.load_array(self.grid)
             self.generation = 0
+            self._reset_stats()
+            self._reset_history()
+            self._reset_age()
     
     def clear(self):
         """清空网格"""
         with self.lock:
             self.grid = np.zeros((self.height, self.width), dtype=np.uint8)
+            if self.universe is not None:
+                self.universe.clear()
             self.generation = 0
+            self._reset_stats()
+            self._reset_history()
+            self._reset_age()
     
     def load_preset(self, preset_name, x_offset=None, y_offset=None):
         """加载预设图案
@@ -176,8 +237,17 @@ class LifeGame:
         if preset_name not in self.PRESETS:
             return False
         
-        pattern = self.PRESETS[preset_name]
+        self.load_pattern(self.PRESETS[preset_name], x_offset, y_offset)
+        return True
+    
+    def load_pattern(self, pattern, x_offset=None, y_offset=None):
+        """加载由活细胞坐标列表描述的图案（例如从RLE文件解析得到）
         
+        Args:
+            pattern (list): (x, y) 坐标列表
+            x_offset (int, optional): X偏移，如果为None则居中
+            y_offset (int, optional): Y偏移，如果为None则居中
+        """
         # 计算图案尺寸
         max_x = max([p[0] for p in pattern]) if pattern else 0
         max_y = max([p[1] for p in pattern]) if pattern else 0
@@ -203,9 +273,14 @@ class LifeGame:
                 if 0 <= new_x < self.width and 0 <= new_y < self.height:
                     self.grid[new_y, new_x] = 1
             
+            if self.universe is not None:
+                self.universe.clear()
+                self.universe.load_array(self.grid)
+            
             self.generation = 0
-        
-        return True
+            self._reset_stats()
+            self._reset_history()
+            self._reset_age()
     
     def get_presets(self):
         """获取所有可用的预设名称
@@ -218,23 +293,337 @@ class LifeGame:
     def update(self):
         """更新一步游戏状态"""
         with self.lock:
-            # 计算每个细胞的邻居数量
-            neighbors = np.zeros_like(self.grid)
-            for i in range(-1, 2):
-                for j in range(-1, 2):
-                    if i == 0 and j == 0:
-                        continue
-                    neighbors += np.roll(np.roll(self.grid, i, axis=0), j, axis=1)
+            if self.universe is not None:
+                # 无边界模式：只计算活区块
+                self.births, self.deaths = self.universe.step()
+                self.population += self.births - self.deaths
+                self.bbox = self.universe.bounding_box()
+                self.generation += 1
+                self._record_stats()
+                self._publish_shared()
+                return
             
-            # 应用生命游戏规则
-            new_grid = np.zeros_like(self.grid)
-            # 1. 活细胞周围有2-3个活细胞，继续存活
-            new_grid[np.logical_and(self.grid == 1, np.logical_or(neighbors == 2, neighbors == 3))] = 1
-            # 2. 死细胞周围有3个活细胞，变为活细胞
-            new_grid[np.logical_and(self.grid == 0, neighbors == 3)] = 1
+            # 由当前引擎计算下一代
+            engine = self._get_engine()
+            old_grid = self.grid
+            rows, cols = self._change_window()
+            engine.load(old_grid)
+            engine.step(1)
+            new_grid = engine.export()
             
             self.grid = new_grid
             self.generation += 1
+            self._record_history()
+            self._update_age(new_grid)
+            self._publish_shared()
+            
+            # 种群统计只在可能变化的窗口内计算（网格取值0/1，新>旧即出生，旧>新即死亡）
+            old_window, new_window = old_grid[rows, cols], new_grid[rows, cols]
+            self.births = int(np.count_nonzero(new_window > old_window))
+            self.deaths = int(np.count_nonzero(old_window > new_window))
+            self.population += self.births - self.deaths
+            min_x, min_y, max_x, max_y = bounding_box(new_window)
+            if min_x < 0:
+                self.bbox = (-1, -1, -1, -1)
+            else:
+                x0, y0 = cols.start or 0, rows.start or 0
+                self.bbox = (min_x + x0, min_y + y0, max_x + x0, max_y + y0)
+            self._record_stats()
+    
+    def _change_window(self):
+        """下一代可能变化的细胞所在的窗口（调用方需持有锁）
+
+        包围盒外两格以上的细胞没有活邻居，不会变化，所以变化都在包围盒外扩一格的范围内；
+        包围盒贴边时环形边界会绕回，使用整个网格。
+
+        Returns:
+            tuple: (行切片, 列切片)
+        """
+        min_x, min_y, max_x, max_y = self.bbox
+        if min_x < 0:
+            return slice(0, 0), slice(0, 0)
+        if min_x < 1 or min_y < 1 or max_x > self.width - 2 or max_y > self.height - 2:
+            return slice(None), slice(None)
+        return slice(min_y - 1, max_y + 2), slice(min_x - 1, max_x + 2)
+    
+    def _get_engine(self):
+        """获取当前步进引擎（调用方需持有锁）
+
+        auto模式下该网格尺寸尚未调优时在后台开始基准测试，期间使用参考引擎，测试完成后切换到最快的引擎。
+        各引擎结果逐位一致，切换不影响模拟结果。
+        """
+        if self._tuning is not None and self._tuning.done():
+            self._tuning = None
+            self.engine = None
+        if self.engine is None:
+            name = self.engine_name
+            if name == "auto":
+                name = autotuner.cached((self.height, self.width))
+                if name is None:
+                    self._tuning = autotuner.submit((self.height, self.width))
+                    name = RollEngine.name
+            self.engine = create_engine(name)
+        return self.engine
+    
+    def set_engine(self, name):
+        """设置步进引擎
+
+        Args:
+            name (str): 引擎名称，或auto表示按网格尺寸自动选择
+
+        Returns:
+            str: 实际使用的引擎名称
+        """
+        if name != "auto":
+            # 名称无效时抛出ValueError
+            create_engine(name)
+        with self.lock:
+            self.engine_name = name
+            self.engine = None
+            return self._get_engine().name
+    
+    def get_engine_info(self):
+        """获取引擎信息
+
+        Returns:
+            dict: 配置的引擎模式、当前使用的引擎和可用引擎列表
+        """
+        with self.lock:
+            active = self._get_engine().name if self.universe is None else "sparse"
+            return {
+                "mode": self.engine_name,
+                "active": active,
+                "available": available_engines(),
+                "autotune": autotuner.results(),
+                "autotune_pending": autotuner.pending()
+            }
+    
+    def _reset_stats(self):
+        """网格被整体替换后重新计算种群统计（调用方需持有锁）"""
+        if self.universe is not None:
+            self.population = self.universe.population
+            self.bbox = self.universe.bounding_box()
+        else:
+            self.population = int(np.count_nonzero(self.grid))
+            self.bbox = bounding_box(self.grid)
+        self.births = 0
+        self.deaths = 0
+        self.stats_history.clear()
+        self._record_stats()
+    
+    def enable_age_tracking(self, trail_decay=None):
+        """开始维护细胞年龄和尾迹缓冲区（当前活细胞的年龄从1开始计）
+
+        Args:
+            trail_decay (int, optional): 尾迹强度每代衰减的量
+        """
+        with self.lock:
+            if trail_decay is not None:
+                self.trail_decay = int(trail_decay)
+            self._reset_age(force=True)
+    
+    def _reset_age(self, force=False):
+        """按当前网格重置年龄和尾迹缓冲区（调用方需持有锁）"""
+        if self.age is None and not force:
+            return
+        self.age = self.grid.astype(np.uint16)
+        self.trail = self.grid * np.uint8(255)
+    
+    def _update_age(self, new_grid):
+        """步进后就地更新年龄和尾迹（调用方需持有锁）"""
+        age, trail = self.age, self.trail
+        if age is None:
+            return
+        if age.shape != new_grid.shape:
+            self._reset_age()
+            return
+        # 饱和加1，死细胞归零
+        np.minimum(age, MAX_AGE - 1, out=age)
+        age += 1
+        np.multiply(age, new_grid, out=age)
+        # 尾迹衰减后把活细胞置为最强
+        np.subtract(trail, np.minimum(trail, self.trail_decay), out=trail)
+        np.maximum(trail, new_grid * np.uint8(255), out=trail)
+    
+    def attach_shared_buffer(self, buffer):
+        """每代把网格发布到共享内存缓冲区，attach时立即发布当前代
+
+        无边界模式发布原点处 width×height 视口。
+
+        Args:
+            buffer: SharedFrameBuffer或SharedMemoryStreamEncoder等具有write(grid, generation)方法的对象，
+                None表示停止发布
+        """
+        with self.lock:
+            self.shared_buffer = buffer
+            self._publish_shared()
+    
+    def _publish_shared(self):
+        """发布当前网格到共享内存缓冲区（调用方需持有锁）"""
+        if self.shared_buffer is None:
+            return
+        if self.universe is not None:
+            grid = self.universe.get_window(0, 0, self.width, self.height)
+        else:
+            grid = self.grid
+        self.shared_buffer.write(grid, self.generation)
+    
+    def _reset_history(self):
+        """网格被整体替换后重新开始记录历史（调用方需持有锁）"""
+        if self.history is not None:
+            self.history.reset()
+            self._record_history()
+    
+    def _record_history(self):
+        """记录当前代到时间回溯历史（调用方需持有锁）"""
+        if self.history is not None and self.universe is None:
+            self.history.record(self.grid, self.generation)
+    
+    def seek(self, generation):
+        """跳转到历史中保留的某一代
+
+        Args:
+            generation (int): 目标代数
+
+        Returns:
+            bool: 是否跳转成功（无历史或该代已被淘汰时失败）
+        """
+        with self.lock:
+            if self.history is None or self.universe is not None:
+                return False
+            grid = self.history.get(int(generation))
+            if grid is None:
+                return False
+            self.grid = grid
+            self.generation = int(generation)
+            self.version += 1
+            self._reset_age()
+            
+            # 统计回到目标代（之后的记录在下一次update时被截断）
+            row = self.stats_history.find(self.generation)
+            if row is not None:
+                self.population = row["population"]
+                self.births = row["births"]
+                self.deaths = row["deaths"]
+                self.bbox = (row["min_x"], row["min_y"], row["max_x"], row["max_y"])
+            else:
+                self.population = int(np.count_nonzero(self.grid))
+                self.births = 0
+                self.deaths = 0
+                self.bbox = bounding_box(self.grid)
+            return True
+    
+    def rewind(self, steps=1):
+        """回退若干代
+
+        Args:
+            steps (int): 回退的代数
+
+        Returns:
+            bool: 是否回退成功
+        """
+        return self.seek(max(0, self.generation - int(steps)))
+    
+    def get_history_info(self):
+        """获取时间回溯历史信息
+
+        Returns:
+            dict: 历史保留范围和占用字节数，未启用历史时返回None
+        """
+        with self.lock:
+            return self.history.info() if self.history is not None else None
+    
+    def _record_stats(self):
+        """将当前统计写入环形缓冲区（调用方需持有锁）"""
+        self.version += 1
+        # 跳转后继续运行时覆盖原来的"未来"
+        self.stats_history.truncate(self.generation - 1)
+        self.stats_history.record(self.generation, self.population, self.births, self.deaths, self.bbox)
+    
+    def get_stats(self, last=None):
+        """获取种群统计
+
+        Args:
+            last (int, optional): 返回最近多少代的历史，默认返回缓冲区中的全部
+
+        Returns:
+            dict: 包含当前统计和历史记录的字典
+        """
+        with self.lock:
+            return {
+                "generation": self.generation,
+                "population": self.population,
+                "births": self.births,
+                "deaths": self.deaths,
+                "bbox": list(self.bbox),
+                "history": self.stats_history.to_list(last)
+            }
+    
+    def export_state(self):
+        """导出可以用restore_state恢复的模拟状态
+
+        Returns:
+            dict: generation、grid（无边界模式下为原点处视口）和stats；
+                无边界模式另有全部活细胞坐标cells，维护年龄时另有age和trail
+        """
+        with self.lock:
+            state = {
+                "generation": self.generation,
+                "grid": self._window().tolist(),
+            }
+            if self.universe is not None:
+                state["cells"] = [list(cell) for cell in self.universe.live_cells()]
+            if self.age is not None:
+                state["age"] = self.age.tolist()
+                state["trail"] = self.trail.tolist()
+        state["stats"] = self.get_stats()
+        return state
+    
+    def restore_state(self, state):
+        """恢复export_state导出的模拟状态，继续演化的结果与不间断运行逐位一致
+
+        Args:
+            state (dict): export_state的返回值（节点的final_state包含这些字段）
+        """
+        with self.lock:
+            grid = np.array(state["grid"], dtype=np.uint8).reshape(self.height, self.width)
+            if self.universe is not None:
+                self.universe.clear()
+                cells = state.get("cells")
+                if cells is None:
+                    self.universe.load_array(grid)
+                elif cells:
+                    xs = np.array([c[0] for c in cells])
+                    ys = np.array([c[1] for c in cells])
+                    array = np.zeros((ys.max() - ys.min() + 1, xs.max() - xs.min() + 1), dtype=np.uint8)
+                    array[ys - ys.min(), xs - xs.min()] = 1
+                    self.universe.load_array(array, int(xs.min()), int(ys.min()))
+            self.grid = grid
+            self.generation = int(state["generation"])
+            
+            stats = state.get("stats")
+            if stats:
+                # 接续之前的种群统计
+                self.stats_history.clear()
+                for row in stats["history"]:
+                    self.stats_history.record(row["generation"], row["population"], row["births"], row["deaths"],
+                                              (row["min_x"], row["min_y"], row["max_x"], row["max_y"]))
+                self.population = stats["population"]
+                self.births = stats["births"]
+                self.deaths = stats["deaths"]
+                # 包围盒决定下一代统计的计算窗口，按恢复的网格重新计算而不信任传入的值
+                self.bbox = self.universe.bounding_box() if self.universe is not None else bounding_box(self.grid)
+                self.version += 1
+            else:
+                self._reset_stats()
+            self._reset_history()
+            
+            if self.age is not None:
+                if "age" in state:
+                    self.age = np.array(state["age"], dtype=np.uint16).reshape(self.height, self.width)
+                    self.trail = np.array(state["trail"], dtype=np.uint8).reshape(self.height, self.width)
+                else:
+                    self._reset_age()
     
     def start(self):
         """开始游戏"""
@@ -256,7 +645,8 @@ class LifeGame:
     def _run_game(self):
         """游戏运行线程"""
         while self.running:
-            self.update()
+            # 性能分析采集进行中时对步进进行分析
+            profile_manager.run_step(self.update)
             time.sleep(self.update_interval)
     
     def set_cell(self, x, y, state):
@@ -266,10 +656,29 @@ class LifeGame:
             x (int): x坐标
             y (int): y坐标
             state (int): 状态 (0或1)
+
+        Raises:
+            ValueError: state不是0或1时抛出
         """
+        if state not in (0, 1):
+            raise ValueError(f"Cell state must be 0 or 1, got {state!r}")
+        state = int(state)
+        if self.universe is not None:
+            with self.lock:
+                self.population += state - self.universe.get_cell(x, y)
+                self.universe.set_cell(x, y, state)
+                self._edit_bbox(x, y, state, self.universe.bounding_box)
+                # 覆盖当前代的统计记录，跳转回这一代时恢复的是编辑后的统计
+                self._record_stats()
+            return
         if 0 <= x < self.width and 0 <= y < self.height:
             with self.lock:
+                self.population += state - int(self.grid[y, x])
                 self.grid[y, x] = state
+                self._edit_bbox(x, y, state, self._shrink_bbox)
+                self._record_stats()
+                self._record_history()
+                self._set_cell_age(x, y)
     
     def toggle_cell(self, x, y):
         """切换单个细胞状态
@@ -281,12 +690,58 @@ class LifeGame:
         Returns:
             int: 新状态
         """
+        if self.universe is not None:
+            with self.lock:
+                state = 1 - self.universe.get_cell(x, y)
+                self.universe.set_cell(x, y, state)
+                self.population += 1 if state else -1
+                self._edit_bbox(x, y, state, self.universe.bounding_box)
+                self._record_stats()
+                return state
         if 0 <= x < self.width and 0 <= y < self.height:
             with self.lock:
                 self.grid[y, x] = 1 - self.grid[y, x]
+                self.population += 1 if self.grid[y, x] else -1
+                self._edit_bbox(x, y, int(self.grid[y, x]), self._shrink_bbox)
+                self._record_stats()
+                self._record_history()
+                self._set_cell_age(x, y)
                 return int(self.grid[y, x])
         return None
     
+    def _edit_bbox(self, x, y, alive, rescan):
+        """单个细胞修改后更新包围盒（调用方需持有锁）
+
+        置活时直接扩展包围盒；只有清除位于包围盒边界上的细胞时才调用rescan重新扫描。
+        需要在更新population之后调用（无边界模式的坐标可以为负，不能用-1判断是否为空）。
+        """
+        min_x, min_y, max_x, max_y = self.bbox
+        if alive:
+            if self.population == 1:
+                self.bbox = (x, y, x, y)
+            else:
+                self.bbox = (min(min_x, x), min(min_y, y), max(max_x, x), max(max_y, y))
+        elif self.population == 0:
+            self.bbox = (-1, -1, -1, -1)
+        elif x in (min_x, max_x) or y in (min_y, max_y):
+            self.bbox = rescan()
+    
+    def _shrink_bbox(self):
+        """清除边界上的细胞后，只在旧包围盒内重新扫描（调用方需持有锁）"""
+        min_x, min_y, max_x, max_y = self.bbox
+        inner = bounding_box(self.grid[min_y:max_y + 1, min_x:max_x + 1])
+        if inner[0] < 0:
+            return inner
+        return (inner[0] + min_x, inner[1] + min_y, inner[2] + min_x, inner[3] + min_y)
+    
+    def _set_cell_age(self, x, y):
+        """手动修改细胞后同步年龄和尾迹（调用方需持有锁）"""
+        if self.age is not None:
+            alive = int(self.grid[y, x])
+            self.age[y, x] = alive
+            if alive:
+                self.trail[y, x] = 255
+    
     def set_update_interval(self, interval):
         """设置更新间隔
         
@@ -295,43 +750,203 @@ class LifeGame:
         """
         self.update_interval = max(0.01, min(interval, 2.0))
     
-    def get_image(self):
+    def set_universe_mode(self, unbounded, chunk_size=64):
+        """切换环形网格与无边界稀疏宇宙
+
+        切换时保留默认视口（原点处width×height区域）内的细胞。
+
+        Args:
+            unbounded (bool): 是否使用无边界模式
+            chunk_size (int): 无边界模式下的区块边长
+        """
+        with self.lock:
+            if unbounded and self.universe is None:
+                self.universe = SparseUniverse(chunk_size)
+                self.universe.load_array(self.grid)
+            elif not unbounded and self.universe is not None:
+                self.grid = self.universe.get_window(0, 0, self.width, self.height)
+                self.universe = None
+            else:
+                return
+            self._reset_stats()
+            self._reset_history()
+            self._reset_age()
+    
+    def _window(self, x=0, y=0, width=None, height=None):
+        """获取视口窗口的稠密网格（调用方需持有锁）
+
+        环形模式下超出网格的部分以死细胞填充。
+        """
+        width = self.width if width is None else max(1, int(width))
+        height = self.height if height is None else max(1, int(height))
+        if self.universe is not None:
+            return self.universe.get_window(x, y, width, height)
+        return self._array_window(self.grid, x, y, width, height)
+    
+    def _array_window(self, array, x, y, width, height):
+        """从环形模式下与网格同尺寸的数组中切取视口，超出部分以0填充"""
+        if x == 0 and y == 0 and width == self.width and height == self.height:
+            return array.copy()
+        window = np.zeros((height, width), dtype=array.dtype)
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + width, self.width), min(y + height, self.height)
+        if x0 < x1 and y0 < y1:
+            window[y0 - y:y1 - y, x0 - x:x1 - x] = array[y0:y1, x0:x1]
+        return window
+    
+    def get_grid(self, x=0, y=0, width=None, height=None):
+        """获取视口窗口的网格
+
+        Args:
+            x (int): 视口左上角x坐标
+            y (int): 视口左上角y坐标
+            width (int, optional): 视口宽度，默认为网格宽度
+            height (int, optional): 视口高度，默认为网格高度
+
+        Returns:
+            np.ndarray: 形状为 (height, width) 的uint8数组
+        """
+        with self.lock:
+            return self._window(x, y, width, height)
+    
+    def _density_window(self, level, x, y, width, height):
+        """获取缩小视图的活细胞计数窗口（调用方需持有锁）
+
+        环形模式只对视口覆盖的块求和，不池化整个棋盘；
+        无边界模式逐个活区块统计，不构建视口的稠密网格。
+        """
+        if self.universe is not None:
+            return self.universe.density_window(level, x, y, width, height)
+        return pool_window(self.grid, level, x, y, width, height)
+    
+    def _viewport_size(self, width, height):
+        width = self.width if width is None else max(1, int(width))
+        height = self.height if height is None else max(1, int(height))
+        return width, height
+    
+    def render(self, x=0, y=0, width=None, height=None, zoom=None, alive_rgb=(255, 255, 255), dead_rgb=(0, 0, 0),
+               mode="cells", old_rgb=(255, 64, 0), trail_rgb=(64, 64, 160), age_span=64):
+        """将视口渲染为RGB数组
+
+        zoom不小于1时每个细胞占round(zoom)像素；小于1时吸附到1/2^k，
+        每个像素显示 2^k × 2^k 块内的活细胞密度。
+        年龄/尾迹模式首次使用时开始维护年龄缓冲区；无边界模式和缩小视图下按cells模式渲染。
+
+        Args:
+            x (int): 视口左上角x坐标
+            y (int): 视口左上角y坐标
+            width (int, optional): 视口宽度，默认为网格宽度
+            height (int, optional): 视口高度，默认为网格高度
+            zoom (float, optional): 每个细胞的像素数，默认为cell_size
+            alive_rgb (tuple): 活细胞颜色（age模式下为新生细胞颜色）
+            dead_rgb (tuple): 死细胞颜色
+            mode (str): 渲染模式，见render.RENDER_MODES
+            old_rgb (tuple): age模式下年龄达到age_span的细胞颜色
+            trail_rgb (tuple): trail模式下尾迹最强时的颜色
+            age_span (int): 年龄颜色渐变覆盖的代数
+
+        Returns:
+            np.ndarray: 形状为 (H, W, 3) 的uint8数组
+        """
+        zoom = self.cell_size if zoom is None else float(zoom)
+        width, height = self._viewport_size(width, height)
+        palette = make_palette(alive_rgb, dead_rgb)
+        level = zoom_level(zoom, max(width, height))
+        with self.lock:
+            if level == 0 and mode != "cells" and self.universe is None:
+                if self.age is None:
+                    self._reset_age(force=True)
+                age_lut, trail_lut = make_age_trail_luts(mode, alive_rgb, dead_rgb, old_rgb, trail_rgb, age_span)
+                return render_age_trail(self._window(x, y, width, height),
+                                        self._array_window(self.age, x, y, width, height),
+                                        self._array_window(self.trail, x, y, width, height),
+                                        max(1, int(round(zoom))), age_lut, trail_lut)
+            if level == 0:
+                return render_cells(self._window(x, y, width, height), max(1, int(round(zoom))), palette)
+            counts = self._density_window(level, x, y, width, height)
+        return render_density(counts, 1 << level, palette)
+    
+    def get_image(self, x=0, y=0, width=None, height=None, zoom=None, mode="cells"):
         """获取当前状态的图像
 
+        cells模式（以及无边界模式）不缩小时渲染到常驻缓冲区，只重绘与上一次请求相比变化的细胞。
+
+        Args:
+            x (int): 视口左上角x坐标
+            y (int): 视口左上角y坐标
+            width (int, optional): 视口宽度，默认为网格宽度
+            height (int, optional): 视口高度，默认为网格高度
+            zoom (float, optional): 每个细胞的像素数，默认为cell_size，小于1时显示块密度
+            mode (str): 渲染模式，见render.RENDER_MODES
+
         Returns:
-            PIL.Image: 生命游戏当前状态的图像
+            PIL.Image: 生命游戏当前状态（视口内）的图像
         """
+        from PIL import Image
+        zoom = self.cell_size if zoom is None else float(zoom)
+        if zoom_level(zoom) > 0 or (mode != "cells" and self.universe is None):
+            return Image.fromarray(self.render(x, y, width, height, zoom, mode=mode))
+        width, height = self._viewport_size(width, height)
         with self.lock:
-            # 创建一个黑白图像
-            img_width = self.width * self.cell_size
-            img_height = self.height * self.cell_size
-            img = Image.new('RGB', (img_width, img_height), color='black')
-            
-            # 绘制活细胞
-            for y in range(self.height):
-                for x in range(self.width):
-                    if self.grid[y, x] == 1:
-                        for i in range(self.cell_size):
-                            for j in range(self.cell_size):
-                                img.putpixel((x * self.cell_size + i, y * self.cell_size + j), (255, 255, 255))
-            
-            return img
+            pixels = self._framebuffer.render(self._window(x, y, width, height), max(1, int(round(zoom))),
+                                              make_palette())
+            # RGB图像由缓冲区复制而来，之后缓冲区可以继续原地更新
+            return Image.fromarray(pixels)
     
-    def get_state(self):
+    def get_state(self, x=0, y=0, width=None, height=None, zoom=None):
         """获取当前游戏状态
 
+        Args:
+            x (int): 视口左上角x坐标
+            y (int): 视口左上角y坐标
+            width (int, optional): 视口宽度，默认为网格宽度
+            height (int, optional): 视口高度，默认为网格高度
+            zoom (float, optional): 小于1时grid为 block × block 块内的活细胞数量
+
         Returns:
-            dict: 包含游戏状态信息的字典
+            dict: 包含游戏状态信息的字典，grid为视口内的网格
         """
+        width, height = self._viewport_size(width, height)
+        level = zoom_level(float(zoom), max(width, height)) if zoom is not None else 0
         with self.lock:
+            if level == 0:
+                grid = self._window(x, y, width, height)
+            else:
+                grid = self._density_window(level, x, y, width, height)
             return {
                 "running": self.running,
                 "generation": self.generation,
-                "grid": self.grid.tolist(),
+                "population": self.population,
+                "grid": grid.tolist(),
+                "block": 1 << level,
                 "interval": self.update_interval,
                 "width": self.width,
-                "height": self.height
+                "height": self.height,
+                "unbounded": self.universe is not None,
+                "viewport": {"x": x, "y": y, "width": width, "height": height}
             }
 
-# 创建一个全局实例以便在节点和API之间共享
-lifegame_instance = LifeGame() 
\ No newline at end of file
+# 节点和API之间共享的全局实例，首次使用时才创建
+_lifegame_instance = None
+_instance_lock = threading.Lock()
+
+
+def get_lifegame_instance():
+    """获取共享的生命游戏实例（首次调用时创建）
+
+    Returns:
+        LifeGame: 全局实例
+    """
+    global _lifegame_instance
+    if _lifegame_instance is None:
+        with _instance_lock:
+            if _lifegame_instance is None:
+                _lifegame_instance = LifeGame(history_bytes=16 * 1024 * 1024, engine="auto")
+    return _lifegame_instance
+
+
+def __getattr__(name):
+    # 兼容旧代码中的 lifegame_instance 模块属性
+    if name == "lifegame_instance":
+        return get_lifegame_instance()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
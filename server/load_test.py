@@ -0,0 +1,388 @@
+"""
+生命游戏HTTP/WebSocket接口压力测试工具
+
+在子进程中把API路由挂载到普通aiohttp应用上（代替PromptServer），
+再由当前进程模拟大量浏览器：HTTP客户端按权重混合轮询状态/图像/统计、编辑细胞和加载预设，
+WebSocket客户端监听GIF更新通知，服务器进程按固定频率广播通知。
+结束后报告每类请求的吞吐量、p50/p99延迟、WebSocket通知的送达延迟和服务器事件循环的延迟（lag）。
+全部在本机离线运行。
+
+命令行用法::
+
+    python -m server.load_test --http-clients 50 --ws-clients 50 --duration 30
+    lifegame-load-test --mix state=60,image=10,edit=30 --think 0 --output report.json
+    lifegame-load-test --url http://127.0.0.1:8188 --duration 10   # 压测已运行的ComfyUI
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import queue
+import random
+import time
+
+import numpy as np
+
+# 默认请求混合权重：以轮询为主，少量编辑和预设加载
+DEFAULT_MIX = {"state": 50, "image": 15, "stats": 10, "edit": 20, "preset": 5}
+
+# 事件循环延迟的采样间隔（秒）
+LAG_INTERVAL = 0.01
+
+
+def parse_mix(text):
+    """解析 "state=50,image=20" 形式的请求混合权重
+
+    Args:
+        text (str): 逗号分隔的 名称=权重
+
+    Returns:
+        dict: 请求类型到权重的映射
+
+    Raises:
+        ValueError: 类型未知或权重无效时抛出
+    """
+    mix = {}
+    for item in text.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in DEFAULT_MIX:
+            raise ValueError(f"Unknown request type: {name}")
+        mix[name] = float(weight)
+        if mix[name] < 0:
+            raise ValueError(f"Negative weight for {name}")
+    if not any(mix.values()):
+        raise ValueError("At least one request type needs a positive weight")
+    return mix
+
+
+def summarize(samples):
+    """计算延迟样本（秒）的统计，结果以毫秒为单位
+
+    Returns:
+        dict: count、p50、p99、max和mean
+    """
+    if not samples:
+        return {"count": 0, "p50": None, "p99": None, "max": None, "mean": None}
+    values = np.asarray(samples, dtype=np.float64) * 1000.0
+    return {
+        "count": int(values.size),
+        "p50": round(float(np.percentile(values, 50)), 3),
+        "p99": round(float(np.percentile(values, 99)), 3),
+        "max": round(float(values.max()), 3),
+        "mean": round(float(values.mean()), 3),
+    }
+
+
+async def _monitor_lag(samples):
+    """定时休眠，记录实际唤醒比预期晚的时间"""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(LAG_INTERVAL)
+        samples.append(max(0.0, loop.time() - start - LAG_INTERVAL))
+
+
+async def _publish_updates(rate):
+    """按固定频率广播GIF更新通知，模拟节点不断生成动画"""
+    from .api import broadcast_gif_update
+    while True:
+        await asyncio.sleep(1.0 / rate)
+        await broadcast_gif_update("lifegame_load_test.gif")
+
+
+async def _serve(host, port, gif_rate, control, results):
+    from aiohttp import web
+    from .api import register_routes, ws_manager
+
+    app = web.Application()
+    register_routes(app)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    port = runner.addresses[0][1]
+
+    lag = []
+    tasks = [asyncio.ensure_future(_monitor_lag(lag))]
+    if gif_rate > 0:
+        tasks.append(asyncio.ensure_future(_publish_updates(gif_rate)))
+    results.put(("ready", port))
+
+    loop = asyncio.get_running_loop()
+    while True:
+        command = await loop.run_in_executor(None, control.get)
+        if command == "reset":
+            # 只统计压测阶段的延迟
+            lag.clear()
+            results.put(("reset", None))
+        else:
+            break
+
+    for task in tasks:
+        task.cancel()
+    results.put(("done", {"loop_lag": summarize(lag), "ws": ws_manager.status()}))
+    await runner.cleanup()
+
+
+def _server_process(host, port, gif_rate, control, results):
+    """服务器子进程入口"""
+    try:
+        asyncio.run(_serve(host, port, gif_rate, control, results))
+    except Exception as e:
+        results.put(("error", repr(e)))
+
+
+class _Stats:
+    """客户端侧的延迟和错误计数"""
+
+    def __init__(self):
+        self.latency = {name: [] for name in DEFAULT_MIX}
+        self.errors = {name: 0 for name in DEFAULT_MIX}
+        self.ws_latency = []
+        self.ws_messages = 0
+        self.ws_errors = 0
+
+
+async def _request(session, base, action, rng, info):
+    """发送一个请求并读取完整响应，返回HTTP状态码"""
+    if action == "state":
+        response = session.get(f"{base}/api/lifegame/state")
+    elif action == "image":
+        response = session.get(f"{base}/api/lifegame/image")
+    elif action == "stats":
+        response = session.get(f"{base}/api/lifegame/stats", params={"last": "100"})
+    elif action == "edit":
+        response = session.post(f"{base}/api/lifegame/toggle_cell",
+                                json={"x": rng.randrange(info["width"]), "y": rng.randrange(info["height"])})
+    else:
+        response = session.post(f"{base}/api/lifegame/load_preset", json={"preset_name": rng.choice(info["presets"])})
+    async with response as resp:
+        await resp.read()
+        return resp.status
+
+
+async def _http_client(session, base, mix, think, deadline, seed, info, stats):
+    """模拟一个浏览器：按权重随机选择请求，两次请求之间等待think秒"""
+    rng = random.Random(seed)
+    names = [name for name in mix if mix[name] > 0]
+    weights = [mix[name] for name in names]
+    while time.perf_counter() < deadline:
+        action = rng.choices(names, weights)[0]
+        start = time.perf_counter()
+        try:
+            status = await _request(session, base, action, rng, info)
+        except Exception:
+            status = None
+        stats.latency[action].append(time.perf_counter() - start)
+        if status != 200:
+            stats.errors[action] += 1
+        if think > 0:
+            # 抖动避免所有客户端同步轮询
+            await asyncio.sleep(think * rng.uniform(0.5, 1.5))
+
+
+async def _ws_client(session, base, deadline, stats):
+    """监听GIF更新通知，用消息中的时间戳计算送达延迟"""
+    from aiohttp import WSMsgType
+    try:
+        async with session.ws_connect(f"{base}/ws/lifegame/gif_updates") as ws:
+            while True:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    msg = await ws.receive(timeout=remaining)
+                except asyncio.TimeoutError:
+                    break
+                if msg.type != WSMsgType.TEXT:
+                    break
+                data = json.loads(msg.data)
+                stats.ws_messages += 1
+                if data.get("path") == "lifegame_load_test.gif":
+                    stats.ws_latency.append(max(0.0, time.time() - data["timestamp"] / 1000.0))
+    except Exception:
+        stats.ws_errors += 1
+
+
+async def run_load(base, http_clients=20, ws_clients=20, duration=10.0, mix=None, think=0.1, seed=0, density=0.3,
+                   start_game=True):
+    """对base地址运行一次压测
+
+    Args:
+        base (str): 服务器地址，例如 http://127.0.0.1:8188
+        http_clients (int): 并发HTTP客户端数
+        ws_clients (int): 并发WebSocket客户端数
+        duration (float): 压测时长（秒）
+        mix (dict): 请求类型权重，默认DEFAULT_MIX
+        think (float): 每个客户端两次请求之间的平均间隔（秒），0表示不间断发送
+        seed (int): 随机种子
+        density (float): 压测前随机初始化网格的密度
+        start_game (bool): 压测期间是否让游戏持续运行
+
+    Returns:
+        dict: 每类请求的吞吐量和延迟以及WebSocket统计
+    """
+    import aiohttp
+
+    mix = mix or DEFAULT_MIX
+    connector = aiohttp.TCPConnector(limit=0)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        # 准备网格，并取得尺寸和预设列表
+        async with session.post(f"{base}/api/lifegame/random_init", json={"density": density, "seed": seed}) as resp:
+            await resp.read()
+        if start_game:
+            async with session.post(f"{base}/api/lifegame/start") as resp:
+                await resp.read()
+        async with session.get(f"{base}/api/lifegame/state") as resp:
+            state = (await resp.json())["data"]
+        async with session.get(f"{base}/api/lifegame/presets") as resp:
+            presets = (await resp.json())["presets"]
+        info = {"width": state["width"], "height": state["height"], "presets": presets}
+
+        stats = _Stats()
+        start = time.perf_counter()
+        deadline = start + duration
+        tasks = [_ws_client(session, base, deadline, stats) for _ in range(ws_clients)]
+        tasks += [_http_client(session, base, mix, think, deadline, seed + i, info, stats)
+                  for i in range(http_clients)]
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - start
+
+        if start_game:
+            async with session.post(f"{base}/api/lifegame/stop") as resp:
+                await resp.read()
+
+    requests = {}
+    for name, samples in stats.latency.items():
+        if not samples:
+            continue
+        requests[name] = dict(summarize(samples), errors=stats.errors[name],
+                              per_second=round(len(samples) / elapsed, 2))
+    all_samples = [value for samples in stats.latency.values() for value in samples]
+    total = dict(summarize(all_samples), errors=sum(stats.errors.values()),
+                 per_second=round(len(all_samples) / elapsed, 2))
+    return {
+        "seconds": round(elapsed, 3),
+        "http_clients": http_clients,
+        "ws_clients": ws_clients,
+        "think": think,
+        "mix": mix,
+        "requests": requests,
+        "total": total,
+        "ws": dict(summarize(stats.ws_latency), messages=stats.ws_messages, errors=stats.ws_errors),
+    }
+
+
+class LocalServer:
+    """在子进程中运行挂载了API路由的aiohttp应用"""
+
+    def __init__(self, host="127.0.0.1", port=0, gif_rate=5.0, start_timeout=30.0):
+        """启动服务器子进程并等待其就绪
+
+        Args:
+            host (str): 监听地址
+            port (int): 端口，0表示自动选择
+            gif_rate (float): 每秒广播的GIF更新通知数，0表示不广播
+            start_timeout (float): 等待就绪的秒数
+        """
+        context = multiprocessing.get_context("spawn")
+        self.control = context.Queue()
+        self.results = context.Queue()
+        self.process = context.Process(target=_server_process, args=(host, port, gif_rate, self.control, self.results),
+                                       daemon=True)
+        self.process.start()
+        status, detail = self._result(start_timeout)
+        if status != "ready":
+            self.process.terminate()
+            raise RuntimeError(f"Server failed to start: {detail}")
+        self.url = f"http://{host}:{detail}"
+
+    def _result(self, timeout):
+        try:
+            return self.results.get(timeout=timeout)
+        except queue.Empty:
+            return "error", "timeout"
+
+    def reset(self):
+        """清空服务器端已采集的事件循环延迟"""
+        self.control.put("reset")
+        self._result(10.0)
+
+    def stop(self):
+        """停止服务器
+
+        Returns:
+            dict: 服务器端的事件循环延迟和WebSocket管理器统计，失败时为None
+        """
+        self.control.put("stop")
+        status, detail = self._result(30.0)
+        self.process.join(timeout=10.0)
+        if self.process.is_alive():
+            self.process.terminate()
+        return detail if status == "done" else None
+
+
+def format_report(report):
+    """把压测结果格式化为文本表格"""
+    lines = [f"{report['seconds']}秒，{report['http_clients']}个HTTP客户端，{report['ws_clients']}个WebSocket客户端，"
+             f"思考时间{report['think']}秒",
+             f"{'请求':<8}{'次数':>8}{'每秒':>10}{'p50(ms)':>10}{'p99(ms)':>10}{'最大(ms)':>10}{'错误':>6}"]
+    rows = list(report["requests"].items()) + [("total", report["total"])]
+    for name, row in rows:
+        lines.append(f"{name:<8}{row['count']:>8}{row['per_second']:>10}{row['p50']:>10}{row['p99']:>10}"
+                     f"{row['max']:>10}{row['errors']:>6}")
+    ws = report["ws"]
+    lines.append(f"WebSocket通知: {ws['messages']}条，送达延迟p50 {ws['p50']}ms，p99 {ws['p99']}ms，连接错误{ws['errors']}")
+    server = report.get("server")
+    if server:
+        lag = server["loop_lag"]
+        lines.append(f"服务器事件循环延迟: p50 {lag['p50']}ms，p99 {lag['p99']}ms，最大 {lag['max']}ms")
+        lines.append(f"服务器WebSocket: 已发送{server['ws']['sent']}条，丢弃{server['ws']['dropped']}条")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="生命游戏HTTP/WebSocket接口压力测试")
+    parser.add_argument("--http-clients", type=int, default=20, help="并发HTTP客户端数")
+    parser.add_argument("--ws-clients", type=int, default=20, help="并发WebSocket客户端数")
+    parser.add_argument("--duration", type=float, default=10.0, help="压测时长（秒）")
+    parser.add_argument("--mix", type=parse_mix, default=None,
+                        help="请求混合权重，例如 state=50,image=15,stats=10,edit=20,preset=5")
+    parser.add_argument("--think", type=float, default=0.1, help="客户端两次请求之间的平均间隔（秒），0表示不间断")
+    parser.add_argument("--gif-rate", type=float, default=5.0, help="服务器每秒广播的GIF更新通知数")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    parser.add_argument("--no-run", action="store_true", help="压测期间不运行游戏")
+    parser.add_argument("--url", help="压测已运行的服务器（不启动本地服务器，不统计事件循环延迟）")
+    parser.add_argument("--output", help="把结果写入JSON文件")
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.url:
+        base = args.url.rstrip("/")
+    else:
+        server = LocalServer(gif_rate=args.gif_rate)
+        base = server.url
+    try:
+        if server is not None:
+            server.reset()
+        report = asyncio.run(run_load(base, args.http_clients, args.ws_clients, args.duration, args.mix, args.think,
+                                      args.seed, start_game=not args.no_run))
+    finally:
+        if server is not None:
+            report_server = server.stop()
+    if server is not None:
+        report["server"] = report_server
+
+    print(format_report(report))
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,349 @@
+"""
+生命游戏磁盘映射超大宇宙模块
+
+网格按位压缩（每字节8个细胞）保存在两个np.memmap映射文件中，100k×100k的棋盘每个文件约1.25GB，
+而稠密uint8网格需要约10GB。每一代按水平条带（stripe）流式计算：从当前文件读取条带及上下各一行
+光环（halo）行，解压到小的内存窗口中计算，再压缩写入另一个文件，完成后交换两个文件。
+元数据（尺寸、代数、当前文件）在新一代写完并刷新后才原子替换，中途崩溃时仍停留在上一代。
+
+视口和缩略总览直接从映射数据渲染：视口只读取覆盖的行和字节，总览按块统计活细胞数量
+（块不小于8时直接对压缩字节查表计数，不需要解压）。
+"""
+import json
+import os
+
+import numpy as np
+
+from .render import make_palette, render_cells, render_density
+
+# 每个字节中活细胞数量的查找表
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+# 元数据文件名和两个网格文件名
+META_FILE = "universe.json"
+GRID_FILES = ("grid0.bin", "grid1.bin")
+
+
+class MappedUniverse:
+    """按位压缩、映射到磁盘文件、按条带步进的生命游戏宇宙"""
+
+    def __init__(self, directory, meta, stripe_cells=1 << 22):
+        """打开目录中的宇宙文件，请使用create或open创建
+
+        Args:
+            directory (str): 宇宙目录
+            meta (dict): 元数据
+            stripe_cells (int): 每个条带解压后的细胞数上限，决定内存窗口大小
+        """
+        self.directory = directory
+        self.meta = meta
+        self.width = int(meta["width"])
+        self.height = int(meta["height"])
+        self.wrap = bool(meta["wrap"])
+        self.row_bytes = (self.width + 7) // 8
+        self.stripe_rows = max(1, min(self.height, int(stripe_cells) // self.width))
+        self.maps = [np.memmap(os.path.join(directory, name), dtype=np.uint8, mode="r+",
+                               shape=(self.height, self.row_bytes)) for name in GRID_FILES]
+
+    @classmethod
+    def create(cls, directory, width, height, wrap=True, info=None, stripe_cells=1 << 22):
+        """创建新的空白宇宙（覆盖目录中已有的宇宙）
+
+        Args:
+            directory (str): 宇宙目录
+            width (int): 宽度
+            height (int): 高度
+            wrap (bool): 是否为环形边界（与LifeGame的toroidal模式一致），否则边界外视为死细胞
+            info (dict): 随元数据保存的附加信息（例如初始化参数）
+            stripe_cells (int): 每个条带解压后的细胞数上限
+
+        Returns:
+            MappedUniverse: 宇宙
+        """
+        width, height = int(width), int(height)
+        if width < 1 or height < 1:
+            raise ValueError("Universe size must be positive")
+        os.makedirs(directory, exist_ok=True)
+        size = height * ((width + 7) // 8)
+        for name in GRID_FILES:
+            # truncate得到全零的稀疏文件，不需要实际写入
+            with open(os.path.join(directory, name), "wb") as f:
+                f.truncate(size)
+        meta = {"width": width, "height": height, "wrap": bool(wrap), "generation": 0, "current": 0,
+                "population": 0, "info": info or {}}
+        universe = cls(directory, meta, stripe_cells)
+        universe._save_meta()
+        return universe
+
+    @classmethod
+    def open(cls, directory, stripe_cells=1 << 22):
+        """打开已有的宇宙
+
+        Args:
+            directory (str): 宇宙目录
+            stripe_cells (int): 每个条带解压后的细胞数上限
+
+        Returns:
+            MappedUniverse: 宇宙
+
+        Raises:
+            FileNotFoundError: 目录中没有宇宙时抛出
+        """
+        with open(os.path.join(directory, META_FILE), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        return cls(directory, meta, stripe_cells)
+
+    @property
+    def generation(self):
+        """当前代数"""
+        return self.meta["generation"]
+
+    @property
+    def population(self):
+        """活细胞总数"""
+        return self.meta["population"]
+
+    @property
+    def info(self):
+        """创建时保存的附加信息"""
+        return self.meta["info"]
+
+    @property
+    def current(self):
+        """保存当前代的映射数组"""
+        return self.maps[self.meta["current"]]
+
+    def _save_meta(self):
+        path = os.path.join(self.directory, META_FILE)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(self.meta, f)
+        os.replace(path + ".tmp", path)
+
+    def _stripes(self, rows=None):
+        rows = rows or self.stripe_rows
+        for r0 in range(0, self.height, rows):
+            yield r0, min(r0 + rows, self.height)
+
+    def _count(self):
+        return int(sum(int(_POPCOUNT[self.current[r0:r1]].sum(dtype=np.int64)) for r0, r1 in self._stripes()))
+
+    def clear(self):
+        """清空宇宙，代数归零"""
+        for r0, r1 in self._stripes(self.stripe_rows * 8):
+            self.current[r0:r1] = 0
+        self.current.flush()
+        self.meta.update(generation=0, population=0)
+        self._save_meta()
+
+    def random_init(self, density=0.3, seed=None):
+        """随机初始化（与LifeGame.random_init使用相同的随机数序列，同尺寸同种子结果一致）
+
+        Args:
+            density (float): 活细胞密度
+            seed (int, optional): 随机种子
+        """
+        rng = np.random.default_rng(seed)
+        for r0, r1 in self._stripes():
+            self.current[r0:r1] = np.packbits(rng.random((r1 - r0, self.width)) < density, axis=1)
+        self.current.flush()
+        self.meta["generation"] = 0
+        self.meta["population"] = self._count()
+        self._save_meta()
+
+    def load_pattern(self, pattern, x_offset=None, y_offset=None):
+        """清空宇宙并加载 (x, y) 坐标列表描述的图案，未指定偏移时居中
+
+        Args:
+            pattern (list): (x, y) 坐标列表
+            x_offset (int, optional): X偏移
+            y_offset (int, optional): Y偏移
+        """
+        self.clear()
+        if not pattern:
+            return
+        xs = np.array([p[0] for p in pattern])
+        ys = np.array([p[1] for p in pattern])
+        grid = np.zeros((ys.max() + 1, xs.max() + 1), dtype=np.uint8)
+        grid[ys, xs] = 1
+        if x_offset is None:
+            x_offset = (self.width - grid.shape[1]) // 2
+        if y_offset is None:
+            y_offset = (self.height - grid.shape[0]) // 2
+        self.load_array(grid, x_offset, y_offset)
+
+    def load_array(self, grid, x=0, y=0):
+        """把稠密网格写入宇宙（覆盖该区域，超出宇宙的部分被裁掉）
+
+        Args:
+            grid (np.ndarray): 细胞网格
+            x (int): 网格左上角的x坐标
+            y (int): 网格左上角的y坐标
+        """
+        grid = np.asarray(grid, dtype=np.uint8)
+        height, width = grid.shape
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + width, self.width), min(y + height, self.height)
+        if x0 >= x1 or y0 >= y1:
+            return
+        b0, b1 = x0 // 8, (x1 + 7) // 8
+        rows = np.unpackbits(self.current[y0:y1, b0:b1], axis=1)
+        rows[:, x0 - b0 * 8:x1 - b0 * 8] = grid[y0 - y:y1 - y, x0 - x:x1 - x] != 0
+        self.current[y0:y1, b0:b1] = np.packbits(rows, axis=1)
+        self.current.flush()
+        self.meta["population"] = self._count()
+        self._save_meta()
+
+    def _read_stripe(self, src, r0, r1):
+        """读取 [r0, r1) 行及上下光环行并解压为uint8"""
+        packed = np.zeros((r1 - r0 + 2, self.row_bytes), dtype=np.uint8)
+        packed[1:-1] = src[r0:r1]
+        if self.wrap:
+            packed[0] = src[(r0 - 1) % self.height]
+            packed[-1] = src[r1 % self.height]
+        else:
+            if r0 > 0:
+                packed[0] = src[r0 - 1]
+            if r1 < self.height:
+                packed[-1] = src[r1]
+        return np.unpackbits(packed, axis=1, count=self.width)
+
+    def step(self, n=1, on_stripe=None):
+        """按条带演化n代
+
+        Args:
+            n (int): 代数
+            on_stripe (callable): 每写完一个条带后调用（无参数），抛出异常即可中止；
+                元数据只在整代写完后更新，中止时宇宙停留在上一个完整的代
+        """
+        for _ in range(n):
+            src = self.current
+            dst = self.maps[1 - self.meta["current"]]
+            population = 0
+            for r0, r1 in self._stripes():
+                cells = self._read_stripe(src, r0, r1)
+                # 左右各补一列：环形边界取对侧列，否则补0
+                if self.wrap:
+                    p = np.concatenate([cells[:, -1:], cells, cells[:, :1]], axis=1)
+                else:
+                    p = np.pad(cells, ((0, 0), (1, 1)))
+                neighbors = (p[:-2, :-2] + p[:-2, 1:-1] + p[:-2, 2:] +
+                             p[1:-1, :-2] + p[1:-1, 2:] +
+                             p[2:, :-2] + p[2:, 1:-1] + p[2:, 2:])
+                alive = cells[1:-1]
+                new = (neighbors == 3) | ((alive == 1) & (neighbors == 2))
+                packed = np.packbits(new, axis=1)
+                dst[r0:r1] = packed
+                population += int(_POPCOUNT[packed].sum(dtype=np.int64))
+                if on_stripe is not None:
+                    on_stripe()
+            dst.flush()
+            self.meta.update(generation=self.meta["generation"] + 1, current=1 - self.meta["current"],
+                             population=population)
+            self._save_meta()
+
+    def get_window(self, x, y, width, height):
+        """读取视口内的细胞（超出宇宙的部分为0）
+
+        Args:
+            x (int): 视口左上角x坐标
+            y (int): 视口左上角y坐标
+            width (int): 视口宽度
+            height (int): 视口高度
+
+        Returns:
+            np.ndarray: 形状为 (height, width) 的uint8数组
+        """
+        window = np.zeros((height, width), dtype=np.uint8)
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + width, self.width), min(y + height, self.height)
+        if x0 < x1 and y0 < y1:
+            b0, b1 = x0 // 8, (x1 + 7) // 8
+            rows = np.unpackbits(self.current[y0:y1, b0:b1], axis=1)
+            window[y0 - y:y1 - y, x0 - x:x1 - x] = rows[:, x0 - b0 * 8:x1 - b0 * 8]
+        return window
+
+    def overview_block(self, max_size):
+        """选择使总览不超过max_size×max_size的最小块边长（2的幂）
+
+        Args:
+            max_size (int): 总览的最大边长（像素）
+
+        Returns:
+            int: 块边长
+        """
+        block = 1
+        while -(-max(self.width, self.height) // block) > max_size:
+            block *= 2
+        return block
+
+    def density(self, block):
+        """按block×block块统计整个宇宙的活细胞数量
+
+        Args:
+            block (int): 块边长，2的幂
+
+        Returns:
+            np.ndarray: 形状为 (ceil(height/block), ceil(width/block)) 的uint32计数
+        """
+        out_h, out_w = -(-self.height // block), -(-self.width // block)
+        counts = np.zeros((out_h, out_w), dtype=np.uint32)
+        # 每次读取的行数取block的倍数或block的约数，使每块的行落在同一次读取中或按顺序累加
+        rows = self.stripe_rows * 8 if block >= 8 else self.stripe_rows
+        rows = rows // block * block if rows >= block else 1 << (rows.bit_length() - 1)
+        for r0, r1 in self._stripes(rows):
+            packed = self.current[r0:r1]
+            if block >= 8:
+                # 压缩字节直接查表计数，按每块 block/8 个字节求和
+                per_block = block // 8
+                bytes_needed = out_w * per_block
+                row_counts = _POPCOUNT[packed].astype(np.uint32)
+                if bytes_needed > self.row_bytes:
+                    row_counts = np.pad(row_counts, ((0, 0), (0, bytes_needed - self.row_bytes)))
+                row_counts = row_counts.reshape(r1 - r0, out_w, per_block).sum(axis=2)
+            else:
+                cells = np.unpackbits(packed, axis=1, count=self.width)
+                cells = np.pad(cells, ((0, 0), (0, out_w * block - self.width)))
+                row_counts = cells.reshape(r1 - r0, out_w, block).sum(axis=2, dtype=np.uint32)
+            if rows >= block:
+                pad = -(r1 - r0) % block
+                if pad:
+                    row_counts = np.pad(row_counts, ((0, pad), (0, 0)))
+                counts[r0 // block:r0 // block + row_counts.shape[0] // block] += \
+                    row_counts.reshape(-1, block, out_w).sum(axis=1, dtype=np.uint32)
+            else:
+                counts[r0 // block] += row_counts.sum(axis=0, dtype=np.uint32)
+        return counts
+
+    def render_viewport(self, x, y, width, height, zoom=1, alive_rgb=(255, 255, 255), dead_rgb=(0, 0, 0)):
+        """渲染视口
+
+        Returns:
+            np.ndarray: 形状为 (height*zoom, width*zoom, 3) 的uint8数组
+        """
+        return render_cells(self.get_window(x, y, width, height), zoom, make_palette(alive_rgb, dead_rgb))
+
+    def render_overview(self, max_size=1024, alive_rgb=(255, 255, 255), dead_rgb=(0, 0, 0)):
+        """渲染按活细胞密度着色的缩略总览
+
+        Args:
+            max_size (int): 总览的最大边长（像素）
+            alive_rgb (tuple): 活细胞颜色
+            dead_rgb (tuple): 死细胞颜色
+
+        Returns:
+            np.ndarray: (h, w, 3) uint8数组，每个像素对应一个块
+        """
+        block = self.overview_block(max_size)
+        return render_density(self.density(block), block, make_palette(alive_rgb, dead_rgb))
+
+    def close(self):
+        """刷新并释放文件映射"""
+        for array in self.maps:
+            array.flush()
+        self.maps = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,26 @@
+"""
+生命游戏缓存目录
+
+环境变量LIFEGAME_CACHE_DIR优先；作为ComfyUI插件运行时使用插件目录下的cache，
+作为独立包安装（pip install）时使用用户缓存目录（XDG_CACHE_HOME或~/.cache下的lifegame），
+避免把缓存写进site-packages。
+"""
+import os
+
+# 插件根目录（server包的上一级）
+PLUGIN_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def cache_dir():
+    """获取缓存根目录
+
+    Returns:
+        str: 缓存根目录的绝对路径（不保证已存在）
+    """
+    configured = os.environ.get("LIFEGAME_CACHE_DIR")
+    if configured:
+        return os.path.abspath(os.path.expanduser(configured))
+    if os.path.isdir(os.path.join(PLUGIN_DIR, "comfyui_nodes")):
+        return os.path.join(PLUGIN_DIR, "cache")
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "lifegame")
@@ -0,0 +1,239 @@
+"""
+生命游戏预览代理模块
+
+大网格、大细胞尺寸的GIF可达数十MB，而节点上的缩略预览只有两百像素左右。
+每个GIF登记预览时，后台线程生成一个尺寸受限的代理：均匀抽取有限的帧数（保持播放时长），
+逐帧按块取亮度最大值缩小（稀疏的活细胞不会在缩小时消失），再二值化为1位（2色）调色板。
+预览接口和WebSocket通知指向代理文件，原始GIF只在需要时加载。
+代理保存在插件的cache目录中（不受web/temp淘汰的影响），按总大小和存放时间单独淘汰；
+代理生成失败或已被淘汰时，预览接口改为返回原始GIF。
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from .paths import cache_dir
+from .preview_store import evict_directory, preview_store
+
+# 代理文件名后缀：X.gif 的代理为 X.preview.gif
+PROXY_SUFFIX = ".preview.gif"
+
+# 代理文件目录
+PROXY_DIR = os.path.join(cache_dir(), "preview_proxies")
+
+# 亮度权重（ITU-R BT.601）
+_LUMA = np.array([299, 587, 114], dtype=np.uint32)
+
+# 逐行带计算亮度时每个行带的最大像素数
+_BAND_PIXELS = 1 << 20
+
+
+def proxy_name(filename):
+    """原始GIF文件名对应的代理文件名"""
+    stem = filename[:-4] if filename.lower().endswith(".gif") else filename
+    return stem + PROXY_SUFFIX
+
+
+def full_name(name):
+    """代理文件名对应的原始GIF文件名，不是代理文件名时返回None"""
+    if not name.endswith(PROXY_SUFFIX):
+        return None
+    return name[:-len(PROXY_SUFFIX)] + ".gif"
+
+
+def sample_indices(count, max_frames):
+    """在count帧中均匀抽取不超过max_frames帧
+
+    Returns:
+        np.ndarray: 帧序号
+    """
+    if count <= max_frames:
+        return np.arange(count)
+    return np.unique(np.linspace(0, count - 1, max_frames).round().astype(np.int64))
+
+
+def reduce_frame(frame, block):
+    """按块求亮度的最大值和最小值，把一帧缩小为 1/block
+
+    按行带逐段计算，全分辨率的亮度数组最多只有一个行带大小。
+
+    Args:
+        frame (np.ndarray): 形状为 (h, w, 3) 的uint8数组
+        block (int): 块边长（像素）
+
+    Returns:
+        tuple: (块内最大亮度, 块内最小亮度)，均为形状 (ceil(h/block), ceil(w/block)) 的uint32数组
+    """
+    height, width = frame.shape[:2]
+    out_h, out_w = -(-height // block), -(-width // block)
+    maxima = np.empty((out_h, out_w), dtype=np.uint32)
+    minima = np.empty((out_h, out_w), dtype=np.uint32)
+    rows = max(1, _BAND_PIXELS // max(1, width * block)) * block
+    for y in range(0, height, rows):
+        luma = frame[y:y + rows].astype(np.uint32) @ _LUMA
+        band_h = luma.shape[0]
+        pad_h, pad_w = -band_h % block, -width % block
+        if pad_h or pad_w:
+            # 复制边缘像素补齐，不影响块内的最大值和最小值
+            luma = np.pad(luma, ((0, pad_h), (0, pad_w)), mode="edge")
+        blocks = luma.reshape(-1, block, out_w, block)
+        maxima[y // block:(y + band_h + block - 1) // block] = blocks.max(axis=(1, 3))
+        minima[y // block:(y + band_h + block - 1) // block] = blocks.min(axis=(1, 3))
+    return maxima, minima
+
+
+def _block_color(frame, block, reduced, pick):
+    """取缩小亮度中极值所在的块，返回块内对应极值像素的颜色"""
+    by, bx = np.unravel_index(pick(reduced), reduced.shape)
+    pixels = frame[by * block:(by + 1) * block, bx * block:(bx + 1) * block].reshape(-1, 3)
+    return pixels[pick(pixels.astype(np.uint32) @ _LUMA)]
+
+
+def write_proxy(path, frames, fps, max_size=256):
+    """把已抽取的RGB帧写为1位调色板的缩小GIF
+
+    每帧读入后立即按块取亮度最大值缩小（稀疏的亮细胞不会在缩小时消失），只保留缩小后的帧。
+    阈值取所有帧最暗和最亮亮度的中点，两种颜色分别取最暗和最亮的像素。
+
+    Args:
+        path (str): 输出路径
+        frames (iterable): 逐帧产生形状为 (h, w, 3) 的uint8数组
+        fps (float): 代理的每秒帧数
+        max_size (int): 最长边的像素数上限
+    """
+    from .stream_writer import GifStreamWriter
+
+    reduced = []
+    darkest = brightest = None
+    for frame in frames:
+        block = max(1, -(-max(frame.shape[:2]) // max_size))
+        maxima, minima = reduce_frame(frame, block)
+        reduced.append(maxima)
+        low, high = int(minima.min()), int(maxima.max())
+        if darkest is None or low < darkest[0]:
+            darkest = (low, _block_color(frame, block, minima, np.argmin))
+        if brightest is None or high > brightest[0]:
+            brightest = (high, _block_color(frame, block, maxima, np.argmax))
+    if not reduced:
+        raise ValueError("no frames")
+    palette = np.array([darkest[1], brightest[1]], dtype=np.uint8)
+    threshold = (darkest[0] + brightest[0]) // 2
+    height, width = reduced[0].shape
+    with GifStreamWriter(path, width, height, palette, fps=fps) as writer:
+        for maxima in reduced:
+            writer.write((maxima > threshold).astype(np.uint8))
+
+
+def read_gif_frames(path, max_frames):
+    """从GIF文件中均匀抽取帧
+
+    Args:
+        path (str): GIF路径
+        max_frames (int): 最多抽取的帧数
+
+    Returns:
+        tuple: (逐帧产生 (h, w, 3) uint8数组的迭代器, 保持原播放时长的每秒帧数)
+    """
+    from PIL import Image
+
+    with Image.open(path) as img:
+        count = getattr(img, "n_frames", 1)
+        duration = img.info.get("duration") or 100
+    indices = sample_indices(count, max_frames)
+
+    def iter_frames():
+        with Image.open(path) as img:
+            for index in indices:
+                img.seek(int(index))
+                yield np.asarray(img.convert("RGB"))
+
+    return iter_frames(), 1000.0 / duration * len(indices) / count
+
+
+class PreviewProxyBuilder:
+    """在后台线程中生成并登记预览代理"""
+
+    def __init__(self, directory=PROXY_DIR, max_size=256, max_frames=48, max_bytes=64 * 1024 * 1024,
+                 max_age=7 * 24 * 3600):
+        """初始化生成器
+
+        Args:
+            directory (str): 代理文件目录
+            max_size (int): 代理最长边的像素数上限
+            max_frames (int): 代理的最大帧数
+            max_bytes (int): 代理目录的最大总字节数
+            max_age (float): 代理文件的最长保留时间（秒）
+        """
+        self.directory = directory
+        self.max_size = max_size
+        self.max_frames = max_frames
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.lock = threading.Lock()
+        self._pending = {}
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="lifegame-preview")
+
+    def submit(self, full_path, filename, load_frames=None, on_ready=None):
+        """提交代理生成任务
+
+        Args:
+            full_path (str): 原始GIF路径
+            filename (str): 原始GIF文件名
+            load_frames (callable): 返回 (逐帧产生已抽取RGB帧的可迭代对象, 每秒帧数)，默认从原始GIF中逐帧读取
+            on_ready (callable): 代理（或回退的原始GIF）可用后以代理文件名调用，异常只记录日志
+
+        Returns:
+            str: 代理文件名
+        """
+        name = proxy_name(filename)
+        if load_frames is None:
+            load_frames = lambda: read_gif_frames(full_path, self.max_frames)
+        with self.lock:
+            self._pending[name] = self._executor.submit(self._build, name, full_path, load_frames, on_ready)
+        return name
+
+    def pending(self, name):
+        """获取仍在生成中的代理任务
+
+        Args:
+            name (str): 代理文件名
+
+        Returns:
+            Future: 生成任务，已完成或不存在时返回None
+        """
+        with self.lock:
+            future = self._pending.get(name)
+        if future is None or future.done():
+            return None
+        return future
+
+    def _build(self, name, full_path, load_frames, on_ready):
+        path = os.path.join(self.directory, name)
+        tmp_path = f"{path}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            frames, fps = load_frames()
+            write_proxy(tmp_path, frames, fps, self.max_size)
+            os.replace(tmp_path, path)
+            preview_store.register(path, name)
+            evict_directory(self.directory, self.max_bytes, self.max_age)
+        except Exception as e:
+            # 生成失败时代理文件名直接指向原始GIF
+            print(f"生成预览代理失败: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            preview_store.register(full_path, name)
+        try:
+            if on_ready is not None:
+                on_ready(name)
+        except Exception as e:
+            print(f"预览代理回调失败: {e}")
+        finally:
+            with self.lock:
+                self._pending.pop(name, None)
+
+
+# 全局预览代理生成器
+preview_proxies = PreviewProxyBuilder()
@@ -0,0 +1,179 @@
+"""
+生命游戏动画预览索引模块
+
+节点生成的动画留在ComfyUI输出目录中，只把 文件名 -> 路径 登记到索引，
+预览接口按索引直接返回原文件，不再复制到web/temp。
+索引保存在插件的cache目录中，重启后首次访问时重新载入（跳过已不存在的文件）。
+web/temp中的旧预览文件按总大小和存放时间淘汰。
+"""
+import json
+import os
+import stat as stat_module
+import threading
+import time
+from collections import OrderedDict
+
+from .paths import cache_dir
+
+# 旧版本复制预览文件的目录
+WEB_TEMP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "web", "temp")
+
+# 索引文件
+INDEX_PATH = os.path.join(cache_dir(), "preview_index.json")
+
+
+class PreviewStore:
+    """预览文件索引"""
+
+    def __init__(self, max_entries=1024, temp_dir=WEB_TEMP_DIR, temp_max_bytes=256 * 1024 * 1024,
+                 temp_max_age=7 * 24 * 3600, index_path=INDEX_PATH):
+        """初始化索引
+
+        Args:
+            max_entries (int): 索引保留的最大文件数，超出时移除最久未访问的条目
+            temp_dir (str): 需要淘汰的临时预览目录
+            temp_max_bytes (int): 临时目录的最大总字节数
+            temp_max_age (float): 临时文件的最长保留时间（秒）
+            index_path (str): 索引文件路径，None表示只保存在内存中
+        """
+        self.max_entries = max(1, int(max_entries))
+        self.temp_dir = temp_dir
+        self.temp_max_bytes = int(temp_max_bytes)
+        self.temp_max_age = temp_max_age
+        self.index_path = index_path
+        self.lock = threading.Lock()
+        self._entries = None
+
+    def _load(self):
+        """首次访问时从索引文件载入条目（调用方需持有锁）"""
+        if self._entries is None:
+            self._entries = OrderedDict()
+            if self.index_path is not None:
+                try:
+                    with open(self.index_path, "r", encoding="utf-8") as f:
+                        entries = json.load(f)
+                except (OSError, ValueError):
+                    entries = []
+                for name, path in entries[-self.max_entries:]:
+                    if os.path.isfile(path):
+                        self._entries[name] = path
+        return self._entries
+
+    def _save(self):
+        """写入索引文件（调用方需持有锁）"""
+        if self.index_path is None:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+            tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(list(self._entries.items()), f, ensure_ascii=False)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            print(f"保存预览索引失败: {e}")
+
+    def register(self, path, name=None):
+        """登记预览文件
+
+        Args:
+            path (str): 文件路径
+            name (str): 预览文件名，默认使用路径中的文件名
+
+        Returns:
+            str: 预览文件名
+        """
+        name = name or os.path.basename(path)
+        with self.lock:
+            entries = self._load()
+            entries[name] = os.path.abspath(path)
+            entries.move_to_end(name)
+            while len(entries) > self.max_entries:
+                entries.popitem(last=False)
+            self._save()
+        self.evict_temp()
+        return name
+
+    def resolve(self, name):
+        """按文件名查找预览文件
+
+        未登记的文件名回退到web/temp目录（兼容旧版本生成的预览）。
+
+        Args:
+            name (str): 预览文件名
+
+        Returns:
+            str: 文件路径，文件名不合法或文件不存在时返回None
+        """
+        if not name or name != os.path.basename(name) or name in (".", ".."):
+            return None
+        with self.lock:
+            entries = self._load()
+            path = entries.get(name)
+            if path is not None:
+                entries.move_to_end(name)
+                return path
+        path = os.path.join(self.temp_dir, name)
+        return path if os.path.isfile(path) else None
+
+    def evict_temp(self):
+        """按存放时间和总大小淘汰临时预览目录中的文件
+
+        Returns:
+            int: 删除的文件数
+        """
+        return evict_directory(self.temp_dir, self.temp_max_bytes, self.temp_max_age)
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+        return True
+    except OSError:
+        return False
+
+
+def evict_directory(directory, max_bytes, max_age):
+    """按存放时间和总大小淘汰目录中的文件（先删除过期文件，再从最旧的文件开始删除）
+
+    Args:
+        directory (str): 目录
+        max_bytes (int): 最大总字节数
+        max_age (float): 最长保留时间（秒）
+
+    Returns:
+        int: 删除的文件数
+    """
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return 0
+    now = time.time()
+    entries = []
+    total = 0
+    removed = 0
+    for name in names:
+        path = os.path.join(directory, name)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        if not stat_module.S_ISREG(stat.st_mode):
+            continue
+        if now - stat.st_mtime > max_age:
+            if _remove(path):
+                removed += 1
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+        total += stat.st_size
+    entries.sort()
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        if _remove(path):
+            total -= size
+            removed += 1
+    return removed
+
+
+# 全局预览索引
+preview_store = PreviewStore()
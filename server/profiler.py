@@ -0,0 +1,314 @@
+"""
+生命游戏按需性能分析模块
+
+在不重启ComfyUI的情况下，对步进线程和API处理函数进行一次有限长度的
+cProfile采集，同时通过采样线程记录调用栈，结果保存为 ``.pstats`` 文件
+和折叠栈（collapsed stack）文本文件，可通过API下载。
+"""
+import cProfile
+import functools
+import os
+import pstats
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+
+# 性能分析结果保存目录
+PROFILE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "profiles")
+
+
+class ProfileCapture:
+    """一次性能分析采集
+
+    步进线程和API处理函数分别使用独立的cProfile实例（cProfile按线程生效），
+    采集结束时合并为一个pstats文件。折叠栈由采样线程按固定间隔读取被
+    跟踪线程的当前栈帧生成。
+    """
+
+    def __init__(self, max_generations=None, max_seconds=None, sample_interval=0.005):
+        """初始化采集
+
+        Args:
+            max_generations (int, optional): 最多采集的步进代数
+            max_seconds (float, optional): 最长采集时间（秒）
+            sample_interval (float): 调用栈采样间隔（秒）
+        """
+        if not max_generations and not max_seconds:
+            max_seconds = 10.0
+        self.max_generations = int(max_generations) if max_generations else None
+        self.max_seconds = float(max_seconds) if max_seconds else None
+        self.sample_interval = sample_interval
+        # 时间戳便于排序，随机后缀保证同一秒内开始的采集不会互相覆盖结果文件
+        self.capture_id = f"{time.strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+        self.started_at = None
+        self.stopped_at = None
+        self.generations = 0
+        self.handler_calls = 0
+        self.stop_reason = None
+        self.files = {}
+
+        self._step_profiler = cProfile.Profile()
+        self._handler_profiler = cProfile.Profile()
+        self._stacks = Counter()
+        # 正在被跟踪的线程ID -> 嵌套深度
+        self._active_threads = {}
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._sampler = None
+
+    @property
+    def active(self):
+        return self.started_at is not None and not self._done.is_set()
+
+    def start(self):
+        """开始采集并启动采样线程"""
+        self.started_at = time.time()
+        self._sampler = threading.Thread(target=self._sample_loop, name="lifegame-profile-sampler")
+        self._sampler.daemon = True
+        self._sampler.start()
+
+    def stop(self, reason="manual"):
+        """停止采集并写出结果文件
+
+        Args:
+            reason (str): 停止原因
+
+        Returns:
+            dict: 生成的文件名
+        """
+        with self._lock:
+            if self._done.is_set():
+                return self.files
+            self._done.set()
+            self.stop_reason = reason
+            self.stopped_at = time.time()
+        if self._sampler is not None and self._sampler is not threading.current_thread():
+            self._sampler.join(timeout=1.0)
+        self._write_results()
+        return self.files
+
+    def run_step(self, func, *args, **kwargs):
+        """在步进线程中执行一次被分析的调用
+
+        Args:
+            func: 步进函数（通常为LifeGame.update）
+
+        Returns:
+            func的返回值
+        """
+        if not self.active:
+            return func(*args, **kwargs)
+        result = self._profiled_call(self._step_profiler, func, *args, **kwargs)
+        self.generations += 1
+        if self.max_generations and self.generations >= self.max_generations:
+            self.stop("generations")
+        return result
+
+    async def run_handler(self, handler, request):
+        """执行一次被分析的API处理函数
+
+        协程在await点会让出事件循环，因此只在处理函数的同步片段中启用分析器。
+        """
+        if not self.active:
+            return await handler(request)
+        self.handler_calls += 1
+        coro = handler(request)
+        try:
+            value, error = None, None
+            while True:
+                try:
+                    if error is None:
+                        future = self._profiled_call(self._handler_profiler, coro.send, value)
+                    else:
+                        future = self._profiled_call(self._handler_profiler, coro.throw, error)
+                except StopIteration as e:
+                    return e.value
+                try:
+                    value, error = await _AwaitFuture(future), None
+                except BaseException as e:
+                    value, error = None, e
+        finally:
+            coro.close()
+
+    def status(self):
+        """返回采集状态
+
+        Returns:
+            dict: 状态信息
+        """
+        now = self.stopped_at or time.time()
+        return {
+            "id": self.capture_id,
+            "active": self.active,
+            "elapsed": round(now - self.started_at, 3) if self.started_at else 0,
+            "generations": self.generations,
+            "handler_calls": self.handler_calls,
+            "max_generations": self.max_generations,
+            "max_seconds": self.max_seconds,
+            "stop_reason": self.stop_reason,
+            "files": self.files,
+        }
+
+    def _profiled_call(self, profiler, func, *args, **kwargs):
+        thread_id = threading.get_ident()
+        with self._lock:
+            self._active_threads[thread_id] = self._active_threads.get(thread_id, 0) + 1
+        try:
+            try:
+                profiler.enable()
+            except ValueError:
+                # Python 3.12+ 同一时刻只允许一个分析器，冲突时只记录采样栈
+                return func(*args, **kwargs)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profiler.disable()
+        finally:
+            with self._lock:
+                depth = self._active_threads.get(thread_id, 1) - 1
+                if depth > 0:
+                    self._active_threads[thread_id] = depth
+                else:
+                    self._active_threads.pop(thread_id, None)
+
+    def _sample_loop(self):
+        """采样线程：定时读取被跟踪线程的调用栈"""
+        while not self._done.wait(self.sample_interval):
+            if self.max_seconds and time.time() - self.started_at >= self.max_seconds:
+                self.stop("seconds")
+                return
+            with self._lock:
+                thread_ids = list(self._active_threads)
+            if not thread_ids:
+                continue
+            frames = sys._current_frames()
+            for thread_id in thread_ids:
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    self._stacks[_collapse_stack(frame)] += 1
+
+    def _write_results(self):
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        base = f"lifegame_profile_{self.capture_id}"
+
+        stats = None
+        for profiler in (self._step_profiler, self._handler_profiler):
+            try:
+                if stats is None:
+                    stats = pstats.Stats(profiler)
+                else:
+                    stats.add(profiler)
+            except TypeError:
+                # 该分析器没有采集到任何数据
+                continue
+        if stats is not None:
+            pstats_name = f"{base}.pstats"
+            stats.dump_stats(os.path.join(PROFILE_DIR, pstats_name))
+            self.files["pstats"] = pstats_name
+
+        collapsed_name = f"{base}.collapsed.txt"
+        with open(os.path.join(PROFILE_DIR, collapsed_name), "w", encoding="utf-8") as f:
+            for stack, count in self._stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        self.files["collapsed"] = collapsed_name
+
+
+class _AwaitFuture:
+    """把协程send()产出的对象重新交给事件循环等待"""
+
+    def __init__(self, future):
+        self.future = future
+
+    def __await__(self):
+        return (yield self.future)
+
+
+def _collapse_stack(frame):
+    """将栈帧转换为折叠栈格式（根在前，以分号分隔）"""
+    parts = []
+    while frame is not None:
+        code = frame.f_code
+        parts.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+        frame = frame.f_back
+    return ";".join(reversed(parts))
+
+
+class ProfileManager:
+    """管理当前的性能分析采集，供步进线程和API共享"""
+
+    def __init__(self):
+        self.capture = None
+        self._lock = threading.Lock()
+
+    def start(self, max_generations=None, max_seconds=None):
+        """开始新的采集
+
+        Args:
+            max_generations (int, optional): 最多采集的步进代数
+            max_seconds (float, optional): 最长采集时间（秒）
+
+        Returns:
+            ProfileCapture: 新的采集，若已有进行中的采集则返回None
+        """
+        with self._lock:
+            if self.capture is not None and self.capture.active:
+                return None
+            self.capture = ProfileCapture(max_generations=max_generations, max_seconds=max_seconds)
+            self.capture.start()
+            return self.capture
+
+    def stop(self):
+        """停止当前采集
+
+        Returns:
+            dict: 生成的文件名，没有采集时返回None
+        """
+        capture = self.capture
+        if capture is None:
+            return None
+        return capture.stop("manual")
+
+    def status(self):
+        """获取当前采集状态"""
+        capture = self.capture
+        return capture.status() if capture is not None else {"active": False}
+
+    def run_step(self, func, *args, **kwargs):
+        """执行步进函数，采集进行中时进行分析"""
+        capture = self.capture
+        if capture is None or not capture.active:
+            return func(*args, **kwargs)
+        return capture.run_step(func, *args, **kwargs)
+
+    def get_file_path(self, filename):
+        """获取结果文件的完整路径
+
+        Args:
+            filename (str): 文件名
+
+        Returns:
+            str: 文件路径，文件名非法或不存在时返回None
+        """
+        if os.path.basename(filename) != filename or not filename.startswith("lifegame_profile_"):
+            return None
+        path = os.path.join(PROFILE_DIR, filename)
+        return path if os.path.isfile(path) else None
+
+
+def profiled_handler(handler):
+    """API处理函数装饰器，采集进行中时对处理函数进行分析"""
+
+    @functools.wraps(handler)
+    async def wrapper(request):
+        capture = profile_manager.capture
+        if capture is None or not capture.active:
+            return await handler(request)
+        return await capture.run_handler(handler, request)
+
+    return wrapper
+
+
+# 全局性能分析管理器
+profile_manager = ProfileManager()
@@ -0,0 +1,227 @@
+"""
+生命游戏渲染模块
+
+所有渲染都基于numpy向量化操作，耗时只与输出像素数相关。
+缩小视图按2的幂对齐的块统计视口内的活细胞数量，再按密度插值颜色。
+年龄/尾迹模式通过颜色查找表把细胞年龄和尾迹强度映射为颜色。
+常驻的渲染缓冲区只重绘与上一次渲染相比发生变化的细胞，耗时与变化的细胞数相关。
+"""
+import numpy as np
+
+# 渲染模式：cells为普通双色，age按活细胞年龄着色，trail显示死细胞的渐隐尾迹，age_trail两者兼有
+RENDER_MODES = ("cells", "age", "trail", "age_trail")
+
+
+def make_palette(alive_rgb=(255, 255, 255), dead_rgb=(0, 0, 0)):
+    """生成细胞状态到颜色的查找表
+
+    Args:
+        alive_rgb (tuple): 活细胞颜色
+        dead_rgb (tuple): 死细胞颜色
+
+    Returns:
+        np.ndarray: 形状为 (2, 3) 的uint8数组
+    """
+    return np.array([dead_rgb, alive_rgb], dtype=np.uint8)
+
+
+def render_cells(grid, zoom, palette):
+    """将细胞网格渲染为RGB数组，每个细胞占zoom×zoom像素
+
+    Args:
+        grid (np.ndarray): 细胞网格
+        zoom (int): 每个细胞的像素边长
+        palette (np.ndarray): make_palette生成的查找表
+
+    Returns:
+        np.ndarray: 形状为 (h*zoom, w*zoom, 3) 的uint8数组
+    """
+    pixels = palette[grid]
+    if zoom > 1:
+        pixels = np.repeat(np.repeat(pixels, zoom, axis=0), zoom, axis=1)
+    return pixels
+
+
+def make_ramp(start_rgb, end_rgb, steps):
+    """生成线性颜色渐变查找表
+
+    Args:
+        start_rgb (tuple): 起始颜色
+        end_rgb (tuple): 结束颜色
+        steps (int): 表长度
+
+    Returns:
+        np.ndarray: 形状为 (steps, 3) 的uint8数组
+    """
+    t = np.linspace(0.0, 1.0, max(1, int(steps)), dtype=np.float32)[:, None]
+    start = np.asarray(start_rgb, dtype=np.float32)
+    end = np.asarray(end_rgb, dtype=np.float32)
+    return np.rint(start + (end - start) * t).astype(np.uint8)
+
+
+def make_age_trail_luts(mode, alive_rgb, dead_rgb, old_rgb, trail_rgb, age_span=64):
+    """生成年龄和尾迹的颜色查找表
+
+    Args:
+        mode (str): 渲染模式（age、trail或age_trail）
+        alive_rgb (tuple): 新生细胞颜色
+        dead_rgb (tuple): 死细胞颜色
+        old_rgb (tuple): 年龄达到age_span的细胞颜色
+        trail_rgb (tuple): 尾迹最强时的颜色
+        age_span (int): 颜色渐变覆盖的年龄范围，更老的细胞使用old_rgb
+
+    Returns:
+        tuple: (age_lut, trail_lut)，分别以年龄（1起）和尾迹强度（0-255）为索引
+    """
+    if mode in ("age", "age_trail"):
+        # 索引0不会被活细胞使用，与索引1相同
+        age_lut = np.concatenate([make_ramp(alive_rgb, alive_rgb, 1), make_ramp(alive_rgb, old_rgb, age_span)])
+    else:
+        age_lut = make_ramp(alive_rgb, alive_rgb, 1)
+    if mode in ("trail", "age_trail"):
+        trail_lut = make_ramp(dead_rgb, trail_rgb, 256)
+    else:
+        trail_lut = make_ramp(dead_rgb, dead_rgb, 1)
+    return age_lut, trail_lut
+
+
+def render_age_trail(grid, age, trail, zoom, age_lut, trail_lut):
+    """按年龄和尾迹渲染细胞网格
+
+    活细胞颜色为age_lut[age]（超出表长时取最后一项），死细胞颜色为trail_lut[trail]。
+
+    Args:
+        grid (np.ndarray): 细胞网格
+        age (np.ndarray): 与grid同尺寸的uint16年龄
+        trail (np.ndarray): 与grid同尺寸的uint8尾迹强度
+        zoom (int): 每个细胞的像素边长
+        age_lut (np.ndarray): 年龄颜色查找表
+        trail_lut (np.ndarray): 尾迹颜色查找表
+
+    Returns:
+        np.ndarray: 形状为 (h*zoom, w*zoom, 3) 的uint8数组
+    """
+    pixels = trail_lut[np.minimum(trail, len(trail_lut) - 1)]
+    alive = grid.astype(bool)
+    pixels[alive] = age_lut[np.minimum(age[alive], len(age_lut) - 1)]
+    if zoom > 1:
+        pixels = np.repeat(np.repeat(pixels, zoom, axis=0), zoom, axis=1)
+    return pixels
+
+
+def render_density(counts, block, palette):
+    """将池化后的活细胞计数渲染为按密度插值的RGB数组
+
+    Args:
+        counts (np.ndarray): 每个块内的活细胞数量
+        block (int): 块边长（细胞）
+        palette (np.ndarray): make_palette生成的查找表
+
+    Returns:
+        np.ndarray: 与counts同尺寸的 (h, w, 3) uint8数组
+    """
+    # 直接按密度插值（按块面积建立查找表时，大块会需要巨大的表）
+    density = counts.astype(np.float32) / np.float32(block * block)
+    dead = palette[0].astype(np.float32)
+    alive = palette[1].astype(np.float32)
+    return np.rint(dead + (alive - dead) * density[..., None]).astype(np.uint8)
+
+
+def pool_window(grid, level, x, y, width, height):
+    """统计细胞视口 (x, y, width, height) 内每个 2^level × 2^level 块的活细胞数量
+
+    块按2^level对齐（与无边界模式的SparseUniverse.density_window一致），只读取视口覆盖的块，
+    耗时与视口面积相关，与棋盘大小无关。视口超出网格的部分以0填充。
+
+    Args:
+        grid (np.ndarray): 细胞网格
+        level (int): 缩小级别
+        x (int): 视口左上角x坐标
+        y (int): 视口左上角y坐标
+        width (int): 视口宽度
+        height (int): 视口高度
+
+    Returns:
+        np.ndarray: 形状为 (块行数, 块列数) 的uint32计数
+    """
+    block = 1 << level
+    x0, y0 = x >> level, y >> level
+    x1, y1 = -((-(x + width)) >> level), -((-(y + height)) >> level)
+    cells = np.zeros(((y1 - y0) * block, (x1 - x0) * block), dtype=grid.dtype)
+    cx0, cy0 = x0 * block, y0 * block
+    sx0, sy0 = max(cx0, 0), max(cy0, 0)
+    sx1, sy1 = min(x1 * block, grid.shape[1]), min(y1 * block, grid.shape[0])
+    if sx0 < sx1 and sy0 < sy1:
+        cells[sy0 - cy0:sy1 - cy0, sx0 - cx0:sx1 - cx0] = grid[sy0:sy1, sx0:sx1]
+    return cells.reshape(y1 - y0, block, x1 - x0, block).sum(axis=(1, 3), dtype=np.uint32)
+
+
+class CellFramebuffer:
+    """常驻的cells模式渲染缓冲区
+
+    保存上一次渲染的网格和图像。相邻两代之间通常只有少量细胞变化，
+    再次渲染时与上一次的网格比较，只重绘变化细胞对应的 zoom × zoom 像素块；
+    尺寸、缩放或调色板变化，或变化细胞过多时整幅重绘。
+    """
+
+    def __init__(self, redraw_fraction=0.25):
+        """初始化缓冲区
+
+        Args:
+            redraw_fraction (float): 变化细胞超过该比例时整幅重绘（此时向量化的整幅渲染更快）
+        """
+        self.redraw_fraction = redraw_fraction
+        self.grid = None
+        self.pixels = None
+        self.key = None
+
+    def render(self, grid, zoom, palette):
+        """把网格渲染到缓冲区
+
+        Args:
+            grid (np.ndarray): 细胞网格
+            zoom (int): 每个细胞的像素边长
+            palette (np.ndarray): make_palette生成的查找表
+
+        Returns:
+            np.ndarray: 形状为 (h*zoom, w*zoom, 3) 的uint8缓冲区，下一次render时会被原地修改
+        """
+        key = (grid.shape, zoom, palette.tobytes())
+        if self.key != key:
+            return self._redraw(grid, zoom, palette, key)
+        changed = np.flatnonzero(grid != self.grid)
+        if len(changed) > self.redraw_fraction * grid.size:
+            return self._redraw(grid, zoom, palette, key)
+        if len(changed):
+            height, width = grid.shape
+            ys, xs = np.divmod(changed, width)
+            cells = grid.ravel()[changed]
+            colors = palette[cells]
+            blocks = self.pixels.reshape(height, zoom, width, zoom, 3)
+            blocks[ys, :, xs] = colors[:, None, None, :]
+            self.grid.ravel()[changed] = cells
+        return self.pixels
+
+    def _redraw(self, grid, zoom, palette, key):
+        self.grid = grid.copy()
+        self.pixels = np.ascontiguousarray(render_cells(grid, zoom, palette))
+        self.key = key
+        return self.pixels
+
+
+def zoom_level(zoom, extent=None):
+    """把缩小倍数换算为缩小级别（吸附到2的幂）
+
+    Args:
+        zoom (float): 每个细胞的像素数，小于1表示缩小
+        extent (int, optional): 视口最长边（细胞），级别不超过ceil(log2(extent))，即一个块已覆盖整个视口
+
+    Returns:
+        int: 缩小级别（块边长为2^级别），0表示不需要池化
+    """
+    if zoom >= 1:
+        return 0
+    level = max(0, int(np.floor(np.log2(1.0 / zoom) + 1e-9)))
+    if extent is not None:
+        level = min(level, max(0, int(extent) - 1).bit_length())
+    return level
@@ -0,0 +1,145 @@
+"""
+生命游戏结果缓存模块
+
+以完整参数元组的哈希为键，把生成的帧序列（uint8）和最终状态保存为压缩的npz文件。
+缓存目录总大小受限，超出时按最近使用时间（文件mtime）淘汰最旧的条目。
+条目先写入临时文件再原子替换；读取失败（截断或损坏）的条目按未命中处理并删除。
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+# 缓存格式版本，渲染或模拟逻辑变化时递增以废弃旧条目
+CACHE_VERSION = 1
+
+# 写入中断留下的临时文件超过该时长（秒）视为失效
+STALE_TMP_SECONDS = 3600
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def make_cache_key(params):
+    """根据参数计算缓存键
+
+    Args:
+        params (dict): 可JSON序列化的参数字典
+
+    Returns:
+        str: 十六进制SHA-256摘要
+    """
+    payload = json.dumps({"version": CACHE_VERSION, "params": params}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """大小受限的磁盘LRU结果缓存"""
+
+    def __init__(self, directory, max_bytes=512 * 1024 * 1024):
+        """初始化缓存
+
+        Args:
+            directory (str): 缓存目录
+            max_bytes (int): 缓存目录的最大总字节数
+        """
+        self.directory = directory
+        self.max_bytes = int(max_bytes)
+        self.lock = threading.Lock()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.npz")
+
+    def get(self, params):
+        """读取缓存
+
+        Args:
+            params (dict): 参数字典
+
+        Returns:
+            tuple: (frames, final_state)，未命中时返回None
+        """
+        path = self._path(make_cache_key(params))
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                frames = data["frames"]
+                final_state = json.loads(str(data["final_state"]))
+            if frames.dtype != np.uint8 or frames.ndim != 4 or not isinstance(final_state, dict):
+                raise ValueError("unexpected cache entry layout")
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            # 截断或损坏的条目（如写入时被中断）按未命中处理并删除，否则同一个键会一直命中坏文件
+            print(f"生命游戏结果缓存条目损坏，已删除: {e}")
+            _remove(path)
+            return None
+        # 更新mtime作为最近使用时间
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        return frames, final_state
+
+    def put(self, params, frames, final_state):
+        """写入缓存并按需淘汰旧条目，压缩后超过max_bytes的结果不缓存
+
+        Args:
+            params (dict): 参数字典
+            frames (np.ndarray): uint8帧序列
+            final_state (dict): 最终状态
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(make_cache_key(params))
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                np.savez_compressed(f, frames=frames, final_state=np.array(json.dumps(final_state)))
+            size = os.path.getsize(tmp_path)
+            if size > self.max_bytes:
+                # 单个条目超过上限时不缓存，否则淘汰会清空整个缓存（包括它自己）
+                print(f"生命游戏结果过大（{size}字节），不写入缓存")
+                _remove(tmp_path)
+                return
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"写入生命游戏结果缓存失败: {e}")
+            _remove(tmp_path)
+            return
+        self.evict()
+
+    def evict(self):
+        """超出大小上限时按最近使用时间淘汰"""
+        with self.lock:
+            entries = []
+            total = 0
+            now = time.time()
+            for name in os.listdir(self.directory):
+                path = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                # 进程在写入时被终止会留下临时文件，超过STALE_TMP_SECONDS后清理
+                if name.endswith(".tmp") and now - stat.st_mtime > STALE_TMP_SECONDS:
+                    _remove(path)
+                    continue
+                if not name.endswith(".npz"):
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError:
+                    pass
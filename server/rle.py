@@ -0,0 +1,91 @@
+"""
+生命游戏RLE图案格式解析模块
+
+RLE是生命游戏图案的通用文本格式：以#开头的注释行，
+"x = 宽, y = 高, rule = B3/S23"头部，以及由 b（死）、o（活）、$（换行）、!（结束）
+和可选的重复次数组成的正文。
+"""
+
+# 本插件只实现康威生命游戏规则
+SUPPORTED_RULES = ("B3/S23", "23/3")
+
+
+def parse_rle(text):
+    """解析RLE文本
+
+    Args:
+        text (str): RLE文本
+
+    Returns:
+        dict: cells为 (x, y) 活细胞坐标列表，width/height为头部声明的尺寸（缺省时按内容计算），name为#N注释中的名称
+
+    Raises:
+        ValueError: 格式错误或规则不受支持时抛出
+    """
+    name = None
+    width = height = None
+    body = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith("#"):
+            if line.startswith("#N"):
+                name = line[2:].strip() or None
+            continue
+        if width is None and line.replace(" ", "").startswith("x="):
+            header = {}
+            for item in line.split(","):
+                key, _, value = item.partition("=")
+                header[key.strip().lower()] = value.strip()
+            try:
+                width, height = int(header["x"]), int(header["y"])
+            except (KeyError, ValueError):
+                raise ValueError(f"Invalid RLE header: {line}")
+            rule = header.get("rule")
+            if rule and rule.upper() not in SUPPORTED_RULES:
+                raise ValueError(f"Unsupported rule: {rule}")
+            continue
+        body.append(line)
+
+    cells = []
+    x = y = 0
+    count = ""
+    for char in "".join(body):
+        if char.isdigit():
+            count += char
+            continue
+        run = int(count) if count else 1
+        count = ""
+        if char == "b":
+            x += run
+        elif char == "o":
+            cells.extend((x + i, y) for i in range(run))
+            x += run
+        elif char == "$":
+            y += run
+            x = 0
+        elif char == "!":
+            break
+        elif char.isspace():
+            continue
+        else:
+            raise ValueError(f"Invalid RLE character: {char!r}")
+
+    if width is None:
+        width = max((cx for cx, _ in cells), default=-1) + 1
+        height = max((cy for _, cy in cells), default=-1) + 1
+    return {"name": name, "width": width, "height": height, "cells": cells}
+
+
+def load_rle(path):
+    """读取并解析RLE文件
+
+    Args:
+        path (str): 文件路径
+
+    Returns:
+        dict: 同parse_rle
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        return parse_rle(f.read())
@@ -0,0 +1,259 @@
+"""
+生命游戏共享内存网格缓冲区模块
+
+网格和帧历史保存在multiprocessing.shared_memory段中，其他进程按名称附加后
+直接在共享内存上创建NumPy视图，不经过pickle复制。
+
+段布局（小端）：
+    0   magic "LGSM" | 版本 | 高度 | 宽度 | 槽位数
+    24  已发布的帧数（序号，uint64）
+    32  最新一帧的代数（int64）
+    64  每个槽位的 (序号, 代数)，序号为奇数表示该槽位正在写入（seqlock）
+    之后按64字节对齐存放 槽位数 × 高度 × 宽度 的uint8网格
+
+段名包含创建进程的PID，创建者退出时（包括异常退出）由finalize/atexit和
+multiprocessing的resource_tracker释放；创建进程已不存在的残留段会在下次创建时被清理。
+附加方不向resource_tracker登记段，避免附加进程退出时误删段或重复删除。
+"""
+import os
+import struct
+import sys
+import uuid
+import weakref
+import multiprocessing
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+# 段名前缀，格式为 lgsm_<pid>_<随机串>
+SEGMENT_PREFIX = "lgsm_"
+
+_MAGIC = b"LGSM"
+_VERSION = 1
+_HEADER = struct.Struct("<4sIIII")
+_SEQ_OFFSET = 24
+_GENERATION_OFFSET = 32
+_SLOT_TABLE_OFFSET = 64
+_SLOT = struct.Struct("<Qq")
+# Linux上共享内存段以文件形式出现在此目录
+_SHM_DIR = "/dev/shm"
+
+
+def _data_offset(slots):
+    return (_SLOT_TABLE_OFFSET + _SLOT.size * slots + 63) // 64 * 64
+
+
+def _release(shm, unlink):
+    """关闭并按需删除共享内存段（供finalize调用）"""
+    try:
+        shm.close()
+    except BufferError:
+        # 仍有NumPy视图引用缓冲区，段会在进程退出时关闭
+        pass
+    if unlink:
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _creator_pid(name):
+    """从段名称中解析创建进程的pid，不是本模块创建的段时返回None"""
+    if not name.startswith(SEGMENT_PREFIX):
+        return None
+    try:
+        return int(name[len(SEGMENT_PREFIX):].split("_", 1)[0])
+    except ValueError:
+        return None
+
+
+def _open_untracked(name):
+    """附加到已有的段，本进程的resource_tracker不会在退出时删除它"""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    # 3.13之前SharedMemory总是登记。创建进程本身和它的multiprocessing子进程共用同一个
+    # resource_tracker（按名称去重），重复登记无影响，取消登记反而会删掉创建者的登记；
+    # 其他进程使用独立的resource_tracker，附加后取消登记
+    shm = shared_memory.SharedMemory(name=name)
+    creator = _creator_pid(name)
+    parent = multiprocessing.parent_process()
+    if creator != os.getpid() and (parent is None or parent.pid != creator):
+        resource_tracker.unregister(shm._name, "shared_memory")
+    return shm
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, OSError):
+        return True
+    return True
+
+
+def sweep_stale_segments():
+    """删除创建进程已不存在的残留段（仅Linux，其他平台的段随最后一个句柄关闭自动释放）
+
+    Returns:
+        int: 删除的段数量
+    """
+    try:
+        names = os.listdir(_SHM_DIR)
+    except OSError:
+        return 0
+    removed = 0
+    for name in names:
+        pid = _creator_pid(name)
+        if pid is None:
+            continue
+        if pid == os.getpid() or _pid_alive(pid):
+            continue
+        try:
+            shm = shared_memory.SharedMemory(name=name)
+        except (FileNotFoundError, OSError):
+            continue
+        _release(shm, True)
+        removed += 1
+    return removed
+
+
+class SharedFrameBuffer:
+    """共享内存中的网格环形缓冲区，slots为1时即单个共享网格"""
+
+    def __init__(self, shm, owner):
+        """包装已打开的共享内存段，请使用create或attach创建
+
+        Args:
+            shm (SharedMemory): 共享内存段
+            owner (bool): 是否为创建者（创建者负责删除段）
+        """
+        magic, version, height, width, slots = _HEADER.unpack_from(shm.buf, 0)
+        if magic != _MAGIC or version != _VERSION:
+            _release(shm, False)
+            raise ValueError(f"Not a lifegame shared buffer: {shm.name}")
+        self.shm = shm
+        self.owner = owner
+        self.height = height
+        self.width = width
+        self.slots = slots
+        self.frames = np.ndarray((slots, height, width), dtype=np.uint8, buffer=shm.buf,
+                                 offset=_data_offset(slots))
+        self._finalizer = weakref.finalize(self, _release, shm, owner)
+
+    @classmethod
+    def create(cls, height, width, slots=1):
+        """创建新的共享缓冲区
+
+        Args:
+            height (int): 网格高度
+            width (int): 网格宽度
+            slots (int): 环形缓冲区的槽位数
+
+        Returns:
+            SharedFrameBuffer: 缓冲区（当前进程为创建者）
+        """
+        sweep_stale_segments()
+        slots = max(1, int(slots))
+        size = _data_offset(slots) + slots * height * width
+        name = f"{SEGMENT_PREFIX}{os.getpid()}_{uuid.uuid4().hex[:12]}"
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        _HEADER.pack_into(shm.buf, 0, _MAGIC, _VERSION, height, width, slots)
+        struct.pack_into("<Qq", shm.buf, _SEQ_OFFSET, 0, 0)
+        for slot in range(slots):
+            _SLOT.pack_into(shm.buf, _SLOT_TABLE_OFFSET + _SLOT.size * slot, 0, 0)
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name):
+        """按名称附加到已有的共享缓冲区（不负责删除，也不向resource_tracker登记）
+
+        Args:
+            name (str): 段名
+
+        Returns:
+            SharedFrameBuffer: 缓冲区
+        """
+        return cls(_open_untracked(name), owner=False)
+
+    @property
+    def name(self):
+        """段名"""
+        return self.shm.name
+
+    @property
+    def sequence(self):
+        """已发布的帧数"""
+        return struct.unpack_from("<Q", self.shm.buf, _SEQ_OFFSET)[0]
+
+    @property
+    def generation(self):
+        """最新一帧的代数"""
+        return struct.unpack_from("<q", self.shm.buf, _GENERATION_OFFSET)[0]
+
+    def _slot_meta(self, slot):
+        return _SLOT.unpack_from(self.shm.buf, _SLOT_TABLE_OFFSET + _SLOT.size * slot)
+
+    def write(self, grid, generation):
+        """发布一帧网格到下一个槽位
+
+        Args:
+            grid (np.ndarray): 形状为 (height, width) 的网格
+            generation (int): 代数
+
+        Returns:
+            int: 该帧的序号（从1开始）
+        """
+        seq = self.sequence + 1
+        slot = (seq - 1) % self.slots
+        offset = _SLOT_TABLE_OFFSET + _SLOT.size * slot
+        # 写入期间序号为奇数
+        _SLOT.pack_into(self.shm.buf, offset, 2 * seq - 1, generation)
+        self.frames[slot] = grid
+        _SLOT.pack_into(self.shm.buf, offset, 2 * seq, generation)
+        struct.pack_into("<Qq", self.shm.buf, _SEQ_OFFSET, seq, generation)
+        return seq
+
+    def frame(self, seq):
+        """获取指定序号的帧（零拷贝视图，槽位被覆盖前有效）
+
+        Args:
+            seq (int): 帧序号
+
+        Returns:
+            tuple: (代数, 网格视图)，该帧已被覆盖或尚未写完时返回None
+        """
+        slot = (seq - 1) % self.slots
+        slot_seq, generation = self._slot_meta(slot)
+        if slot_seq != 2 * seq:
+            return None
+        return generation, self.frames[slot]
+
+    def read_latest(self):
+        """读取最新一帧的一致副本
+
+        Returns:
+            tuple: (序号, 代数, 网格副本)，尚无帧时返回None
+        """
+        while True:
+            seq = self.sequence
+            if seq == 0:
+                return None
+            slot = (seq - 1) % self.slots
+            before, generation = self._slot_meta(slot)
+            grid = self.frames[slot].copy()
+            after, _ = self._slot_meta(slot)
+            # 读取期间槽位未被改写时副本一致
+            if before == after == 2 * seq:
+                return seq, generation, grid
+
+    def close(self):
+        """释放本进程对段的引用，创建者同时删除段"""
+        self.frames = None
+        self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,217 @@
+"""
+生命游戏跨进程流式编码模块
+
+模拟进程把每一代的网格写入共享内存环形缓冲区，只通过队列传递帧序号；
+编码进程附加到同一个段，直接从共享内存视图放大并编码GIF/APNG，不复制、不pickle网格，
+编码工作也不受模拟进程GIL的限制。环形缓冲区的空闲槽位由信号量控制，编码跟不上时模拟端等待。
+
+编码进程使用spawn方式启动：ComfyUI进程已经启动了torch/CUDA和aiohttp等多个线程，fork这样的进程可能死锁。
+插件包在ComfyUI中以文件路径为模块名加载，子进程无法按名称导入，因此编码进程按路径加载本目录的server包。
+"""
+import multiprocessing
+import os
+import queue
+import threading
+import time
+
+import numpy as np
+
+from .render import render_cells
+from .shared_buffers import SharedFrameBuffer
+
+
+# 编码进程的入口：按路径加载server包（不执行插件根目录的ComfyUI入口）后运行_encode_worker
+_WORKER_BOOTSTRAP = """
+import importlib, importlib.util, os, sys
+name = "_lifegame_encoder_server"
+if name not in sys.modules:
+    spec = importlib.util.spec_from_file_location(name, os.path.join(server_dir, "__init__.py"),
+                                                  submodule_search_locations=[server_dir])
+    package = importlib.util.module_from_spec(spec)
+    sys.modules[name] = package
+    spec.loader.exec_module(package)
+importlib.import_module(name + ".shared_encoder")._encode_worker(*args)
+"""
+
+
+def _encode_worker(name, path, fmt, cell_size, palette, fps, frame_count, frames_queue, free_slots, results):
+    """编码进程：按序号从共享缓冲区读取网格并写入动画文件"""
+    try:
+        from .stream_writer import ApngStreamWriter, GifStreamWriter
+        buffer = SharedFrameBuffer.attach(name)
+    except Exception as e:
+        results.put(("error", repr(e)))
+        return
+    results.put(("ready", None))
+    index_lut = np.arange(256, dtype=np.uint8)
+    width, height = buffer.width * cell_size, buffer.height * cell_size
+    try:
+        if fmt == "gif":
+            writer = GifStreamWriter(path, width, height, palette, fps=fps)
+        else:
+            writer = ApngStreamWriter(path, width, height, palette, fps=fps, frame_count=frame_count)
+        with writer:
+            while True:
+                seq = frames_queue.get()
+                if seq is None:
+                    break
+                frame = buffer.frame(seq)
+                if frame is None:
+                    raise RuntimeError(f"Frame {seq} was overwritten before encoding")
+                writer.write(render_cells(frame[1], cell_size, index_lut))
+                del frame
+                free_slots.release()
+        results.put(("done", writer.frames))
+    except Exception as e:
+        results.put(("error", repr(e)))
+    finally:
+        buffer.close()
+
+
+class SharedMemoryStreamEncoder:
+    """在独立进程中从共享内存编码动画
+
+    可作为LifeGame.attach_shared_buffer的目标：每次write发布一帧。
+    正常退出with块时等待编码完成；出现异常（包括节点被取消）时终止编码进程并释放共享内存。
+    """
+
+    def __init__(self, path, fmt, height, width, cell_size, palette, fps=10, frame_count=1, slots=8,
+                 start_timeout=30.0, finish_timeout=300.0, on_wait=None):
+        """创建共享缓冲区并启动编码进程
+
+        无法启动编码进程时（例如子进程无法导入插件包）退回到在线程中编码。
+
+        Args:
+            path (str): 输出路径
+            fmt (str): gif或apng
+            height (int): 网格高度
+            width (int): 网格宽度
+            cell_size (int): 细胞像素大小
+            palette (np.ndarray): 调色板，网格取值即调色板索引
+            fps (int): 每秒帧数
+            frame_count (int): 总帧数（APNG需要预先写入）
+            slots (int): 环形缓冲区槽位数
+            start_timeout (float): 等待编码进程就绪的秒数
+            finish_timeout (float): finish等待编码结果的最长秒数，超时后终止编码进程
+            on_wait (callable): 等待编码进程（空闲槽位或最终结果）时周期性调用，抛出异常即可中止
+        """
+        self.finish_timeout = finish_timeout
+        self.on_wait = on_wait
+        self.buffer = SharedFrameBuffer.create(height, width, slots)
+        context = multiprocessing.get_context("spawn")
+        self.frames_queue = context.Queue()
+        self.free_slots = context.Semaphore(self.buffer.slots)
+        self.results = context.Queue()
+        args = (self.buffer.name, path, fmt, cell_size, np.asarray(palette, dtype=np.uint8), fps, frame_count,
+                self.frames_queue, self.free_slots, self.results)
+        bootstrap = {"server_dir": os.path.dirname(os.path.abspath(__file__)), "args": args}
+        self.worker = context.Process(target=exec, args=(_WORKER_BOOTSTRAP, bootstrap), daemon=True)
+        try:
+            self.worker.start()
+            self._wait_ready(start_timeout)
+        except Exception as e:
+            print(f"编码进程启动失败，改为在线程中编码: {e}")
+            self._stop_worker()
+            self.worker = threading.Thread(target=_encode_worker, args=args, daemon=True)
+            self.worker.start()
+            self._wait_ready(start_timeout)
+
+    def _wait_ready(self, timeout):
+        try:
+            status, detail = self.results.get(timeout=timeout)
+        except queue.Empty:
+            raise RuntimeError("Encoder did not start")
+        if status != "ready":
+            raise RuntimeError(f"Encoder failed to start: {detail}")
+
+    def _alive(self):
+        return self.worker.is_alive()
+
+    def write(self, grid, generation):
+        """发布一帧（槽位全部被占用时等待编码进程）
+
+        Args:
+            grid (np.ndarray): 形状为 (height, width) 的调色板索引网格
+            generation (int): 代数
+        """
+        while not self.free_slots.acquire(timeout=1.0):
+            if not self._alive():
+                raise RuntimeError(f"Encoder exited: {self._error()}")
+            if self.on_wait is not None:
+                self.on_wait()
+        seq = self.buffer.write(grid, generation)
+        self.frames_queue.put(seq)
+
+    def _error(self):
+        try:
+            status, detail = self.results.get(timeout=1.0)
+        except queue.Empty:
+            return "unknown error"
+        return detail if status == "error" else status
+
+    def _stop_worker(self):
+        if isinstance(self.worker, multiprocessing.process.BaseProcess) and self.worker.is_alive():
+            self.worker.terminate()
+            self.worker.join(timeout=5.0)
+            if self.worker.is_alive():
+                # 被挂起或屏蔽了SIGTERM的进程
+                self.worker.kill()
+                self.worker.join(timeout=5.0)
+
+    def finish(self):
+        """等待编码完成
+
+        Returns:
+            int: 编码的帧数
+        """
+        self.frames_queue.put(None)
+        # 先读取结果再等待进程退出：卡死的编码进程不会让调用方永远阻塞
+        deadline = time.monotonic() + self.finish_timeout
+        try:
+            while True:
+                try:
+                    status, detail = self.results.get(timeout=0.5)
+                    break
+                except queue.Empty:
+                    pass
+                if not self._alive():
+                    status, detail = "error", self._error()
+                    break
+                if time.monotonic() > deadline:
+                    status, detail = "error", f"no result after {self.finish_timeout} seconds"
+                    break
+                if self.on_wait is not None:
+                    self.on_wait()
+        except BaseException:
+            self.abort()
+            raise
+        self.worker.join(timeout=5.0)
+        if self._alive():
+            self.abort()
+        if status != "done":
+            raise RuntimeError(f"Encoding failed: {detail}")
+        return detail
+
+    def abort(self):
+        """终止编码（线程模式下通知线程结束）"""
+        if isinstance(self.worker, threading.Thread):
+            self.frames_queue.put(None)
+            self.worker.join(timeout=5.0)
+        else:
+            self._stop_worker()
+
+    def close(self):
+        """释放共享内存"""
+        self.buffer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self.finish()
+            else:
+                self.abort()
+        finally:
+            self.close()
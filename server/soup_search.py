@@ -0,0 +1,357 @@
+"""
+生命游戏随机汤（soup）批量搜索模块
+
+在进程池中并行运行大量带种子的随机汤：每个汤在无边界稀疏宇宙中演化，
+每一代把活细胞分解为相互独立的物体并计算平移无关的哈希，保存最近若干代的哈希，
+哈希以同一间隔连续重复时视为已稳定，间隔即汤的周期（可以检测任意不超过max_period的周期）。
+只有最近几代的种群数量已经按某个周期重复时才进行代价较高的物体分解。稳定后的物体单独模拟以确定周期和位移，
+分类为静物（xs）、振荡器（xp）或飞船（xq），并以8种对称变换和全部相位下的规范哈希计数，
+最终输出普查（census）文件和每秒处理的汤数。
+
+命令行用法::
+
+    python -m server.soup_search --soups 10000 --workers 8 --output census.json
+"""
+import argparse
+import hashlib
+import json
+import os
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .sparse_universe import SparseUniverse
+
+# 两个物体的细胞切比雪夫距离不超过2时可能相互影响，归为同一物体
+_GROUP_OFFSETS = [(dx, dy) for dy in range(-2, 3) for dx in range(-2, 3) if dx or dy]
+
+
+def _step_free(cells):
+    """在无边界平面上对裁剪后的小数组步进一代，返回裁剪后的结果和原点偏移"""
+    p = np.pad(cells, 2)
+    neighbors = (p[:-2, :-2] + p[:-2, 1:-1] + p[:-2, 2:] +
+                 p[1:-1, :-2] + p[1:-1, 2:] +
+                 p[2:, :-2] + p[2:, 1:-1] + p[2:, 2:])
+    alive = p[1:-1, 1:-1]
+    new = np.logical_or(neighbors == 3, np.logical_and(alive == 1, neighbors == 2)).astype(np.uint8)
+    cropped, (ox, oy) = _crop(new)
+    # new相对于cells的原点偏移为 -1
+    return cropped, (ox - 1, oy - 1)
+
+
+def _crop(cells):
+    """裁剪到包围盒，返回 (数组, (x偏移, y偏移))"""
+    rows = np.flatnonzero(cells.any(axis=1))
+    if rows.size == 0:
+        return np.zeros((0, 0), dtype=np.uint8), (0, 0)
+    cols = np.flatnonzero(cells.any(axis=0))
+    return cells[rows[0]:rows[-1] + 1, cols[0]:cols[-1] + 1], (int(cols[0]), int(rows[0]))
+
+
+def _shape_key(cells):
+    """平移无关的图形键"""
+    return cells.shape, np.packbits(cells).tobytes()
+
+
+def _symmetries(cells):
+    """8种对称变换（旋转和翻转）"""
+    for k in range(4):
+        rotated = np.rot90(cells, k)
+        yield rotated
+        yield rotated[:, ::-1]
+
+
+def _to_pattern(cells):
+    """把图形转换为可读字符串，行之间用/分隔"""
+    return "/".join("".join("o" if c else "." for c in row) for row in cells)
+
+
+def live_cells(universe):
+    """获取稀疏宇宙中全部活细胞的坐标
+
+    Args:
+        universe (SparseUniverse): 稀疏宇宙
+
+    Returns:
+        list: (x, y) 坐标列表
+    """
+    return universe.live_cells()
+
+
+def split_objects(cells):
+    """按距离把活细胞分组为相互独立的物体
+
+    Args:
+        cells (list): (x, y) 坐标列表
+
+    Returns:
+        list: 每个物体裁剪后的uint8数组
+    """
+    remaining = set(cells)
+    objects = []
+    while remaining:
+        seed = remaining.pop()
+        group = [seed]
+        stack = [seed]
+        while stack:
+            x, y = stack.pop()
+            for dx, dy in _GROUP_OFFSETS:
+                cell = (x + dx, y + dy)
+                if cell in remaining:
+                    remaining.remove(cell)
+                    group.append(cell)
+                    stack.append(cell)
+        xs = np.array([c[0] for c in group])
+        ys = np.array([c[1] for c in group])
+        array = np.zeros((ys.max() - ys.min() + 1, xs.max() - xs.min() + 1), dtype=np.uint8)
+        array[ys - ys.min(), xs - xs.min()] = 1
+        objects.append(array)
+    return objects
+
+
+def census_hash(objects):
+    """计算物体集合的平移无关哈希，用于判断汤是否已稳定
+
+    Args:
+        objects (list): split_objects返回的物体数组列表
+
+    Returns:
+        str: 十六进制摘要
+    """
+    digest = hashlib.sha1()
+    for shape, data in sorted(_shape_key(obj) for obj in objects):
+        digest.update(repr(shape).encode("ascii"))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+def classify(cells, max_period=60):
+    """单独模拟一个物体，确定其类型、周期和规范编码
+
+    Args:
+        cells (np.ndarray): 裁剪后的物体数组
+        max_period (int): 检测的最大周期
+
+    Returns:
+        dict: code（类型前缀+规范哈希）、kind、period、population、pattern
+    """
+    start = _shape_key(cells)
+    phases = [cells]
+    x = y = 0
+    current = cells
+    period = None
+    for generation in range(1, max_period + 1):
+        current, (ox, oy) = _step_free(current)
+        x, y = x + ox, y + oy
+        if current.size == 0:
+            break
+        if _shape_key(current) == start:
+            period = generation
+            break
+        phases.append(current)
+
+    population = int(cells.sum())
+    if period is None:
+        kind, prefix = "unknown", f"zz{population}"
+    elif period == 1:
+        kind, prefix = "still_life", f"xs{population}"
+    elif x == 0 and y == 0:
+        kind, prefix = "oscillator", f"xp{period}"
+    else:
+        kind, prefix = "spaceship", f"xq{period}"
+
+    # 规范形式：所有相位、8种对称变换中字典序最小的一个
+    candidates = [np.ascontiguousarray(sym) for phase in (phases if period else [cells]) for sym in _symmetries(phase)]
+    canonical_cells = min(candidates, key=_shape_key)
+    shape, data = _shape_key(canonical_cells)
+    code = f"{prefix}_{hashlib.sha1(repr(shape).encode('ascii') + data).hexdigest()[:12]}"
+    return {
+        "code": code,
+        "kind": kind,
+        "period": period or 0,
+        "population": population,
+        "pattern": _to_pattern(canonical_cells),
+    }
+
+
+# 种群数量需要连续按同一周期重复的代数
+_POPULATION_RUN = 8
+
+
+def _population_periodic(populations, max_period):
+    """最近_POPULATION_RUN代的种群数量是否与p代之前一致（p不超过max_period）
+
+    汤进入周期状态后这一条件每代都成立，混沌阶段则很少成立。
+    """
+    count = len(populations)
+    latest = populations[-1]
+    for p in range(1, min(max_period, count - _POPULATION_RUN) + 1):
+        if populations[-1 - p] == latest and all(
+                populations[-1 - i] == populations[-1 - i - p] for i in range(1, _POPULATION_RUN)):
+            return True
+    return False
+
+
+def run_soup(seed, soup_size=16, density=0.5, max_generations=20000, stable_checks=2, max_period=60,
+             chunk_size=64):
+    """运行一个随机汤直到稳定
+
+    Args:
+        seed (int): 随机种子
+        soup_size (int): 初始汤的边长
+        density (float): 初始活细胞密度
+        max_generations (int): 最大演化代数，超过后视为未稳定
+        stable_checks (int): 物体哈希以同一周期连续重复的次数
+        max_period (int): 检测的最大周期（汤的整体周期和物体分类共用）
+        chunk_size (int): 稀疏宇宙的区块边长
+
+    Returns:
+        dict: seed、generation、stable、汤的周期period（未稳定时为0）以及物体分类列表objects
+    """
+    rng = np.random.default_rng(seed)
+    universe = SparseUniverse(chunk_size=chunk_size)
+    universe.load_array((rng.random((soup_size, soup_size)) < density).astype(np.uint8))
+
+    window = max_period * stable_checks
+    # 最近的种群数量，以及已计算的物体哈希（代数 -> 哈希、哈希 -> 最近一次出现的代数）
+    populations = deque(maxlen=max_period + _POPULATION_RUN)
+    hashes = {}
+    last_seen = {}
+    generation = 0
+    objects = []
+    period = 0
+    while generation < max_generations:
+        universe.step()
+        generation += 1
+        # 移出窗口的旧记录
+        expired = hashes.pop(generation - window - 1, None)
+        if expired is not None and last_seen.get(expired) == generation - window - 1:
+            del last_seen[expired]
+        populations.append(universe.population)
+        if not _population_periodic(populations, max_period):
+            continue
+        objects = split_objects(live_cells(universe))
+        current_hash = census_hash(objects)
+        previous = last_seen.get(current_hash)
+        hashes[generation] = current_hash
+        last_seen[current_hash] = generation
+        if previous is None or generation - previous > max_period:
+            continue
+        candidate = generation - previous
+        if all(hashes.get(generation - k * candidate) == current_hash for k in range(1, stable_checks + 1)):
+            period = candidate
+            break
+
+    stable = period > 0
+    return {
+        "seed": seed,
+        "generation": generation,
+        "stable": stable,
+        "period": period,
+        "objects": [classify(obj, max_period) for obj in objects] if stable else [],
+    }
+
+
+def _run_batch(seeds, options):
+    """进程池任务：运行一批汤并汇总物体计数"""
+    counts = Counter()
+    info = {}
+    unstable = []
+    periods = Counter()
+    for seed in seeds:
+        result = run_soup(seed, **options)
+        if not result["stable"]:
+            unstable.append(seed)
+            continue
+        periods[result["period"]] += 1
+        for obj in result["objects"]:
+            counts[obj["code"]] += 1
+            if obj["code"] not in info:
+                info[obj["code"]] = dict(obj, sample_seed=seed)
+    return counts, info, unstable, periods
+
+
+def run_search(soups, seed_start=0, workers=None, batch_size=32, **options):
+    """并行运行多个随机汤并生成物体普查
+
+    Args:
+        soups (int): 汤的数量
+        seed_start (int): 第一个汤的种子，后续种子依次递增
+        workers (int): 进程数，None表示使用CPU核心数，1表示在当前进程中运行
+        batch_size (int): 每个进程池任务处理的汤数量
+        **options: 传给run_soup的参数
+
+    Returns:
+        dict: 普查结果，包括参数、耗时、每秒汤数、未稳定的种子、各周期的汤数和按数量排序的物体列表
+    """
+    seeds = list(range(seed_start, seed_start + soups))
+    batches = [seeds[i:i + batch_size] for i in range(0, len(seeds), batch_size)]
+    counts = Counter()
+    info = {}
+    unstable = []
+    periods = Counter()
+
+    start = time.perf_counter()
+    if workers == 1:
+        results = (_run_batch(batch, options) for batch in batches)
+        for batch_counts, batch_info, batch_unstable, batch_periods in results:
+            counts.update(batch_counts)
+            for code, obj in batch_info.items():
+                info.setdefault(code, obj)
+            unstable.extend(batch_unstable)
+            periods.update(batch_periods)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for batch_counts, batch_info, batch_unstable, batch_periods in executor.map(
+                    _run_batch, batches, [options] * len(batches)):
+                counts.update(batch_counts)
+                for code, obj in batch_info.items():
+                    info.setdefault(code, obj)
+                unstable.extend(batch_unstable)
+                periods.update(batch_periods)
+    elapsed = time.perf_counter() - start
+
+    census = [dict(info[code], count=count) for code, count in counts.most_common()]
+    return {
+        "soups": soups,
+        "seed_start": seed_start,
+        "options": options,
+        "seconds": round(elapsed, 3),
+        "soups_per_second": round(soups / elapsed, 2) if elapsed > 0 else None,
+        "unstable_seeds": sorted(unstable),
+        "soup_periods": {str(p): n for p, n in sorted(periods.items())},
+        "objects": sum(counts.values()),
+        "census": census,
+    }
+
+
+def main(argv=None):
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="生命游戏随机汤批量搜索")
+    parser.add_argument("--soups", type=int, default=1000, help="汤的数量")
+    parser.add_argument("--seed-start", type=int, default=0, help="第一个种子")
+    parser.add_argument("--workers", type=int, default=None, help="进程数，默认CPU核心数")
+    parser.add_argument("--batch-size", type=int, default=32, help="每个任务的汤数量")
+    parser.add_argument("--soup-size", type=int, default=16, help="初始汤边长")
+    parser.add_argument("--density", type=float, default=0.5, help="初始活细胞密度")
+    parser.add_argument("--max-generations", type=int, default=20000, help="最大演化代数")
+    parser.add_argument("--output", default="census.json", help="普查结果文件")
+    args = parser.parse_args(argv)
+
+    result = run_search(args.soups, seed_start=args.seed_start, workers=args.workers, batch_size=args.batch_size,
+                        soup_size=args.soup_size, density=args.density, max_generations=args.max_generations)
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2, ensure_ascii=False)
+
+    print(f"完成 {result['soups']} 个汤，用时 {result['seconds']} 秒，"
+          f"{result['soups_per_second']} 汤/秒，未稳定 {len(result['unstable_seeds'])} 个")
+    for entry in result["census"][:10]:
+        print(f"{entry['count']:>8}  {entry['code']}  {entry['kind']}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
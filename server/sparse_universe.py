@@ -0,0 +1,272 @@
+"""
+生命游戏无边界稀疏宇宙模块
+
+活细胞区域以固定大小的区块（chunk）保存在字典中，区块按需分配、变空后释放，
+每一步只计算活区块及其可能受影响的相邻区块，耗时与活区块数量成正比。
+"""
+import numpy as np
+
+# 相邻区块方向 (dx, dy)
+_NEIGHBOR_OFFSETS = [(dx, dy) for dy in (-1, 0, 1) for dx in (-1, 0, 1) if dx or dy]
+
+
+class SparseUniverse:
+    """基于区块字典的无边界生命游戏宇宙"""
+
+    def __init__(self, chunk_size=64):
+        """初始化稀疏宇宙
+
+        Args:
+            chunk_size (int): 区块边长（细胞）
+        """
+        self.chunk_size = max(8, int(chunk_size))
+        self.chunks = {}
+
+    @property
+    def population(self):
+        """活细胞总数"""
+        return int(sum(np.count_nonzero(chunk) for chunk in self.chunks.values()))
+
+    def clear(self):
+        """清空宇宙"""
+        self.chunks = {}
+
+    def _locate(self, x, y):
+        cx, lx = divmod(int(x), self.chunk_size)
+        cy, ly = divmod(int(y), self.chunk_size)
+        return (cx, cy), lx, ly
+
+    def get_cell(self, x, y):
+        """获取单个细胞状态
+
+        Args:
+            x (int): x坐标
+            y (int): y坐标
+
+        Returns:
+            int: 细胞状态
+        """
+        key, lx, ly = self._locate(x, y)
+        chunk = self.chunks.get(key)
+        return int(chunk[ly, lx]) if chunk is not None else 0
+
+    def set_cell(self, x, y, state):
+        """设置单个细胞状态，按需分配或释放区块
+
+        Args:
+            x (int): x坐标
+            y (int): y坐标
+            state (int): 状态 (0或1)
+        """
+        key, lx, ly = self._locate(x, y)
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            if not state:
+                return
+            chunk = np.zeros((self.chunk_size, self.chunk_size), dtype=np.uint8)
+            self.chunks[key] = chunk
+        chunk[ly, lx] = 1 if state else 0
+        if not state and not chunk.any():
+            del self.chunks[key]
+
+    def load_array(self, grid, x_offset=0, y_offset=0):
+        """将稠密网格写入宇宙（覆盖该区域）
+
+        Args:
+            grid (np.ndarray): 细胞网格
+            x_offset (int): 网格左上角的x坐标
+            y_offset (int): 网格左上角的y坐标
+        """
+        height, width = grid.shape
+        size = self.chunk_size
+        cx0, cy0 = x_offset // size, y_offset // size
+        cx1, cy1 = (x_offset + width - 1) // size, (y_offset + height - 1) // size
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                # 区块与网格的重叠部分（世界坐标）
+                x0, y0 = max(cx * size, x_offset), max(cy * size, y_offset)
+                x1, y1 = min((cx + 1) * size, x_offset + width), min((cy + 1) * size, y_offset + height)
+                part = grid[y0 - y_offset:y1 - y_offset, x0 - x_offset:x1 - x_offset]
+                chunk = self.chunks.get((cx, cy))
+                if chunk is None:
+                    if not part.any():
+                        continue
+                    chunk = np.zeros((size, size), dtype=np.uint8)
+                    self.chunks[(cx, cy)] = chunk
+                chunk[y0 - cy * size:y1 - cy * size, x0 - cx * size:x1 - cx * size] = part != 0
+                if not chunk.any():
+                    del self.chunks[(cx, cy)]
+
+    def live_cells(self):
+        """获取全部活细胞的坐标
+
+        Returns:
+            list: (x, y) 坐标列表
+        """
+        size = self.chunk_size
+        cells = []
+        for (cx, cy), chunk in self.chunks.items():
+            ys, xs = np.nonzero(chunk)
+            cells.extend(zip((xs + cx * size).tolist(), (ys + cy * size).tolist()))
+        return cells
+
+    def get_window(self, x, y, width, height):
+        """获取指定视口窗口的稠密网格
+
+        Args:
+            x (int): 窗口左上角x坐标
+            y (int): 窗口左上角y坐标
+            width (int): 窗口宽度
+            height (int): 窗口高度
+
+        Returns:
+            np.ndarray: 形状为 (height, width) 的uint8数组
+        """
+        window = np.zeros((height, width), dtype=np.uint8)
+        size = self.chunk_size
+        for cx, cy in self._chunk_keys(x, y, width, height):
+            chunk = self.chunks[(cx, cy)]
+            x0, y0 = max(cx * size, x), max(cy * size, y)
+            x1, y1 = min((cx + 1) * size, x + width), min((cy + 1) * size, y + height)
+            window[y0 - y:y1 - y, x0 - x:x1 - x] = chunk[y0 - cy * size:y1 - cy * size, x0 - cx * size:x1 - cx * size]
+        return window
+
+    def _chunk_keys(self, x, y, width, height):
+        """与窗口相交的活区块坐标"""
+        size = self.chunk_size
+        cx0, cy0 = x // size, y // size
+        cx1, cy1 = (x + width - 1) // size, (y + height - 1) // size
+        # 视口覆盖的区块多于活区块时，只遍历活区块
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > len(self.chunks):
+            return [k for k in self.chunks if cx0 <= k[0] <= cx1 and cy0 <= k[1] <= cy1]
+        return [(cx, cy) for cy in range(cy0, cy1 + 1) for cx in range(cx0, cx1 + 1) if (cx, cy) in self.chunks]
+
+    def density_window(self, level, x, y, width, height):
+        """获取 2^level × 2^level 块内活细胞数量的窗口
+
+        逐个活区块统计活细胞所在的块，不构建视口的稠密网格，耗时与输出尺寸和相交的活区块数相关。
+        块按2^level对齐，与render.pool_window的结果一致。
+
+        Args:
+            level (int): 缩小级别
+            x (int): 窗口左上角x坐标
+            y (int): 窗口左上角y坐标
+            width (int): 窗口宽度
+            height (int): 窗口高度
+
+        Returns:
+            np.ndarray: uint32计数窗口
+        """
+        bx0, by0 = x >> level, y >> level
+        bx1, by1 = -((-(x + width)) >> level), -((-(y + height)) >> level)
+        cols, rows = bx1 - bx0, by1 - by0
+        size = self.chunk_size
+        indices = []
+        for cx, cy in self._chunk_keys(bx0 << level, by0 << level, cols << level, rows << level):
+            ys, xs = np.nonzero(self.chunks[(cx, cy)])
+            bx = ((xs + cx * size) >> level) - bx0
+            by = ((ys + cy * size) >> level) - by0
+            inside = (bx >= 0) & (bx < cols) & (by >= 0) & (by < rows)
+            indices.append(by[inside] * cols + bx[inside])
+        if not indices:
+            return np.zeros((rows, cols), dtype=np.uint32)
+        counts = np.bincount(np.concatenate(indices), minlength=rows * cols)
+        return counts.astype(np.uint32).reshape(rows, cols)
+
+    def bounding_box(self):
+        """计算活细胞的包围盒
+
+        Returns:
+            tuple: (min_x, min_y, max_x, max_y)，没有活细胞时全部为-1
+        """
+        if not self.chunks:
+            return (-1, -1, -1, -1)
+        size = self.chunk_size
+        min_x = min_y = None
+        max_x = max_y = None
+        for (cx, cy), chunk in self.chunks.items():
+            rows = np.flatnonzero(chunk.any(axis=1))
+            cols = np.flatnonzero(chunk.any(axis=0))
+            x0, x1 = cx * size + int(cols[0]), cx * size + int(cols[-1])
+            y0, y1 = cy * size + int(rows[0]), cy * size + int(rows[-1])
+            min_x = x0 if min_x is None else min(min_x, x0)
+            min_y = y0 if min_y is None else min(min_y, y0)
+            max_x = x1 if max_x is None else max(max_x, x1)
+            max_y = y1 if max_y is None else max(max_y, y1)
+        return (min_x, min_y, max_x, max_y)
+
+    def _candidates(self):
+        """需要计算的区块：活区块，以及边缘有活细胞的方向上的相邻区块"""
+        candidates = set(self.chunks)
+        for (cx, cy), chunk in self.chunks.items():
+            top, bottom = chunk[0].any(), chunk[-1].any()
+            left, right = chunk[:, 0].any(), chunk[:, -1].any()
+            for dx, dy in _NEIGHBOR_OFFSETS:
+                if dy == -1 and not top or dy == 1 and not bottom:
+                    continue
+                if dx == -1 and not left or dx == 1 and not right:
+                    continue
+                if dx and dy and not chunk[0 if dy < 0 else -1, 0 if dx < 0 else -1]:
+                    continue
+                candidates.add((cx + dx, cy + dy))
+        return candidates
+
+    def _padded(self, cx, cy):
+        """拼接带一圈邻居边缘（halo）的区块"""
+        size = self.chunk_size
+        padded = np.zeros((size + 2, size + 2), dtype=np.uint8)
+        get = self.chunks.get
+        chunk = get((cx, cy))
+        if chunk is not None:
+            padded[1:-1, 1:-1] = chunk
+        neighbor = get((cx, cy - 1))
+        if neighbor is not None:
+            padded[0, 1:-1] = neighbor[-1]
+        neighbor = get((cx, cy + 1))
+        if neighbor is not None:
+            padded[-1, 1:-1] = neighbor[0]
+        neighbor = get((cx - 1, cy))
+        if neighbor is not None:
+            padded[1:-1, 0] = neighbor[:, -1]
+        neighbor = get((cx + 1, cy))
+        if neighbor is not None:
+            padded[1:-1, -1] = neighbor[:, 0]
+        neighbor = get((cx - 1, cy - 1))
+        if neighbor is not None:
+            padded[0, 0] = neighbor[-1, -1]
+        neighbor = get((cx + 1, cy - 1))
+        if neighbor is not None:
+            padded[0, -1] = neighbor[-1, 0]
+        neighbor = get((cx - 1, cy + 1))
+        if neighbor is not None:
+            padded[-1, 0] = neighbor[0, -1]
+        neighbor = get((cx + 1, cy + 1))
+        if neighbor is not None:
+            padded[-1, -1] = neighbor[0, 0]
+        return padded
+
+    def step(self):
+        """更新一步
+
+        Returns:
+            tuple: (births, deaths) 本步新生和死亡的细胞数量
+        """
+        new_chunks = {}
+        births = deaths = 0
+        for key in self._candidates():
+            padded = self._padded(*key)
+            # 对带halo的区块求邻居数量
+            neighbors = (padded[:-2, :-2] + padded[:-2, 1:-1] + padded[:-2, 2:] +
+                         padded[1:-1, :-2] + padded[1:-1, 2:] +
+                         padded[2:, :-2] + padded[2:, 1:-1] + padded[2:, 2:])
+            alive = padded[1:-1, 1:-1] == 1
+            survivors = np.logical_and(alive, np.logical_or(neighbors == 2, neighbors == 3))
+            born = np.logical_and(~alive, neighbors == 3)
+            births += int(np.count_nonzero(born))
+            deaths += int(np.count_nonzero(alive)) - int(np.count_nonzero(survivors))
+            new_chunk = np.logical_or(survivors, born)
+            # 变空的区块直接释放
+            if new_chunk.any():
+                new_chunks[key] = new_chunk.astype(np.uint8)
+        self.chunks = new_chunks
+        return births, deaths
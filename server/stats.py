@@ -0,0 +1,126 @@
+"""
+生命游戏种群统计模块
+
+统计数据由步进过程顺带计算，最近N代的数据保存在固定大小的numpy环形缓冲区中，
+客户端无需获取完整网格即可绘制种群曲线。
+"""
+import numpy as np
+
+# 环形缓冲区每一行的字段
+STATS_FIELDS = ("generation", "population", "births", "deaths", "min_x", "min_y", "max_x", "max_y")
+
+
+def bounding_box(grid):
+    """计算活细胞的包围盒
+
+    Args:
+        grid (np.ndarray): 细胞网格
+
+    Returns:
+        tuple: (min_x, min_y, max_x, max_y)，没有活细胞时全部为-1
+    """
+    rows = np.flatnonzero(grid.any(axis=1))
+    if rows.size == 0:
+        return (-1, -1, -1, -1)
+    cols = np.flatnonzero(grid.any(axis=0))
+    return (int(cols[0]), int(rows[0]), int(cols[-1]), int(rows[-1]))
+
+
+class PopulationHistory:
+    """种群统计环形缓冲区"""
+
+    def __init__(self, capacity=1024):
+        """初始化环形缓冲区
+
+        Args:
+            capacity (int): 保留的最大代数
+        """
+        self.capacity = max(1, int(capacity))
+        self.buffer = np.zeros((self.capacity, len(STATS_FIELDS)), dtype=np.int64)
+        self.count = 0
+        self.next_index = 0
+
+    def clear(self):
+        """清空缓冲区"""
+        self.count = 0
+        self.next_index = 0
+
+    def record(self, generation, population, births, deaths, bbox):
+        """记录一代的统计数据
+
+        Args:
+            generation (int): 代数
+            population (int): 活细胞数量
+            births (int): 新生细胞数量
+            deaths (int): 死亡细胞数量
+            bbox (tuple): 活细胞包围盒 (min_x, min_y, max_x, max_y)
+        """
+        row = self.buffer[self.next_index]
+        row[0] = generation
+        row[1] = population
+        row[2] = births
+        row[3] = deaths
+        row[4:8] = bbox
+        self.next_index = (self.next_index + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def truncate(self, generation):
+        """丢弃比指定代数更新的记录（用于时间回溯）
+
+        Args:
+            generation (int): 保留的最后一代
+        """
+        while self.count and self.buffer[(self.next_index - 1) % self.capacity, 0] > generation:
+            self.next_index = (self.next_index - 1) % self.capacity
+            self.count -= 1
+
+    def find(self, generation):
+        """查找指定代数的统计数据
+
+        Args:
+            generation (int): 代数
+
+        Returns:
+            dict: 统计数据，不在缓冲区中时返回None
+        """
+        rows = self.last()
+        matches = np.flatnonzero(rows[:, 0] == generation)
+        return self._row_to_dict(rows[matches[-1]]) if matches.size else None
+
+    def latest(self):
+        """获取最近一代的统计数据
+
+        Returns:
+            dict: 统计数据，缓冲区为空时返回None
+        """
+        if self.count == 0:
+            return None
+        return self._row_to_dict(self.buffer[(self.next_index - 1) % self.capacity])
+
+    def last(self, n=None):
+        """按时间顺序获取最近n代的统计数据
+
+        Args:
+            n (int, optional): 代数，默认返回全部
+
+        Returns:
+            np.ndarray: 形状为 (n, len(STATS_FIELDS)) 的数组
+        """
+        n = self.count if n is None else max(0, min(int(n), self.count))
+        indices = (self.next_index - n + np.arange(n)) % self.capacity
+        return self.buffer[indices]
+
+    def to_list(self, n=None):
+        """按时间顺序获取最近n代的统计数据（字典列表）
+
+        Args:
+            n (int, optional): 代数，默认返回全部
+
+        Returns:
+            list: 统计数据字典列表
+        """
+        return [self._row_to_dict(row) for row in self.last(n)]
+
+    @staticmethod
+    def _row_to_dict(row):
+        return {field: int(value) for field, value in zip(STATS_FIELDS, row)}
@@ -0,0 +1,145 @@
+"""
+生命游戏动画流式编码模块
+
+逐帧写入GIF/APNG文件，编码器只持有当前帧，峰值内存与总帧数无关。
+帧以调色板索引（uint8二维数组）的形式传入，颜色由固定调色板决定。
+"""
+import struct
+import zlib
+
+import numpy as np
+from PIL import GifImagePlugin, Image
+
+
+def _palette_image(indices, palette):
+    """把索引帧包装为P模式图像"""
+    img = Image.fromarray(np.ascontiguousarray(indices, dtype=np.uint8), mode="L").convert("P")
+    img.putpalette(palette.astype(np.uint8).tobytes())
+    return img
+
+
+class GifStreamWriter:
+    """流式GIF写入器，使用Pillow的底层GIF接口逐帧编码"""
+
+    def __init__(self, path, width, height, palette, fps=10, loop=0):
+        """打开GIF文件
+
+        Args:
+            path (str): 输出路径
+            width (int): 图像宽度
+            height (int): 图像高度
+            palette (np.ndarray): 形状为 (n, 3) 的调色板，n不超过256
+            fps (int): 每秒帧数
+            loop (int): 循环次数，0表示无限循环
+        """
+        self.path = path
+        self.size = (width, height)
+        self.palette = np.asarray(palette, dtype=np.uint8)
+        self.duration = max(10, 1000 // max(1, fps))
+        self.loop = loop
+        self.frames = 0
+        self._fp = open(path, "wb")
+
+    def write(self, indices):
+        """写入一帧
+
+        Args:
+            indices (np.ndarray): 形状为 (height, width) 的调色板索引
+        """
+        img = _palette_image(indices, self.palette)
+        if self.frames == 0:
+            header, _ = GifImagePlugin.getheader(img, info={"loop": self.loop, "duration": self.duration})
+            for block in header:
+                self._fp.write(block)
+        for block in GifImagePlugin.getdata(img, duration=self.duration):
+            self._fp.write(block)
+        self.frames += 1
+
+    def close(self):
+        """写入文件尾并关闭文件"""
+        if self._fp is None:
+            return
+        self._fp.write(b";")
+        self._fp.close()
+        self._fp = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class ApngStreamWriter:
+    """流式APNG写入器，直接输出PNG数据块"""
+
+    def __init__(self, path, width, height, palette, fps=10, frame_count=1, loop=0):
+        """打开APNG文件
+
+        Args:
+            path (str): 输出路径
+            width (int): 图像宽度
+            height (int): 图像高度
+            palette (np.ndarray): 形状为 (n, 3) 的调色板，n不超过256
+            fps (int): 每秒帧数
+            frame_count (int): 总帧数（acTL块需要预先写入）
+            loop (int): 循环次数，0表示无限循环
+        """
+        self.path = path
+        self.width = width
+        self.height = height
+        self.fps = max(1, int(fps))
+        self.frame_count = int(frame_count)
+        self.frames = 0
+        self._sequence = 0
+        self._fp = open(path, "wb")
+
+        self._fp.write(b"\x89PNG\r\n\x1a\n")
+        # 8位调色板图像
+        self._chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 3, 0, 0, 0))
+        self._chunk(b"acTL", struct.pack(">II", self.frame_count, loop))
+        self._chunk(b"PLTE", np.asarray(palette, dtype=np.uint8).tobytes())
+
+    def _chunk(self, chunk_type, data):
+        self._fp.write(struct.pack(">I", len(data)))
+        self._fp.write(chunk_type)
+        self._fp.write(data)
+        self._fp.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(chunk_type)) & 0xFFFFFFFF))
+
+    def write(self, indices):
+        """写入一帧
+
+        Args:
+            indices (np.ndarray): 形状为 (height, width) 的调色板索引
+        """
+        if self.frames >= self.frame_count:
+            raise ValueError("APNG frame count exceeded")
+        self._chunk(b"fcTL", struct.pack(
+            ">IIIIIHHBB", self._sequence, self.width, self.height, 0, 0, 1, self.fps, 0, 0
+        ))
+        self._sequence += 1
+
+        # 每行前加过滤类型0
+        rows = np.zeros((self.height, self.width + 1), dtype=np.uint8)
+        rows[:, 1:] = indices
+        data = zlib.compress(rows.tobytes(), 6)
+        if self.frames == 0:
+            self._chunk(b"IDAT", data)
+        else:
+            self._chunk(b"fdAT", struct.pack(">I", self._sequence) + data)
+            self._sequence += 1
+        self.frames += 1
+
+    def close(self):
+        """写入文件尾并关闭文件"""
+        if self._fp is None:
+            return
+        self._chunk(b"IEND", b"")
+        self._fp.close()
+        self._fp = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,139 @@
+"""
+生命游戏torch后端
+
+使用3×3卷积核和环形填充的conv2d对（批量）网格步进，利用torch的算子内CPU线程并行，
+渲染结果直接写入预先分配的IMAGE张量，不经过NumPy。结果与NumPy引擎逐位一致，
+首次使用时会做一次自检。
+"""
+import numpy as np
+import torch
+import torch.nn.functional as F
+
+# 邻居计数卷积核（中心为0）
+_KERNEL = torch.tensor([[1, 1, 1], [1, 0, 1], [1, 1, 1]], dtype=torch.float32).view(1, 1, 3, 3)
+
+_verified = False
+
+
+def step(grids, steps=1):
+    """对批量网格步进
+
+    Args:
+        grids (torch.Tensor): 形状为 (B, 1, H, W) 的float32张量，取值0或1
+        steps (int): 步数
+
+    Returns:
+        torch.Tensor: 步进后的网格
+    """
+    kernel = _KERNEL.to(grids.device)
+    for _ in range(steps):
+        neighbors = F.conv2d(F.pad(grids, (1, 1, 1, 1), mode="circular"), kernel)
+        alive = grids > 0
+        grids = ((neighbors == 3) | (alive & (neighbors == 2))).to(grids.dtype)
+    return grids
+
+
+def _stats(old, new):
+    """计算一步的出生、死亡、种群数量和包围盒"""
+    births = int(((new > 0) & (old == 0)).sum())
+    deaths = int(((new == 0) & (old > 0)).sum())
+    population = int(new.sum())
+    rows = torch.nonzero(new.any(dim=1)).flatten()
+    if rows.numel() == 0:
+        return births, deaths, population, (-1, -1, -1, -1)
+    cols = torch.nonzero(new.any(dim=0)).flatten()
+    return births, deaths, population, (int(cols[0]), int(rows[0]), int(cols[-1]), int(rows[-1]))
+
+
+def verify_against_numpy(width=37, height=29, steps=16, seed=0):
+    """检查torch步进结果与NumPy引擎逐位一致
+
+    Args:
+        width (int): 测试网格宽度
+        height (int): 测试网格高度
+        steps (int): 比较的步数
+        seed (int): 随机种子
+
+    Returns:
+        bool: 是否一致
+    """
+    from .lifegame_logic import LifeGame
+
+    reference = LifeGame(width=width, height=height, stats_capacity=1)
+    reference.random_init(0.35, seed=seed)
+    grids = torch.from_numpy(reference.grid.astype(np.float32)).view(1, 1, height, width)
+    for _ in range(steps):
+        reference.update()
+        grids = step(grids)
+        if not np.array_equal(grids[0, 0].to(torch.uint8).numpy(), reference.grid):
+            return False
+    return True
+
+
+def ensure_verified():
+    """首次使用前做一次逐位一致性自检，不一致时抛出RuntimeError"""
+    global _verified
+    if not _verified:
+        if not verify_against_numpy():
+            raise RuntimeError("torch后端结果与NumPy引擎不一致")
+        _verified = True
+
+
+def render_animation(lifegame, frames, alive_rgb, dead_rgb, threads=0, on_frame=None):
+    """用torch后端模拟并渲染动画
+
+    帧写入预先分配的 (frames, 3, H, W) float32张量，与节点的NumPy渲染结果格式相同。
+    模拟结束后最终网格、代数和种群统计写回lifegame。
+
+    Args:
+        lifegame: 已初始化的环形模式LifeGame实例
+        frames (int): 帧数
+        alive_rgb (tuple): 活细胞颜色
+        dead_rgb (tuple): 死细胞颜色
+        threads (int): torch算子内线程数，0表示使用torch当前设置
+        on_frame (callable, optional): 每帧开始前调用（例如检查任务是否被取消），抛出的异常会中止模拟
+
+    Returns:
+        torch.Tensor: 图像张量
+    """
+    ensure_verified()
+    # set_num_threads对整个进程生效，结束时恢复，避免影响ComfyUI中其他torch任务
+    previous_threads = torch.get_num_threads()
+    if threads > 0:
+        torch.set_num_threads(threads)
+    try:
+        return _render_frames(lifegame, frames, alive_rgb, dead_rgb, on_frame)
+    finally:
+        if threads > 0:
+            torch.set_num_threads(previous_threads)
+
+
+def _render_frames(lifegame, frames, alive_rgb, dead_rgb, on_frame):
+    height, width, cell_size = lifegame.height, lifegame.width, lifegame.cell_size
+    # 与NumPy渲染一致：颜色值为c/255.0后转float32
+    colors = torch.tensor([[c / 255.0 for c in dead_rgb], [c / 255.0 for c in alive_rgb]], dtype=torch.float32)
+    channels = colors.t().contiguous()
+
+    batch = torch.empty((frames, 3, height * cell_size, width * cell_size), dtype=torch.float32)
+    grid = torch.from_numpy(lifegame.get_grid().astype(np.float32)).view(1, 1, height, width)
+    for i in range(frames):
+        if on_frame is not None:
+            on_frame()
+        index = grid[0, 0].to(torch.long)
+        cells = channels[:, index]
+        # 每个细胞展开为cell_size×cell_size像素块
+        batch[i].view(3, height, cell_size, width, cell_size).copy_(
+            cells[:, :, None, :, None].expand(3, height, cell_size, width, cell_size))
+
+        new_grid = step(grid)
+        births, deaths, population, bbox = _stats(grid[0, 0], new_grid[0, 0])
+        with lifegame.lock:
+            lifegame.generation += 1
+            lifegame.births, lifegame.deaths, lifegame.population, lifegame.bbox = births, deaths, population, bbox
+            lifegame.stats_history.record(lifegame.generation, population, births, deaths, bbox)
+        grid = new_grid
+
+    with lifegame.lock:
+        lifegame.grid = grid[0, 0].to(torch.uint8).numpy()
+        lifegame.version += 1
+    return batch
@@ -0,0 +1,139 @@
+"""
+生命游戏WebSocket客户端管理模块
+
+每个客户端拥有一个有界的发送队列和独立的写任务，广播时消息只编码一次，
+然后非阻塞地放入各客户端队列。队列已满时丢弃最旧的消息（最新消息优先），
+因此慢客户端只会丢失过期的更新，不会拖慢其他客户端。
+"""
+import asyncio
+import json
+
+
+class _Client:
+    """单个WebSocket客户端的发送队列和写任务"""
+
+    def __init__(self, ws, queue_size):
+        self.ws = ws
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = 0
+        self.sent = 0
+        self.task = None
+
+
+class WebSocketClientManager:
+    """WebSocket客户端管理器"""
+
+    def __init__(self, queue_size=4, send_timeout=10.0):
+        """初始化管理器
+
+        Args:
+            queue_size (int): 每个客户端发送队列的最大消息数
+            send_timeout (float): 单条消息的发送超时（秒），超时的客户端会被断开
+        """
+        self.queue_size = max(1, int(queue_size))
+        self.send_timeout = send_timeout
+        self.clients = {}
+        self.loop = None
+        self.dropped = 0
+        self.sent = 0
+
+    def register(self, ws):
+        """登记客户端并启动其写任务（需在事件循环中调用）
+
+        Args:
+            ws: 已prepare的aiohttp WebSocketResponse
+        """
+        self.loop = asyncio.get_running_loop()
+        client = _Client(ws, self.queue_size)
+        client.task = self.loop.create_task(self._writer(client))
+        self.clients[ws] = client
+
+    async def unregister(self, ws):
+        """移除客户端并停止其写任务
+
+        Args:
+            ws: WebSocketResponse
+        """
+        client = self.clients.pop(ws, None)
+        if client is None:
+            return
+        if client.task is not asyncio.current_task():
+            client.task.cancel()
+            try:
+                await client.task
+            except asyncio.CancelledError:
+                pass
+
+    async def _writer(self, client):
+        ws = client.ws
+        try:
+            while not ws.closed:
+                data = await client.queue.get()
+                await asyncio.wait_for(ws.send_str(data), self.send_timeout)
+                client.sent += 1
+                self.sent += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"发送WebSocket消息失败: {e}")
+            self.clients.pop(ws, None)
+            try:
+                await ws.close()
+            except Exception:
+                pass
+
+    def _enqueue(self, client, data):
+        queue = client.queue
+        if queue.full():
+            # 丢弃最旧的消息，保留最新状态
+            queue.get_nowait()
+            client.dropped += 1
+            self.dropped += 1
+        queue.put_nowait(data)
+
+    def send(self, ws, message):
+        """向单个客户端发送消息（需在事件循环中调用）
+
+        Args:
+            ws: WebSocketResponse
+            message (dict): 可JSON序列化的消息
+        """
+        client = self.clients.get(ws)
+        if client is not None:
+            self._enqueue(client, json.dumps(message))
+
+    def publish(self, message):
+        """向所有客户端广播消息（需在事件循环中调用），消息只编码一次
+
+        Args:
+            message (dict): 可JSON序列化的消息
+        """
+        if not self.clients:
+            return
+        data = json.dumps(message)
+        for client in list(self.clients.values()):
+            self._enqueue(client, data)
+
+    def publish_threadsafe(self, message):
+        """从任意线程广播消息
+
+        Args:
+            message (dict): 可JSON序列化的消息
+        """
+        loop = self.loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self.publish, message)
+
+    def status(self):
+        """获取客户端数量和消息统计
+
+        Returns:
+            dict: 连接数、已发送和已丢弃的消息数及各队列长度
+        """
+        return {
+            "clients": len(self.clients),
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "queue_size": self.queue_size,
+            "queued": [client.queue.qsize() for client in self.clients.values()],
+        }
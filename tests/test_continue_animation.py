@@ -0,0 +1,51 @@
+"""
+串联的继续动画片段与一次生成全部帧逐位一致的测试
+"""
+import importlib
+import os
+import sys
+import types
+
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from server.result_cache import ResultCache
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SEGMENTS = (10, 8, 6)
+
+
+@pytest.fixture
+def nodes(tmp_path, monkeypatch):
+    """以包的形式加载节点模块（不执行插件根目录的ComfyUI入口），结果缓存写入临时目录"""
+    if importlib.util.find_spec("comfy") is None:
+        # ComfyUI之外只需要取消检查接口
+        comfy = types.ModuleType("comfy")
+        comfy.model_management = types.SimpleNamespace(throw_exception_if_processing_interrupted=lambda: None)
+        monkeypatch.setitem(sys.modules, "comfy", comfy)
+        monkeypatch.setitem(sys.modules, "comfy.model_management", comfy.model_management)
+    package = types.ModuleType("lifegame_plugin")
+    package.__path__ = [ROOT]
+    monkeypatch.setitem(sys.modules, "lifegame_plugin", package)
+    module = importlib.import_module("lifegame_plugin.comfyui_nodes.lifegame_node")
+    monkeypatch.setattr(module, "result_cache", ResultCache(str(tmp_path)))
+    return module
+
+
+@pytest.mark.parametrize("universe", ["toroidal", "unbounded"])
+@pytest.mark.parametrize("render_mode", ["cells", "age_trail"])
+def test_chained_segments_match_single_run(nodes, universe, render_mode):
+    params = dict(width=40, height=30, cell_size=2, mode="random", preset="glider", density=0.35,
+                  alive_color="#FFFFFF", dead_color="#102030", universe=universe, seed=7, render_mode=render_mode,
+                  trail_decay=16)
+    full, full_state = nodes.LifeGameAnimationNode().generate_animation(frames=sum(SEGMENTS), **params)
+
+    batch, state = nodes.LifeGameAnimationNode().generate_animation(frames=SEGMENTS[0], **params)
+    batches = [batch]
+    for frames in SEGMENTS[1:]:
+        batch, state = nodes.LifeGameContinueAnimationNode().continue_animation(state, frames)
+        batches.append(batch)
+
+    assert torch.equal(torch.cat(batches), full)
+    assert state == full_state
@@ -0,0 +1,35 @@
+"""
+时间回溯与手动编辑的统计一致性测试
+"""
+import numpy as np
+
+from server.lifegame_logic import LifeGame
+from server.stats import bounding_box
+
+
+def _assert_stats_match_grid(game):
+    grid = game.get_grid()
+    assert game.population == int(np.count_nonzero(grid))
+    assert tuple(game.bbox) == tuple(bounding_box(grid))
+
+
+def test_seek_after_edit_restores_edited_stats():
+    game = LifeGame(width=48, height=40, history_bytes=4 * 1024 * 1024, engine="roll")
+    game.random_init(0.3, seed=3)
+    for _ in range(40):
+        game.update()
+    game.set_cell(1, 1, 1)
+    game.set_cell(2, 1, 1)
+    game.toggle_cell(3, 1)
+    game.set_cell(47, 39, 1)
+    edited = game.get_grid().copy()
+    for _ in range(20):
+        game.update()
+
+    assert game.seek(40)
+    assert np.array_equal(game.get_grid(), edited)
+    _assert_stats_match_grid(game)
+    # 跳转后继续运行不会累积偏差
+    for _ in range(10):
+        game.update()
+        _assert_stats_match_grid(game)
@@ -0,0 +1,51 @@
+"""
+模拟核心的导入时间测试
+
+在全新的子进程中以 -X importtime 导入 server.lifegame_logic，
+确认没有连带导入torch、PIL和aiohttp，且累计导入时间不超过预算。
+"""
+import os
+import subprocess
+import sys
+
+# 插件根目录（server包所在目录）
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# server.lifegame_logic的累计导入时间预算（秒，含numpy）
+IMPORT_BUDGET_SECONDS = 1.0
+
+# 模拟核心不应导入的重量级模块
+HEAVY_MODULES = ("torch", "PIL", "aiohttp")
+
+
+def _import_in_subprocess(module):
+    """在全新的子进程中导入模块
+
+    Returns:
+        tuple: (已导入的重量级模块列表, 该模块的累计导入时间（秒）)
+    """
+    code = (
+        f"import sys, {module}\n"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))\n"
+    )
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    loaded = [name for name in result.stdout.strip().split(",") if name]
+    # -X importtime 输出格式：import time: self [us] | cumulative | imported package
+    cumulative = None
+    for line in result.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == module:
+            cumulative = int(parts[1].strip()) / 1e6
+    assert cumulative is not None, f"{module} not found in -X importtime output"
+    return loaded, cumulative
+
+
+def test_lifegame_logic_does_not_import_heavy_modules():
+    loaded, _ = _import_in_subprocess("server.lifegame_logic")
+    assert loaded == []
+
+
+def test_lifegame_logic_import_within_budget():
+    _, seconds = _import_in_subprocess("server.lifegame_logic")
+    assert seconds < IMPORT_BUDGET_SECONDS, f"import took {seconds:.3f}s, budget {IMPORT_BUDGET_SECONDS}s"
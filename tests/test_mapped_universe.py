@@ -0,0 +1,71 @@
+"""
+磁盘映射超大宇宙与稠密引擎的一致性测试
+"""
+import numpy as np
+import pytest
+
+from server.lifegame_logic import LifeGame
+from server.mapped_universe import MappedUniverse
+
+GENERATIONS = 24
+# 宽度不是8的倍数，条带远小于棋盘
+WIDTH, HEIGHT = 37, 29
+STRIPE_CELLS = WIDTH * 5
+
+
+def _bounded_step(grid):
+    """边界外全部是死细胞的参考步进"""
+    p = np.pad(grid, 1)
+    neighbors = (p[:-2, :-2] + p[:-2, 1:-1] + p[:-2, 2:] + p[1:-1, :-2] + p[1:-1, 2:] +
+                 p[2:, :-2] + p[2:, 1:-1] + p[2:, 2:])
+    return ((neighbors == 3) | ((grid == 1) & (neighbors == 2))).astype(np.uint8)
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_wrap_matches_dense_engine(tmp_path, seed):
+    game = LifeGame(width=WIDTH, height=HEIGHT, engine="roll")
+    game.random_init(0.35, seed=seed)
+    board = MappedUniverse.create(str(tmp_path), WIDTH, HEIGHT, wrap=True, stripe_cells=STRIPE_CELLS)
+    with board:
+        board.random_init(0.35, seed=seed)
+        assert board.stripe_rows < HEIGHT
+        for _ in range(GENERATIONS):
+            game.update()
+            board.step()
+            grid = game.get_grid()
+            assert np.array_equal(board.get_window(0, 0, WIDTH, HEIGHT), grid)
+            assert board.population == int(grid.sum())
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_no_wrap_matches_dense_reference(tmp_path, seed):
+    grid = (np.random.default_rng(seed).random((HEIGHT, WIDTH)) < 0.35).astype(np.uint8)
+    board = MappedUniverse.create(str(tmp_path), WIDTH, HEIGHT, wrap=False, stripe_cells=STRIPE_CELLS)
+    with board:
+        board.load_array(grid)
+        for _ in range(GENERATIONS):
+            grid = _bounded_step(grid)
+            board.step()
+            assert np.array_equal(board.get_window(0, 0, WIDTH, HEIGHT), grid)
+            assert board.population == int(grid.sum())
+
+
+def test_interrupted_step_keeps_last_generation(tmp_path):
+    board = MappedUniverse.create(str(tmp_path), WIDTH, HEIGHT, wrap=True, stripe_cells=STRIPE_CELLS)
+    with board:
+        board.random_init(0.35, seed=2)
+        board.step(3)
+        expected = board.get_window(0, 0, WIDTH, HEIGHT)
+        calls = []
+
+        def interrupt():
+            calls.append(1)
+            if len(calls) == 2:
+                raise KeyboardInterrupt
+
+        with pytest.raises(KeyboardInterrupt):
+            board.step(5, on_stripe=interrupt)
+    reopened = MappedUniverse.open(str(tmp_path), stripe_cells=STRIPE_CELLS)
+    with reopened:
+        assert reopened.generation == 3
+        assert np.array_equal(reopened.get_window(0, 0, WIDTH, HEIGHT), expected)
@@ -0,0 +1,43 @@
+"""
+预览代理的缩小和二值化测试
+"""
+import numpy as np
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+
+from server.preview_proxy import read_gif_frames, write_proxy
+
+ALIVE = (250, 200, 10)
+DEAD = (20, 30, 40)
+
+
+def _frames(count, height, width, cell_size, seed=0):
+    rng = np.random.default_rng(seed)
+    palette = np.array([DEAD, ALIVE], dtype=np.uint8)
+    for _ in range(count):
+        cells = (rng.random((height, width)) < 0.03).astype(np.uint8)
+        yield palette[cells].repeat(cell_size, axis=0).repeat(cell_size, axis=1)
+
+
+def test_proxy_from_gif_keeps_sparse_cells(tmp_path):
+    source = tmp_path / "source.gif"
+    frames = [Image.fromarray(frame) for frame in _frames(6, 150, 200, 5)]
+    frames[0].save(source, save_all=True, append_images=frames[1:], duration=100, loop=0)
+
+    iterator, fps = read_gif_frames(str(source), max_frames=3)
+    proxy = tmp_path / "source.preview.gif"
+    write_proxy(str(proxy), iterator, fps, max_size=64)
+
+    with Image.open(proxy) as img:
+        assert img.n_frames == 3
+        assert max(img.size) <= 64
+        colors = {tuple(color) for _, color in img.convert("RGB").getcolors()}
+    assert colors == {ALIVE, DEAD}
+    # 6帧中抽取3帧，播放时长不变
+    assert fps == pytest.approx(5.0)
+
+
+def test_empty_frames_raise(tmp_path):
+    with pytest.raises(ValueError):
+        write_proxy(str(tmp_path / "empty.gif"), iter(()), 10)
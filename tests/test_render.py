@@ -0,0 +1,33 @@
+"""
+缩小视图块计数的测试
+"""
+import numpy as np
+import pytest
+
+from server.render import pool_window
+from server.sparse_universe import SparseUniverse
+
+
+def _reference(grid, level, x, y, width, height):
+    """逐个活细胞累加到对齐的块中"""
+    block = 1 << level
+    bx0, by0 = x // block, y // block
+    counts = np.zeros((-(-(y + height) // block) - by0, -(-(x + width) // block) - bx0), dtype=np.uint32)
+    for py, px in zip(*np.nonzero(grid)):
+        by, bx = py // block - by0, px // block - bx0
+        if 0 <= by < counts.shape[0] and 0 <= bx < counts.shape[1]:
+            counts[by, bx] += 1
+    return counts
+
+
+@pytest.mark.parametrize("level,x,y,width,height", [
+    (0, 0, 0, 53, 41), (1, 3, 5, 20, 17), (2, -9, -3, 70, 50), (3, 10, 7, 33, 29), (6, -100, -100, 300, 300),
+])
+def test_pool_window_matches_sparse_and_reference(level, x, y, width, height):
+    grid = (np.random.default_rng(level).random((41, 53)) < 0.3).astype(np.uint8)
+    universe = SparseUniverse(chunk_size=16)
+    universe.load_array(grid)
+    counts = pool_window(grid, level, x, y, width, height)
+    assert counts.dtype == np.uint32
+    assert np.array_equal(counts, _reference(grid, level, x, y, width, height))
+    assert np.array_equal(counts, universe.density_window(level, x, y, width, height))
@@ -0,0 +1,73 @@
+"""
+结果缓存在条目损坏时的行为测试
+"""
+import os
+
+import numpy as np
+import pytest
+
+from server.result_cache import ResultCache, make_cache_key
+
+PARAMS = {"width": 8, "height": 8, "frames": 2}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResultCache(str(tmp_path))
+
+
+def _entry_path(cache):
+    return os.path.join(cache.directory, f"{make_cache_key(PARAMS)}.npz")
+
+
+def test_round_trip(cache):
+    frames = np.arange(2 * 4 * 4 * 3, dtype=np.uint8).reshape(2, 4, 4, 3)
+    cache.put(PARAMS, frames, {"generation": 2})
+    cached_frames, final_state = cache.get(PARAMS)
+    assert np.array_equal(cached_frames, frames)
+    assert final_state == {"generation": 2}
+    assert not [name for name in os.listdir(cache.directory) if name.endswith(".tmp")]
+
+
+@pytest.mark.parametrize("corrupt", [
+    lambda data: data[:len(data) // 2],
+    lambda data: data[:10],
+    lambda data: b"not a zip file",
+], ids=["truncated", "header_only", "garbage"])
+def test_corrupt_entry_is_a_miss_and_removed(cache, corrupt):
+    frames = np.zeros((2, 4, 4, 3), dtype=np.uint8)
+    cache.put(PARAMS, frames, {"generation": 2})
+    path = _entry_path(cache)
+    with open(path, "rb") as f:
+        data = f.read()
+    with open(path, "wb") as f:
+        f.write(corrupt(data))
+    assert cache.get(PARAMS) is None
+    assert not os.path.exists(path)
+    # 删除后可以重新写入
+    cache.put(PARAMS, frames, {"generation": 2})
+    assert cache.get(PARAMS) is not None
+
+
+def test_stale_tmp_files_are_evicted(cache):
+    os.makedirs(cache.directory, exist_ok=True)
+    stale = os.path.join(cache.directory, "abc.npz.1.2.tmp")
+    with open(stale, "wb") as f:
+        f.write(b"partial")
+    os.utime(stale, (0, 0))
+    cache.evict()
+    assert not os.path.exists(stale)
+
+
+def test_oversized_entry_is_skipped_without_evicting(tmp_path):
+    cache = ResultCache(str(tmp_path), max_bytes=200_000)
+    small = np.zeros((2, 4, 4, 3), dtype=np.uint8)
+    cache.put({"entry": 1}, small, {})
+    cache.put({"entry": 2}, small, {})
+    # 随机数据几乎无法压缩
+    large = np.random.default_rng(0).integers(0, 256, (4, 256, 256, 3), dtype=np.uint8)
+    cache.put(PARAMS, large, {})
+    assert cache.get(PARAMS) is None
+    assert cache.get({"entry": 1}) is not None
+    assert cache.get({"entry": 2}) is not None
+    assert not [name for name in os.listdir(cache.directory) if name.endswith(".tmp")]
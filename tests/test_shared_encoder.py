@@ -0,0 +1,65 @@
+"""
+共享内存编码进程卡死时的超时和取消测试
+"""
+import os
+import signal
+import sys
+import time
+
+import numpy as np
+import pytest
+
+pytest.importorskip("PIL")
+
+from server.shared_encoder import SharedMemoryStreamEncoder
+
+pytestmark = pytest.mark.skipif(not sys.platform.startswith("linux"), reason="uses SIGSTOP and /dev/shm")
+
+PALETTE = np.array([[0, 0, 0], [255, 255, 255]], dtype=np.uint8)
+
+
+class Cancelled(Exception):
+    pass
+
+
+def _segments():
+    return {name for name in os.listdir("/dev/shm") if name.startswith("lgsm_")}
+
+
+def _hung_encoder(tmp_path, **kwargs):
+    encoder = SharedMemoryStreamEncoder(str(tmp_path / "out.gif"), "gif", 16, 16, 2, PALETTE, frame_count=4,
+                                        **kwargs)
+    if not hasattr(encoder.worker, "pid"):
+        encoder.abort()
+        encoder.close()
+        pytest.skip("encoder fell back to a thread")
+    encoder.write(np.zeros((16, 16), dtype=np.uint8), 0)
+    # 挂起编码进程：进程仍然存活，但不会再产生结果
+    os.kill(encoder.worker.pid, signal.SIGSTOP)
+    return encoder
+
+
+def test_finish_times_out_on_hung_encoder(tmp_path):
+    before = _segments()
+    encoder = _hung_encoder(tmp_path, finish_timeout=1.0)
+    start = time.monotonic()
+    with pytest.raises(RuntimeError):
+        with encoder:
+            pass
+    assert time.monotonic() - start < 20
+    assert not encoder.worker.is_alive()
+    assert _segments() <= before
+
+
+def test_finish_can_be_cancelled(tmp_path):
+    before = _segments()
+
+    def cancel():
+        raise Cancelled
+
+    encoder = _hung_encoder(tmp_path, on_wait=cancel)
+    with pytest.raises(Cancelled):
+        with encoder:
+            pass
+    assert not encoder.worker.is_alive()
+    assert _segments() <= before
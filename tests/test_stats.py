@@ -0,0 +1,67 @@
+"""
+增量种群统计与完整重新计数的一致性测试
+"""
+import numpy as np
+import pytest
+
+from server.lifegame_logic import LifeGame
+from server.stats import bounding_box
+
+
+def _assert_stats_match(game, previous):
+    grid = game.get_grid()
+    assert game.population == int(np.count_nonzero(grid))
+    assert tuple(game.bbox) == tuple(bounding_box(grid))
+    assert game.births == int(np.count_nonzero(grid > previous))
+    assert game.deaths == int(np.count_nonzero(previous > grid))
+
+
+@pytest.mark.parametrize("preset", ["glider", "r_pentomino"])
+def test_update_stats_match_recount(preset):
+    # 小棋盘上图案会越过边界绕回，包围盒在贴边和不贴边之间切换
+    game = LifeGame(width=24, height=20, engine="roll")
+    game.load_preset(preset)
+    for _ in range(120):
+        previous = game.get_grid().copy()
+        game.update()
+        _assert_stats_match(game, previous)
+
+
+def test_edits_keep_bbox_and_population_exact():
+    game = LifeGame(width=30, height=25, engine="roll")
+    game.load_preset("glider")
+    rng = np.random.default_rng(5)
+    for _ in range(200):
+        x, y = int(rng.integers(0, 30)), int(rng.integers(0, 25))
+        if rng.random() < 0.5:
+            game.set_cell(x, y, int(rng.integers(0, 2)))
+        else:
+            game.toggle_cell(x, y)
+        grid = game.get_grid()
+        assert game.population == int(np.count_nonzero(grid))
+        assert tuple(game.bbox) == tuple(bounding_box(grid))
+        if rng.random() < 0.2:
+            game.update()
+
+
+def test_set_cell_rejects_invalid_state():
+    game = LifeGame(width=10, height=10, engine="roll")
+    with pytest.raises(ValueError):
+        game.set_cell(1, 1, 2)
+    unbounded = LifeGame(width=10, height=10, unbounded=True)
+    with pytest.raises(ValueError):
+        unbounded.set_cell(1, 1, -1)
+    assert game.population == 0 and unbounded.population == 0
+
+
+def test_unbounded_edits_keep_bbox_exact():
+    game = LifeGame(width=16, height=16, unbounded=True, chunk_size=8)
+    rng = np.random.default_rng(9)
+    for _ in range(200):
+        x, y = int(rng.integers(-20, 20)), int(rng.integers(-20, 20))
+        if rng.random() < 0.5:
+            game.set_cell(x, y, int(rng.integers(0, 2)))
+        else:
+            game.toggle_cell(x, y)
+        assert game.population == game.universe.population
+        assert tuple(game.bbox) == tuple(game.universe.bounding_box())
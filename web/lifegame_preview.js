@@ -11,6 +11,14 @@ function debug(...args) {
 // 创建一个全局缓存来存储最新生成的动画路径
 window.LifegamePreviewCache = window.LifegamePreviewCache || {};
 
+// 预览代理（缩小的1位GIF）的文件名后缀，X.gif的代理为X.preview.gif
+const PROXY_SUFFIX = ".preview.gif";
+
+// 由预览代理文件名得到原始GIF文件名
+function toFullFilename(filename) {
+    return filename.endsWith(PROXY_SUFFIX) ? filename.slice(0, -PROXY_SUFFIX.length) + ".gif" : filename;
+}
+
 // WebSocket连接
 let websocket = null;
 let isReconnecting = false;
@@ -47,6 +55,7 @@ function connectWebSocket() {
                 if (data.type === "gif_update" && data.path) {
                     // 更新全局缓存
                     window.LifegamePreviewCache.latestGif = data.path;
+                    window.LifegamePreviewCache.latestFullGif = data.full || toFullFilename(data.path);
                     window.LifegamePreviewCache.timestamp = data.timestamp;
                     
                     // 通知所有节点更新预览
@@ -417,7 +426,8 @@ app.registerExtension({
                         return;
                     }
                     
-                    const filename = match[1];
+                    // 预览显示的是代理，打开原始GIF
+                    const filename = toFullFilename(match[1]);
                     debug("打开文件:", filename);
                     
                     // 构建输出文件夹URL
@@ -463,12 +473,22 @@ app.registerExtension({
                 if (this.previewImgElement && this.previewImgElement.src) {
                     const match = this.previewImgElement.src.match(/\/animation\/preview\/([^?]+)/);
                     if (match && match[1]) {
-                        currentFilename = match[1];
+                        currentFilename = toFullFilename(match[1]);
                     }
                 }
                 
                 // 添加文件相关选项
                 if (currentFilename) {
+                    // 预览默认是缩小的代理，需要时才加载原始GIF
+                    if (!this.previewImgElement.src.includes(`/animation/preview/${currentFilename}?`)) {
+                        options.push({
+                            content: "🔍 加载原始分辨率预览",
+                            callback: () => {
+                                this.updatePreview(currentFilename);
+                            }
+                        });
+                    }
+                    
                     options.push({
                         content: "📁 在新窗口打开GIF",
                         callback: () => {